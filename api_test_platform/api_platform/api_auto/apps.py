@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ApiAutoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api_auto'
+
+    def ready(self):
+        # 注册模型信号（页面缓存失效）
+        from . import signals  # noqa: F401
@@ -15,7 +15,15 @@ class ApiManagementForm(forms.ModelForm):
         ('无', '无'),
         ('json键是否存在', 'json键是否存在'),
         ('json键值对', 'json键值对'),
-        ('正则匹配', '正则匹配')
+        ('正则匹配', '正则匹配'),
+        ('json路径比较', 'json路径比较'),
+        ('json schema校验', 'json schema校验'),
+        ('状态码', '状态码'),
+        ('响应头', '响应头'),
+        ('最大响应时间', '最大响应时间(ms)'),
+        ('最大首字节时间', '最大首字节时间(ms)'),
+        ('最大响应大小', '最大响应大小(字节)'),
+        ('多重断言', '多重断言')
     ]
 
     # 基础信息
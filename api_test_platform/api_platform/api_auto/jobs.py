@@ -0,0 +1,223 @@
+"""
+后台任务：Web请求只创建排队中的任务记录并立即返回任务ID，由独立的工作进程（python manage.py run_job_worker）领取执行。
+任务保存在数据库中，Web进程重启不会丢失排队中的任务；执行中的任务定期写入心跳，
+工作进程异常退出后心跳超时的任务由其他工作进程记为失败，不会一直停留在执行中。
+工作进程以spawn方式启动，模块顶层不导入模型，避免Django未初始化时导入失败。
+"""
+import os
+import time
+import uuid
+import threading
+import multiprocessing
+from contextlib import contextmanager
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+
+from common.log_utils import logger
+from .result_sink import ResultSink
+from .progress import publish_progress
+
+
+def _init_worker():
+    """工作进程初始化：加载Django配置，丢弃从父进程继承的数据库连接"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_platform.settings')
+    import django
+    django.setup()
+    from django.db import connections
+    connections.close_all()
+
+
+def submit_job(job_type, case_step_ids=None):
+    """创建排队中的任务记录（立即返回，由工作进程领取执行）"""
+    from .models import TestJob
+
+    job = TestJob.objects.create(
+        job_id=uuid.uuid4().hex,
+        job_type=job_type,
+        case_step_ids=','.join(case_step_ids or []),
+    )
+    logger.info(f"后台任务已提交: job_id={job.job_id}, 类型={job_type}")
+    return job
+
+
+def claim_next_job():
+    """
+    领取最早提交的排队中任务，返回任务ID，没有可领取的任务时返回None
+    以状态为条件更新，多个工作进程同时领取同一任务时只有一个更新成功
+    """
+    from .models import TestJob
+
+    queued = TestJob.objects.filter(status='queued').order_by('created_at').values_list('job_id', flat=True)
+    for job_id in queued[:10]:
+        now = timezone.now()
+        if TestJob.objects.filter(job_id=job_id, status='queued').update(
+                status='running', started_at=now, heartbeat_at=now):
+            return job_id
+    return None
+
+
+def recover_stale_jobs():
+    """心跳超时的执行中任务（工作进程已退出）记为失败，返回处理的任务数"""
+    from django.db.models import Q
+    from .models import TestJob
+
+    now = timezone.now()
+    deadline = now - timedelta(seconds=settings.JOB_STALE_TIMEOUT)
+    count = TestJob.objects.filter(status='running').filter(
+        Q(heartbeat_at__lt=deadline) | Q(heartbeat_at__isnull=True, started_at__lt=deadline)
+    ).update(status='failed', result="执行任务的工作进程已退出（心跳超时），任务已终止", finished_at=now)
+    if count:
+        logger.warning(f"{count}个执行中的后台任务心跳超时，已记为失败")
+    return count
+
+
+@contextmanager
+def _heartbeat(job_id):
+    """任务执行期间在后台线程中定期更新心跳时间"""
+    from django.db import connection
+    from .models import TestJob
+
+    stopped = threading.Event()
+
+    def beat():
+        try:
+            while not stopped.wait(settings.JOB_HEARTBEAT_INTERVAL):
+                TestJob.objects.filter(job_id=job_id).update(heartbeat_at=timezone.now())
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, name=f'JobHeartbeat-{job_id[:8]}', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def execute_job(job_id):
+    """执行已领取的任务：按任务类型执行，状态和结果写回任务记录"""
+    from .models import TestJob
+
+    job = TestJob.objects.get(job_id=job_id)
+    try:
+        with _heartbeat(job_id):
+            if job.job_type == 'run_all_cases':
+                _run_all_cases(job)
+            elif job.job_type == 'run_case_report':
+                _run_case_report(job)
+            else:
+                raise ValueError(f"不支持的任务类型: {job.job_type}")
+        job.status = 'completed'
+    except Exception as e:
+        logger.error(f"后台任务执行失败: job_id={job_id}, 错误: {str(e)}", exc_info=True)
+        job.status = 'failed'
+        job.result = str(e)
+    finally:
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'result', 'finished_at'])
+    return job.status
+
+
+def run_worker(once=False):
+    """
+    工作进程主循环：处理心跳超时的任务后领取排队中的任务逐个执行，无任务时按轮询间隔等待
+    once为True时执行完当前排队的任务即退出
+    """
+    logger.info(f"后台任务工作进程已启动: pid={os.getpid()}")
+    last_recovery = None
+    while True:
+        if last_recovery is None or time.monotonic() - last_recovery >= settings.JOB_STALE_TIMEOUT:
+            recover_stale_jobs()
+            last_recovery = time.monotonic()
+        job_id = claim_next_job()
+        if job_id is not None:
+            logger.info(f"领取后台任务: job_id={job_id}")
+            execute_job(job_id)
+        elif once:
+            return
+        else:
+            time.sleep(settings.JOB_POLL_INTERVAL)
+
+
+def _worker_process(once):
+    _init_worker()
+    run_worker(once)
+
+
+def start_workers(workers, once=False):
+    """启动多个工作进程（spawn方式）并等待退出；workers为1时在当前进程执行"""
+    if workers <= 1:
+        run_worker(once)
+        return
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=_worker_process, args=(once,), name=f'JobWorker-{index}')
+                 for index in range(workers)]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+
+def _run_all_cases(job):
+    """逐条执行用例步骤，批量回写is_pass并更新任务进度"""
+    from .models import CaseStepInfo, TestJob
+    from test_runner.run_single_case import RunSingleCase
+    from common.run_history import RunHistoryRecorder
+    from common.variable_store import RunVariables, case_role
+    from api_testcase.api_test import ROLE_ORDER
+
+    # 模块和接口名称用于增量更新用例执行统计
+    case_steps = CaseStepInfo.objects.select_related('api').only(
+        'case_step_info_id', 'case_id', 'is_pass', 'part_name', 'api', 'api__api_name'
+    )
+    if job.case_step_ids:
+        case_steps = case_steps.filter(case_step_info_id__in=job.case_step_ids.split(','))
+    # 前置用例先执行、后置用例最后执行，执行级变量在整个任务内共享
+    case_steps = sorted(case_steps, key=lambda step: ROLE_ORDER[case_role([{'测试用例编号': step.case_id}])])
+    job.total = len(case_steps)
+    TestJob.objects.filter(job_id=job.job_id).update(total=job.total)
+
+    def update_progress(progress):
+        TestJob.objects.filter(job_id=job.job_id).update(**progress)
+
+    # 结果和进度批量写回，异常退出时也会刷新已完成的部分；整个任务记为一个执行批次
+    with RunHistoryRecorder('run_all_cases'), RunVariables(), ResultSink(progress_callback=update_progress) as sink:
+        for case_step in case_steps:
+            result = RunSingleCase(case_step.case_step_info_id).run()
+            sink.add(case_step, result['passed'])
+            # 每条用例完成后立即推送结果（汇总进度仍按ResultSink的节奏写入任务记录）
+            publish_progress(job.job_id, {
+                'case_step_info_id': case_step.case_step_info_id,
+                'case_id': case_step.case_id,
+                'part_name': case_step.part_name,
+                'api_name': case_step.api.api_name,
+                'passed': result['passed'],
+                'details': str(result['details'])[:500],
+                'current': sink.current,
+                'total': job.total,
+                'success': sink.success,
+                'failure': sink.failure,
+            })
+
+    job.current, job.success, job.failure = sink.current, sink.success, sink.failure
+    job.result = f"执行完成，总数: {job.total}，通过: {job.success}，失败: {job.failure}"
+
+
+def _run_case_report(job):
+    """执行run_case.py同等流程（生成HTML报告），结果记录报告路径"""
+    from test_runner.run_case import RunCase
+
+    # 工作进程会复用，每个任务都重新设置筛选条件，避免沿用上一个任务的用例ID
+    if job.case_step_ids:
+        os.environ['SELECTED_CASE_IDS'] = job.case_step_ids
+    else:
+        os.environ.pop('SELECTED_CASE_IDS', None)
+    report_file = RunCase().run()
+    job.result = f"测试报告: {report_file}" if report_file else "未收集到任何测试用例"
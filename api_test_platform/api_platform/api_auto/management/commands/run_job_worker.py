@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api_auto.jobs import start_workers
+
+
+class Command(BaseCommand):
+    help = "启动后台任务工作进程：领取排队中的用例执行任务并执行（工作进程数即任务的最大并发数）"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.JOB_WORKERS,
+                            help="工作进程数，默认为配置JOB_WORKERS")
+        parser.add_argument('--once', action='store_true', help="执行完当前排队的任务后退出")
+
+    def handle(self, *args, **options):
+        start_workers(options['workers'], options['once'])
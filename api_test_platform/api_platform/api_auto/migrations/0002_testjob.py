@@ -0,0 +1,36 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestJob',
+            fields=[
+                ('job_id', models.CharField(max_length=32, primary_key=True, serialize=False, verbose_name='任务ID')),
+                ('job_type', models.CharField(choices=[('run_all_cases', '批量执行用例'), ('run_case_report', '执行用例并生成报告')], max_length=20, verbose_name='任务类型')),
+                ('status', models.CharField(choices=[('queued', '排队中'), ('running', '执行中'), ('completed', '已完成'), ('failed', '执行失败')], default='queued', max_length=20, verbose_name='任务状态')),
+                ('case_step_ids', models.TextField(blank=True, default='', verbose_name='指定步骤ID')),
+                ('total', models.IntegerField(default=0, verbose_name='用例总数')),
+                ('current', models.IntegerField(default=0, verbose_name='已执行数')),
+                ('success', models.IntegerField(default=0, verbose_name='通过数')),
+                ('failure', models.IntegerField(default=0, verbose_name='失败数')),
+                ('result', models.TextField(blank=True, default='', verbose_name='执行结果')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='提交时间')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='开始时间')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='结束时间')),
+            ],
+            options={
+                'verbose_name': '执行任务',
+                'verbose_name_plural': '执行任务',
+                'db_table': 'test_job',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
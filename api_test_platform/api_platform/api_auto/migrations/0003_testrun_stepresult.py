@@ -0,0 +1,58 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto', '0002_testjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestRun',
+            fields=[
+                ('run_id', models.CharField(max_length=32, primary_key=True, serialize=False, verbose_name='执行批次ID')),
+                ('run_type', models.CharField(max_length=20, verbose_name='执行类型')),
+                ('status', models.CharField(choices=[('running', '执行中'), ('completed', '已完成'), ('failed', '执行失败')], default='running', max_length=20, verbose_name='执行状态')),
+                ('total', models.IntegerField(default=0, verbose_name='步骤总数')),
+                ('passed', models.IntegerField(default=0, verbose_name='通过数')),
+                ('failed', models.IntegerField(default=0, verbose_name='失败数')),
+                ('started_at', models.DateTimeField(verbose_name='开始时间')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='结束时间')),
+            ],
+            options={
+                'verbose_name': '执行批次',
+                'verbose_name_plural': '执行批次',
+                'db_table': 'test_run',
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['-started_at'], name='idx_run_started')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StepResult',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('case_step_info_id', models.CharField(max_length=10, verbose_name='步骤ID')),
+                ('case_id', models.CharField(max_length=10, verbose_name='测试用例编号')),
+                ('part_name', models.CharField(max_length=255, verbose_name='模块名称')),
+                ('api_name', models.CharField(max_length=100, verbose_name='接口名称')),
+                ('status', models.CharField(choices=[('passed', '通过'), ('failed', '失败'), ('error', '异常')], max_length=10, verbose_name='执行状态')),
+                ('http_status', models.IntegerField(blank=True, null=True, verbose_name='HTTP状态码')),
+                ('response_time', models.FloatField(blank=True, null=True, verbose_name='响应时间(ms)')),
+                ('response_size', models.IntegerField(blank=True, null=True, verbose_name='响应大小(字节)')),
+                ('message', models.TextField(blank=True, default='', verbose_name='断言信息')),
+                ('started_at', models.DateTimeField(verbose_name='开始时间')),
+                ('finished_at', models.DateTimeField(verbose_name='结束时间')),
+                ('run', models.ForeignKey(db_column='run_id', on_delete=django.db.models.deletion.CASCADE, related_name='step_results', to='api_auto.testrun', verbose_name='执行批次')),
+            ],
+            options={
+                'verbose_name': '步骤执行结果',
+                'verbose_name_plural': '步骤执行结果',
+                'db_table': 'step_result',
+                'indexes': [models.Index(fields=['case_step_info_id', '-started_at'], name='idx_step_result_step'), models.Index(fields=['run', '-response_time'], name='idx_step_result_slowest')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto', '0003_testrun_stepresult'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stepresult',
+            name='connect_time',
+            field=models.FloatField(blank=True, null=True, verbose_name='连接耗时(ms)'),
+        ),
+        migrations.AddField(
+            model_name='stepresult',
+            name='tls_time',
+            field=models.FloatField(blank=True, null=True, verbose_name='TLS握手耗时(ms)'),
+        ),
+        migrations.AddField(
+            model_name='stepresult',
+            name='ttfb',
+            field=models.FloatField(blank=True, null=True, verbose_name='首字节时间(ms)'),
+        ),
+        migrations.AddField(
+            model_name='stepresult',
+            name='request_size',
+            field=models.IntegerField(blank=True, null=True, verbose_name='请求大小(字节)'),
+        ),
+    ]
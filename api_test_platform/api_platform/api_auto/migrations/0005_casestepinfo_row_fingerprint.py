@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto', '0004_stepresult_timings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='casestepinfo',
+            name='row_fingerprint',
+            field=models.CharField(blank=True, max_length=64, null=True, verbose_name='导入行指纹'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto', '0005_casestepinfo_row_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='casestepinfo',
+            index=models.Index(fields=['part_name', 'case_id', 'case_step_name'], name='idx_step_module_case'),
+        ),
+        migrations.AddIndex(
+            model_name='casestepinfo',
+            index=models.Index(fields=['is_pass'], name='idx_step_is_pass'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto', '0006_casestepinfo_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseStat',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('scope', models.CharField(choices=[('total', '全部'), ('module', '模块'), ('api', '接口')], max_length=10, verbose_name='统计范围')),
+                ('key', models.CharField(blank=True, default='', max_length=255, verbose_name='模块/接口名称')),
+                ('total', models.IntegerField(default=0, verbose_name='步骤总数')),
+                ('passed', models.IntegerField(default=0, verbose_name='通过数')),
+                ('failed', models.IntegerField(default=0, verbose_name='失败数')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '用例执行统计',
+                'verbose_name_plural': '用例执行统计',
+                'db_table': 'case_stat',
+                'unique_together': {('scope', 'key')},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto', '0007_casestat'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='caseinfo',
+            index=models.Index(fields=['case_id'], name='idx_case_info_case_id'),
+        ),
+    ]
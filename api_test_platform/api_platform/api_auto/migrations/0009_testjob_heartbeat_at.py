@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto', '0008_caseinfo_case_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='心跳时间'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto', '0009_testjob_heartbeat_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stepresult',
+            name='dns_time',
+            field=models.FloatField(blank=True, null=True, verbose_name='域名解析耗时(ms)'),
+        ),
+    ]
@@ -29,6 +29,10 @@ class CaseInfo(models.Model):
         db_table = 'case_info'  # 关联现有表
         verbose_name = "用例信息"
         verbose_name_plural = verbose_name
+        indexes = [
+            # 按用例编号关联用例名称（接口管理列表）
+            models.Index(fields=['case_id'], name='idx_case_info_case_id'),
+        ]
 
     def __str__(self):
         return f"{self.case_id}-{self.case_name}"
@@ -47,12 +51,19 @@ class CaseStepInfo(models.Model):
     excepted_result = models.TextField(verbose_name="期望结果")
     is_pass = models.CharField(max_length=255, null=True, blank=True, verbose_name="是否通过")
     get_value_code = models.TextField(null=True, blank=True, verbose_name="取值代码")
+    row_fingerprint = models.CharField(max_length=64, null=True, blank=True, verbose_name="导入行指纹")
 
     class Meta:
         db_table = 'case_step_info'  # 关联现有表
         verbose_name = "用例步骤"
         verbose_name_plural = verbose_name
         ordering = ['part_name', 'case_id', 'case_step_name']  # 排序规则
+        indexes = [
+            # 用例列表按模块分组、模块内键集分页
+            models.Index(fields=['part_name', 'case_id', 'case_step_name'], name='idx_step_module_case'),
+            # 按执行结果筛选、失败用例统计
+            models.Index(fields=['is_pass'], name='idx_step_is_pass'),
+        ]
 
     def __str__(self):
         return f"{self.part_name}-{self.case_id}-{self.case_step_name}"
@@ -73,4 +84,155 @@ class ConfigUrl(models.Model):
         unique_together = ('section', 'key_name')  # 确保section和key_name组合唯一
 
     def __str__(self):
-        return f"{self.url_chin_name} ({self.urls_addr})"
\ No newline at end of file
+        return f"{self.url_chin_name} ({self.urls_addr})"
+
+class TestJob(models.Model):
+    """后台执行任务表（记录任务状态、进度和结果）"""
+    STATUS_CHOICES = [
+        ('queued', '排队中'),
+        ('running', '执行中'),
+        ('completed', '已完成'),
+        ('failed', '执行失败'),
+    ]
+    JOB_TYPE_CHOICES = [
+        ('run_all_cases', '批量执行用例'),
+        ('run_case_report', '执行用例并生成报告'),
+    ]
+
+    job_id = models.CharField(max_length=32, primary_key=True, verbose_name="任务ID")
+    job_type = models.CharField(max_length=20, choices=JOB_TYPE_CHOICES, verbose_name="任务类型")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued', verbose_name="任务状态")
+    case_step_ids = models.TextField(blank=True, default='', verbose_name="指定步骤ID")
+    total = models.IntegerField(default=0, verbose_name="用例总数")
+    current = models.IntegerField(default=0, verbose_name="已执行数")
+    success = models.IntegerField(default=0, verbose_name="通过数")
+    failure = models.IntegerField(default=0, verbose_name="失败数")
+    result = models.TextField(blank=True, default='', verbose_name="执行结果")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="提交时间")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="开始时间")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="结束时间")
+    heartbeat_at = models.DateTimeField(null=True, blank=True, verbose_name="心跳时间")
+
+    class Meta:
+        db_table = 'test_job'
+        verbose_name = "执行任务"
+        verbose_name_plural = verbose_name
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.job_id}-{self.get_status_display()}"
+
+    def to_progress(self):
+        """转换为进度轮询接口的返回格式"""
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'total': self.total,
+            'current': self.current,
+            'success': self.success,
+            'failure': self.failure,
+            'message': self.result,
+        }
+
+
+class TestRun(models.Model):
+    """执行批次表（一次执行对应一条记录，由执行器写入）"""
+    STATUS_CHOICES = [
+        ('running', '执行中'),
+        ('completed', '已完成'),
+        ('failed', '执行失败'),
+    ]
+
+    run_id = models.CharField(max_length=32, primary_key=True, verbose_name="执行批次ID")
+    run_type = models.CharField(max_length=20, verbose_name="执行类型")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running', verbose_name="执行状态")
+    total = models.IntegerField(default=0, verbose_name="步骤总数")
+    passed = models.IntegerField(default=0, verbose_name="通过数")
+    failed = models.IntegerField(default=0, verbose_name="失败数")
+    started_at = models.DateTimeField(verbose_name="开始时间")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="结束时间")
+
+    class Meta:
+        db_table = 'test_run'
+        verbose_name = "执行批次"
+        verbose_name_plural = verbose_name
+        ordering = ['-started_at']
+        indexes = [
+            # 最近执行批次列表、过期历史清理
+            models.Index(fields=['-started_at'], name='idx_run_started'),
+        ]
+
+    def __str__(self):
+        return f"{self.run_id}-{self.get_status_display()}"
+
+
+class StepResult(models.Model):
+    """步骤执行结果表（每次执行每个请求步骤一条记录，由执行器批量写入）"""
+    STATUS_CHOICES = [
+        ('passed', '通过'),
+        ('failed', '失败'),
+        ('error', '异常'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    run = models.ForeignKey(TestRun, on_delete=models.CASCADE, db_column='run_id',
+                            related_name='step_results', verbose_name="执行批次")
+    case_step_info_id = models.CharField(max_length=10, verbose_name="步骤ID")
+    case_id = models.CharField(max_length=10, verbose_name="测试用例编号")
+    part_name = models.CharField(max_length=255, verbose_name="模块名称")
+    api_name = models.CharField(max_length=100, verbose_name="接口名称")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, verbose_name="执行状态")
+    http_status = models.IntegerField(null=True, blank=True, verbose_name="HTTP状态码")
+    dns_time = models.FloatField(null=True, blank=True, verbose_name="域名解析耗时(ms)")
+    connect_time = models.FloatField(null=True, blank=True, verbose_name="连接耗时(ms)")
+    tls_time = models.FloatField(null=True, blank=True, verbose_name="TLS握手耗时(ms)")
+    ttfb = models.FloatField(null=True, blank=True, verbose_name="首字节时间(ms)")
+    response_time = models.FloatField(null=True, blank=True, verbose_name="响应时间(ms)")
+    request_size = models.IntegerField(null=True, blank=True, verbose_name="请求大小(字节)")
+    response_size = models.IntegerField(null=True, blank=True, verbose_name="响应大小(字节)")
+    message = models.TextField(blank=True, default='', verbose_name="断言信息")
+    started_at = models.DateTimeField(verbose_name="开始时间")
+    finished_at = models.DateTimeField(verbose_name="结束时间")
+
+    class Meta:
+        db_table = 'step_result'
+        verbose_name = "步骤执行结果"
+        verbose_name_plural = verbose_name
+        indexes = [
+            # 某步骤最近N次执行（趋势、稳定性分析）
+            models.Index(fields=['case_step_info_id', '-started_at'], name='idx_step_result_step'),
+            # 某批次最慢的步骤
+            models.Index(fields=['run', '-response_time'], name='idx_step_result_slowest'),
+        ]
+
+    def __str__(self):
+        return f"{self.run_id}-{self.case_step_info_id}-{self.get_status_display()}"
+
+
+class CaseStat(models.Model):
+    """
+    用例执行统计表（物化汇总，由stats模块维护）：全部/按模块/按接口的步骤数、通过数、失败数。
+    执行结果写入、平台上增删改用例时增量更新；导入用例后清空，下次读取时重建
+    """
+    SCOPE_CHOICES = [
+        ('total', '全部'),
+        ('module', '模块'),
+        ('api', '接口'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    scope = models.CharField(max_length=10, choices=SCOPE_CHOICES, verbose_name="统计范围")
+    key = models.CharField(max_length=255, blank=True, default='', verbose_name="模块/接口名称")
+    total = models.IntegerField(default=0, verbose_name="步骤总数")
+    passed = models.IntegerField(default=0, verbose_name="通过数")
+    failed = models.IntegerField(default=0, verbose_name="失败数")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="更新时间")
+
+    class Meta:
+        db_table = 'case_stat'
+        verbose_name = "用例执行统计"
+        verbose_name_plural = verbose_name
+        unique_together = ('scope', 'key')
+
+    def __str__(self):
+        return f"{self.get_scope_display()}-{self.key}"
@@ -0,0 +1,99 @@
+"""
+执行进度推送：后台任务每执行完一条用例发布一条事件，Server-Sent Events接口按任务ID读取并推送给浏览器。
+事件按任务ID和序号保存在Django缓存中，任务在独立进程中执行，需要文件/Redis等跨进程共享的缓存；
+流式响应在WSGI下会被缓冲，因此只有以ASGI方式部署且缓存共享时才启用推送，否则页面轮询任务进度。
+"""
+import json
+import asyncio
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from common.log_utils import logger
+
+# 单次读取的最大事件数（断线重连时分批补发）
+READ_BATCH_SIZE = 500
+# 可跨进程共享进度事件的缓存后端
+SHARED_CACHE_BACKENDS = (
+    'django.core.cache.backends.filebased.FileBasedCache',
+    'django.core.cache.backends.redis.RedisCache',
+)
+
+
+def stream_supported(request):
+    """当前部署是否可以推送进度：请求经ASGI处理（WSGI下事件流会被缓冲到任务结束）且缓存跨进程共享"""
+    from django.core.handlers.asgi import ASGIRequest
+
+    return isinstance(request, ASGIRequest) and settings.CACHES['default']['BACKEND'] in SHARED_CACHE_BACKENDS
+
+
+def _seq_key(job_id):
+    return f"job_progress_{job_id}_seq"
+
+
+def _event_key(job_id, seq):
+    return f"job_progress_{job_id}_{seq}"
+
+
+def publish_progress(job_id, event):
+    """发布一条进度事件（序号自增）；缓存不可用时只记录警告，不影响用例执行"""
+    try:
+        cache.add(_seq_key(job_id), 0, settings.PROGRESS_EVENT_TTL)
+        seq = cache.incr(_seq_key(job_id))
+        cache.set(_event_key(job_id, seq), event, settings.PROGRESS_EVENT_TTL)
+        return seq
+    except Exception as e:
+        logger.warning(f"执行进度事件发布失败: job_id={job_id}, 错误: {str(e)}")
+        return None
+
+
+def read_progress_events(job_id, after=0):
+    """读取序号after之后的事件，返回 [(序号, 事件)]（已过期的事件跳过）"""
+    latest = cache.get(_seq_key(job_id)) or 0
+    seqs = range(after + 1, min(latest, after + READ_BATCH_SIZE) + 1)
+    events = cache.get_many([_event_key(job_id, seq) for seq in seqs])
+    return [(seq, events[_event_key(job_id, seq)]) for seq in seqs if _event_key(job_id, seq) in events]
+
+
+def format_sse(event_type, data, event_id=None):
+    """格式化一条Server-Sent Events消息"""
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
+    return '\n'.join(lines) + '\n\n'
+
+
+async def progress_stream(job_id, last_event_id=0):
+    """
+    任务进度事件流：case事件为每条用例的执行结果（id为序号，浏览器重连时从Last-Event-ID继续），
+    汇总进度变化时推送progress事件，任务结束时推送done事件后关闭；长时间无事件时发送注释行保活
+    """
+    from .models import TestJob
+
+    last_progress = None
+    idle = 0
+    yield 'retry: 3000\n\n'
+    while True:
+        events = await sync_to_async(read_progress_events)(job_id, last_event_id)
+        for seq, event in events:
+            last_event_id = seq
+            yield format_sse('case', event, seq)
+
+        job = await TestJob.objects.filter(job_id=job_id).afirst()
+        if job is None:
+            yield format_sse('done', {'job_id': job_id, 'status': 'failed', 'message': '任务不存在'})
+            return
+        progress = job.to_progress()
+        if progress != last_progress:
+            last_progress = progress
+            idle = 0
+            yield format_sse('progress', progress)
+        if job.status in ('completed', 'failed'):
+            yield format_sse('done', progress)
+            return
+
+        idle = 0 if events else idle + settings.PROGRESS_STREAM_INTERVAL
+        if idle >= settings.PROGRESS_KEEPALIVE_SECONDS:
+            idle = 0
+            yield ': keepalive\n\n'
+        await asyncio.sleep(settings.PROGRESS_STREAM_INTERVAL)
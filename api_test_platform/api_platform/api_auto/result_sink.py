@@ -0,0 +1,66 @@
+import time
+from django.conf import settings
+
+from common.log_utils import logger
+
+
+class ResultSink():
+    """
+    执行结果缓冲写入：累计N条或超过T毫秒时用bulk_update批量回写is_pass，同一事务中增量更新用例执行统计表，
+    进度回调按同样节奏合并触发；作为上下文管理器使用时，正常结束或异常退出都会执行最后一次刷新。
+    """
+
+    def __init__(self, progress_callback=None, batch_size=None, flush_interval_ms=None):
+        self.progress_callback = progress_callback
+        self.batch_size = batch_size or settings.RESULT_FLUSH_SIZE
+        self.flush_interval = (flush_interval_ms or settings.RESULT_FLUSH_INTERVAL_MS) / 1000
+        self._buffer = []
+        self._changes = []
+        self._last_flush = time.monotonic()
+        self.current = 0
+        self.success = 0
+        self.failure = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush()
+        return False
+
+    def add(self, case_step, passed):
+        """记录一条执行结果（case_step为CaseStepInfo实例，需已加载模块名称和关联接口名称）"""
+        is_pass = "通过" if passed else "失败"
+        self._changes.append((case_step.is_pass, is_pass, case_step.part_name, case_step.api.api_name))
+        case_step.is_pass = is_pass
+        self._buffer.append(case_step)
+        self.current += 1
+        if passed:
+            self.success += 1
+        else:
+            self.failure += 1
+
+        if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """批量回写缓冲区中的结果并上报一次进度"""
+        if self._buffer:
+            from django.db import transaction
+            from .models import CaseStepInfo
+            from .stats import apply_result_changes
+            from .view_cache import CASE_DETAIL, bump_namespaces
+            with transaction.atomic():
+                CaseStepInfo.objects.bulk_update(self._buffer, ['is_pass'], batch_size=self.batch_size)
+                apply_result_changes(self._changes)
+            # bulk_update不触发模型信号，直接失效用例详情页缓存
+            bump_namespaces(CASE_DETAIL)
+            logger.debug(f"批量回写执行结果 {len(self._buffer)} 条")
+            self._buffer = []
+            self._changes = []
+        if self.progress_callback:
+            self.progress_callback(self.progress())
+        self._last_flush = time.monotonic()
+
+    def progress(self):
+        return {'current': self.current, 'success': self.success, 'failure': self.failure}
@@ -0,0 +1,65 @@
+"""
+模型变化时失效页面缓存：保存/删除后递增依赖该模型的页面命名空间版本号。
+queryset.update/bulk_update和导入工具的SQL写入不会触发信号，由调用处直接调用bump_namespaces。
+平台上修改/删除导入的数据时同时失效涉及这些模块的工作簿哈希缓存，内容未变化的工作簿再次批量导入时不再跳过。
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from common.excel_utils import WorkbookHashCache
+from .models import ApiInfo, CaseInfo, CaseStepInfo, ConfigUrl
+from .view_cache import API_CONFIG, CONFIG_LIST, CASE_DETAIL, bump_namespaces
+
+# 模型 -> 依赖该模型数据的页面
+MODEL_NAMESPACES = {
+    ApiInfo: (API_CONFIG, CASE_DETAIL),
+    CaseInfo: (CASE_DETAIL,),
+    CaseStepInfo: (CASE_DETAIL,),
+    ConfigUrl: (CONFIG_LIST,),
+}
+
+# 由Excel导入写入的模型（执行结果只通过queryset.update/bulk_update写入，不触发信号）
+IMPORTED_MODELS = (ApiInfo, CaseInfo, CaseStepInfo)
+
+
+def invalidate_view_cache(sender, **kwargs):
+    bump_namespaces(*MODEL_NAMESPACES[sender])
+
+
+def _affected_part_names(sender, instance):
+    """数据变化影响的模块：步骤取自身模块（编辑前的模块在pre_save中记录），接口和用例取引用它们的步骤的模块"""
+    if sender is CaseStepInfo:
+        return {instance.part_name, *getattr(instance, '_saved_part_names', ())}
+    if sender is ApiInfo:
+        steps = CaseStepInfo.objects.filter(api_id=instance.pk)
+    else:
+        steps = CaseStepInfo.objects.filter(case_id=instance.case_id)
+    return set(steps.values_list('part_name', flat=True).distinct())
+
+
+def remember_step_part_name(sender, instance, raw=False, **kwargs):
+    """编辑步骤可能修改模块名称，保存前记录数据库中原来的模块，原模块的工作簿同样需要失效"""
+    if raw or not WorkbookHashCache().exists():
+        return
+    instance._saved_part_names = set(
+        CaseStepInfo.objects.filter(pk=instance.pk).values_list('part_name', flat=True)
+    )
+
+
+def invalidate_workbook_hash_cache(sender, instance, **kwargs):
+    hash_cache = WorkbookHashCache()
+    # 没有缓存文件时不查询受影响的模块
+    if hash_cache.exists():
+        hash_cache.invalidate_parts(_affected_part_names(sender, instance))
+
+
+for model in MODEL_NAMESPACES:
+    post_save.connect(invalidate_view_cache, sender=model, dispatch_uid=f'view_cache_save_{model.__name__}')
+    post_delete.connect(invalidate_view_cache, sender=model, dispatch_uid=f'view_cache_delete_{model.__name__}')
+
+pre_save.connect(remember_step_part_name, sender=CaseStepInfo, dispatch_uid='workbook_hash_cache_pre_save_CaseStepInfo')
+
+for model in IMPORTED_MODELS:
+    post_save.connect(invalidate_workbook_hash_cache, sender=model,
+                      dispatch_uid=f'workbook_hash_cache_save_{model.__name__}')
+    post_delete.connect(invalidate_workbook_hash_cache, sender=model,
+                        dispatch_uid=f'workbook_hash_cache_delete_{model.__name__}')
@@ -0,0 +1,216 @@
+"""
+统计查询：从执行历史（step_result）汇总仪表盘所需的接口耗时数据；
+维护用例执行统计表（case_stat），仪表盘读取汇总结果而不是每次扫描case_step_info。
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F
+
+from common.latency_stats import LatencyStats
+from common.log_utils import logger
+
+DASHBOARD_STATS_CACHE_KEY = 'dashboard_case_stats'
+# 仪表盘按接口统计展示的条数（按失败数降序）
+DASHBOARD_API_LIMIT = 20
+# 计入统计的执行结果 -> 统计字段
+PASS_STATUS_FIELDS = {'通过': 'passed', '失败': 'failed'}
+
+
+def _stat_keys(part_name, api_name):
+    """一个步骤计入的统计行：全部、所属模块、所属接口"""
+    return ('total', ''), ('module', part_name or ''), ('api', api_name or '')
+
+
+def rebuild_case_stats():
+    """
+    全量重建统计表：按（模块、接口、执行结果）一次GROUP BY汇总后整体替换。
+    先锁定全部统计行（不存在时插入）再在同一事务内汇总：增量更新同样先更新全部统计行，
+    与重建串行执行，重建期间提交的执行结果不会被整体替换覆盖
+    """
+    from .models import CaseStat, CaseStepInfo
+
+    with transaction.atomic():
+        total_stat, _ = CaseStat.objects.select_for_update().get_or_create(scope='total', key='')
+        counters = defaultdict(lambda: {'total': 0, 'passed': 0, 'failed': 0})
+        counters[('total', '')]  # 没有用例时也写入全部统计行，标记统计表已构建
+        rows = CaseStepInfo.objects.values('part_name', 'api__api_name', 'is_pass').annotate(
+            count=Count('case_step_info_id')
+        ).order_by()
+        for row in rows:
+            field = PASS_STATUS_FIELDS.get(row['is_pass'])
+            for key in _stat_keys(row['part_name'], row['api__api_name']):
+                counters[key]['total'] += row['count']
+                if field:
+                    counters[key][field] += row['count']
+
+        CaseStat.objects.exclude(pk=total_stat.pk).delete()
+        CaseStat.objects.filter(pk=total_stat.pk).update(**counters.pop(('total', '')))
+        CaseStat.objects.bulk_create([
+            CaseStat(scope=scope, key=key, **counts) for (scope, key), counts in counters.items()
+        ])
+    logger.info(f"用例执行统计表已重建，共 {len(counters) + 1} 行")
+
+
+def apply_result_changes(changes):
+    """
+    执行结果写入后增量更新统计表：changes为 [(原执行结果, 新执行结果, 模块名称, 接口名称)]，
+    只调整通过数/失败数（步骤总数不变）；统计表尚未构建时更新不到记录，下次读取时全量重建。
+    应与执行结果写入在同一事务中调用，保证与重建串行
+    """
+    deltas = defaultdict(lambda: defaultdict(int))
+    for old_status, new_status, part_name, api_name in changes:
+        if old_status == new_status:
+            continue
+        for key in _stat_keys(part_name, api_name):
+            if old_status in PASS_STATUS_FIELDS:
+                deltas[key][PASS_STATUS_FIELDS[old_status]] -= 1
+            if new_status in PASS_STATUS_FIELDS:
+                deltas[key][PASS_STATUS_FIELDS[new_status]] += 1
+    _apply_deltas(deltas)
+
+
+def apply_step_changes(removed=(), added=()):
+    """
+    增删改步骤后增量更新统计表：removed/added为 [(执行结果, 模块名称, 接口名称)]，
+    编辑步骤按删除原步骤、新增修改后的步骤计算（模块和接口未变化时相互抵消）
+    """
+    deltas = defaultdict(lambda: defaultdict(int))
+    for sign, rows in ((-1, removed), (1, added)):
+        for is_pass, part_name, api_name in rows:
+            field = PASS_STATUS_FIELDS.get(is_pass)
+            for key in _stat_keys(part_name, api_name):
+                deltas[key]['total'] += sign
+                if field:
+                    deltas[key][field] += sign
+    _apply_deltas(deltas)
+
+
+def _apply_deltas(deltas):
+    """
+    按 {(统计范围, 名称): {字段: 增量}} 更新统计表：全部统计行最先更新（与重建的加锁顺序一致），
+    未更新到全部统计行说明统计表尚未构建，不再更新其他行；模块/接口统计行不存在时新增，步骤数减为0时删除
+    """
+    from .models import CaseStat
+
+    with transaction.atomic():
+        for (scope, key), delta in sorted(deltas.items(), key=lambda item: item[0][0] != 'total'):
+            updates = {field: F(field) + value for field, value in delta.items() if value}
+            if not updates:
+                continue
+            updated = CaseStat.objects.filter(scope=scope, key=key).update(**updates)
+            if scope == 'total' and not updated:
+                return
+            if not updated and delta.get('total', 0) > 0:
+                CaseStat.objects.create(scope=scope, key=key, **delta)
+        if any(delta.get('total', 0) < 0 for delta in deltas.values()):
+            CaseStat.objects.exclude(scope='total').filter(total__lte=0).delete()
+        # 外层事务提交后再删除缓存，避免提交前被其他请求用旧数据重新缓存
+        transaction.on_commit(lambda: cache.delete(DASHBOARD_STATS_CACHE_KEY))
+
+
+def _step_stat_rows(steps):
+    return list(steps.values_list('is_pass', 'part_name', 'api__api_name'))
+
+
+@contextmanager
+def track_step_changes(steps):
+    """
+    增删改用例步骤时增量更新统计表：steps为可能受影响的步骤queryset，修改前后各读取一次
+    （执行结果、模块、接口）并按差异更新；修改中途抛出异常时按已生效的部分更新
+    """
+    before = _step_stat_rows(steps)
+    try:
+        yield
+    finally:
+        apply_step_changes(before, _step_stat_rows(steps))
+
+
+def invalidate_case_stats():
+    """导入用例后清空统计表（下次读取时重建）并删除缓存"""
+    from .models import CaseStat
+
+    CaseStat.objects.all().delete()
+    cache.delete(DASHBOARD_STATS_CACHE_KEY)
+
+
+def _stat_row(stat):
+    row = {'name': stat['key'], 'total': stat['total'], 'passed': stat['passed'], 'failed': stat['failed']}
+    row['pass_rate'] = round(stat['passed'] / stat['total'] * 100, 2) if stat['total'] else 0
+    return row
+
+
+def dashboard_stats():
+    """
+    仪表盘用例统计（读取量只与模块/接口数量有关，与用例数量无关）：优先读缓存，其次读统计表，
+    统计表为空时全量重建。返回 {'total': 全部统计, 'modules': 按模块, 'apis': 失败最多的接口}
+    """
+    data = cache.get(DASHBOARD_STATS_CACHE_KEY)
+    if data is not None:
+        return data
+
+    from .models import CaseStat
+
+    fields = ('scope', 'key', 'total', 'passed', 'failed')
+    stats = list(CaseStat.objects.filter(scope__in=('total', 'module')).values(*fields))
+    if not any(stat['scope'] == 'total' for stat in stats):
+        rebuild_case_stats()
+        stats = list(CaseStat.objects.filter(scope__in=('total', 'module')).values(*fields))
+    apis = CaseStat.objects.filter(scope='api').order_by('-failed', '-total', 'key').values(*fields)
+
+    total = next(stat for stat in stats if stat['scope'] == 'total')
+    data = {
+        'total': _stat_row(total),
+        'modules': sorted((_stat_row(stat) for stat in stats if stat['scope'] == 'module'),
+                          key=lambda row: row['name']),
+        'apis': [_stat_row(stat) for stat in apis[:DASHBOARD_API_LIMIT]],
+    }
+    cache.set(DASHBOARD_STATS_CACHE_KEY, data, settings.DASHBOARD_STATS_TTL)
+    return data
+
+
+def run_latency_summary(run):
+    """按接口汇总一个执行批次的耗时分位数和吞吐量（按p90降序）"""
+    from .models import StepResult
+
+    latency_stats = LatencyStats()
+    step_results = StepResult.objects.filter(run=run).values(
+        'api_name', 'status', 'response_time', 'ttfb', 'request_size', 'response_size'
+    )
+    for step_result in step_results.iterator(chunk_size=2000):
+        latency_stats.add(step_result)
+
+    duration = None
+    if run.finished_at:
+        duration = (run.finished_at - run.started_at).total_seconds()
+    return latency_stats.summary(duration)
+
+
+def latest_latency_comparison():
+    """
+    最近一次已完成执行的接口耗时统计，并与上一次执行对比p90变化（正数表示变慢）
+    :return: (最近一次执行批次, 统计行列表)，没有执行历史时返回 (None, [])
+    """
+    from .models import TestRun
+
+    runs = list(TestRun.objects.filter(status='completed', finished_at__isnull=False)[:2])
+    if not runs:
+        return None, []
+
+    # 已完成批次的执行结果不再变化，按批次ID缓存对比结果
+    cache_key = 'latency_comparison_' + '_'.join(run.run_id for run in runs)
+    rows = cache.get(cache_key)
+    if rows is not None:
+        return runs[0], rows
+
+    rows = run_latency_summary(runs[0])
+    previous = {row['api_name']: row for row in run_latency_summary(runs[1])} if len(runs) > 1 else {}
+    for row in rows:
+        previous_p90 = previous.get(row['api_name'], {}).get('p90')
+        row['p90_delta'] = None
+        if row['p90'] is not None and previous_p90 is not None:
+            row['p90_delta'] = round(row['p90'] - previous_p90, 2)
+    cache.set(cache_key, rows, None)
+    return runs[0], rows
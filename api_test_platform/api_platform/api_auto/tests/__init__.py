@@ -0,0 +1,4 @@
+"""
+api_auto及其依赖的common/test_runner模块的单元测试：python manage.py test api_auto（在api_platform目录下执行）。
+按需求拆分为test_*.py模块；数据库用例使用Django测试数据库，缓存统一替换为进程内存缓存，工作簿哈希缓存替换为Mock，不改动测试数据目录。
+"""
@@ -0,0 +1,30 @@
+"""测试公共部分：进程内存缓存配置与数据库用例基类"""
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from api_auto.models import ApiInfo, CaseStepInfo
+
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'api_auto_tests'}}
+
+
+class PlatformTestCase(TestCase):
+    """数据库用例基类：清空缓存，模型信号中的工作簿哈希缓存替换为Mock"""
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch('api_auto.signals.WorkbookHashCache')
+        self.hash_cache_cls = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.api = ApiInfo.objects.create(
+            api_id='api_01', api_name='登录接口', api_request_type='POST',
+            api_request_url='/api/login', api_url_params='{}', api_post_data='{}'
+        )
+
+    def create_step(self, step_id, case_id, part_name='模块A', step_name='step_01', is_pass='未执行'):
+        return CaseStepInfo.objects.create(
+            case_step_info_id=step_id, case_id=case_id, case_step_name=step_name, part_name=part_name,
+            api=self.api, get_value_type='无', variable_name='', excepted_result_type='无',
+            excepted_result='', is_pass=is_pass
+        )
@@ -0,0 +1,67 @@
+"""接口管理列表分页、搜索与排序（user-023）"""
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api_auto.models import ApiInfo, CaseInfo
+from .base import TEST_CACHES, PlatformTestCase
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ApiManagementListTest(PlatformTestCase):
+
+    def setUp(self):
+        super().setUp()
+        ApiInfo.objects.create(api_id='api_02', api_name='查询订单', api_request_type='GET',
+                               api_request_url='/api/orders', api_url_params='{}', api_post_data='{}')
+        for index in range(5):
+            step = self.create_step(f"s{index}", f"case_{index:02d}", part_name='模块B' if index % 2 else '模块A')
+            if index >= 3:
+                step.api_id = 'api_02'
+                step.save()
+            CaseInfo.objects.create(case_info_id=f"c{index}", case_id=f"case_{index:02d}", case_name=f"用例{index}")
+
+    def _list(self, **params):
+        return self.client.get(reverse('api_auto:api_management_list'), params).json()
+
+    def test_page_rows_joined_in_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self._list(page_size=2, page=2)
+
+        self.assertEqual((data['page'], data['num_pages'], data['count']), (2, 3, 5))
+        self.assertEqual(data['results'], [
+            {'case_step_info_id': 's2', 'case_id': 'case_02', 'case_name': '用例2', 'case_step_name': 'step_01',
+             'part_name': '模块A', 'api_name': '登录接口'},
+            {'case_step_info_id': 's3', 'case_id': 'case_03', 'case_name': '用例3', 'case_step_name': 'step_01',
+             'part_name': '模块B', 'api_name': '查询订单'},
+        ])
+        # 分页计数一条、当前页数据一条（接口名称JOIN、用例名称子查询）
+        self.assertEqual(len(queries), 2)
+
+    def test_search_by_case_id_case_name_and_api_name(self):
+        self.assertEqual([row['case_id'] for row in self._list(q='case_01')['results']], ['case_01'])
+        self.assertEqual([row['case_id'] for row in self._list(q='用例2')['results']], ['case_02'])
+        self.assertEqual([row['case_id'] for row in self._list(q='订单')['results']], ['case_03', 'case_04'])
+
+    def test_sort_by_column(self):
+        data = self._list(sort='-api_name')
+        self.assertEqual(data['sort'], '-api_name')
+        api_names = [row['api_name'] for row in data['results']]
+        self.assertEqual(api_names, sorted(api_names, reverse=True))
+        self.assertEqual(len(set(api_names)), 2)
+
+        data = self._list(sort='part_name')
+        self.assertEqual([row['case_step_info_id'] for row in data['results']], ['s0', 's2', 's4', 's1', 's3'])
+
+    def test_invalid_sort_and_page_fall_back(self):
+        data = self._list(sort='api__api_post_data', page='abc', page_size='x')
+        self.assertEqual((data['sort'], data['page'], data['count']), ('case_id', 1, 5))
+
+        data = self._list(page_size=2, page=99)
+        self.assertEqual(data['page'], 3)
+
+    def test_page_view(self):
+        response = self.client.get(reverse('api_auto:api_management'), {'q': '订单', 'sort': '-case_id'})
+        self.assertEqual([row['case_id'] for row in response.context['cases']], ['case_04', 'case_03'])
+        self.assertEqual(response.context['keyword'], '订单')
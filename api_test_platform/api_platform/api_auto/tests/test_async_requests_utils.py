@@ -0,0 +1,78 @@
+"""异步请求引擎（user-002）"""
+from unittest import mock
+
+import httpx
+from django.test import SimpleTestCase
+
+from common.async_requests_utils import AsyncRequestsUtils
+
+
+def step(case_id, step_name, url):
+    return {'case_step_info_id': f"{case_id}_{step_name}", '测试用例编号': case_id, '模块名称': '模块A',
+            '测试用例名称': '登录接口', '用例执行': '是', '测试用例步骤': step_name, '接口名称': '登录接口',
+            '请求方式': 'GET', '请求地址': url, '请求参数(get)': '', '提交数据(post)': '', '取值方式': '无',
+            '传值变量': '', '取值代码': '', '期望结果类型': '无', '期望结果': ''}
+
+
+class AsyncRequestsUtilsTest(SimpleTestCase):
+
+    @staticmethod
+    def _handler(request):
+        if request.url.path == '/login':
+            return httpx.Response(302, headers={'location': '/home', 'set-cookie': 'sid=abc; Path=/'})
+        return httpx.Response(200, json={'cookie': request.headers.get('cookie')})
+
+    def setUp(self):
+        self.transports = []
+        patcher = mock.patch('common.async_requests_utils.SessionPool.new_async_transport',
+                             side_effect=self._new_transport)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.engine = AsyncRequestsUtils()
+
+    def _new_transport(self):
+        transport = mock.Mock(wraps=httpx.MockTransport(self._handler))
+        self.transports.append(transport)
+        return transport
+
+    async def _send_all(self, urls):
+        async with self.engine.client() as client:
+            responses = [(await self.engine._send(client, 'GET', url))[0] for url in urls]
+            return responses, client.cookies
+
+    def test_follows_redirect_and_keeps_cookies(self):
+        (response,), cookies = self.engine.run_sync(self._send_all(['http://api.test/login']))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([hop.status_code for hop in response.history], [302])
+        self.assertEqual(response.json(), {'cookie': 'sid=abc'})
+        self.assertEqual(cookies.get('sid'), 'abc')
+
+    def test_cookies_isolated_per_chain(self):
+        self.engine.run_sync(self._send_all(['http://api.test/login']))
+        (response,), cookies = self.engine.run_sync(self._send_all(['http://api.test/home']))
+
+        self.assertIsNone(response.json()['cookie'])
+        self.assertNotIn('sid', cookies)
+
+    def test_chain_reuses_one_client(self):
+        clients = []
+        new_client = self.engine.client
+
+        def tracked_client():
+            clients.append(new_client())
+            return clients[-1]
+
+        steps = [step('case_01', 'step_01', '/login'), step('case_01', 'step_02', '/home')]
+        with mock.patch.object(self.engine, 'client', side_effect=tracked_client):
+            result = self.engine.run_sync(self.engine.request_by_step(steps, {}))
+
+        self.assertEqual(result['code'], 0)
+        self.assertEqual(len(clients), 1)
+        self.assertTrue(clients[0].is_closed)
+        # 关闭用例链客户端不关闭按主机共享的连接池，同一主机只创建一个连接池
+        self.assertEqual(len(self.transports), 1)
+        self.transports[0].aclose.assert_not_called()
+
+    def test_engine_does_not_create_requests_session(self):
+        self.assertFalse(hasattr(self.engine, 'session'))
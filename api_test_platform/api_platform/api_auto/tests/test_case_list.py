@@ -0,0 +1,71 @@
+"""用例列表模块汇总与键集分页（user-021）"""
+from django.test import override_settings
+from django.urls import reverse
+
+from api_auto.views import _case_filters, _module_case_page
+from .base import TEST_CACHES, PlatformTestCase
+
+
+@override_settings(CACHES=TEST_CACHES)
+class CaseListPaginationTest(PlatformTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for index in range(7):
+            self.create_step(f"s{index}", f"case_{index % 3}", step_name=f"step_{index:02d}",
+                             is_pass='失败' if index % 2 else '通过')
+        self.create_step('other', 'case_00', part_name='模块B')
+
+    def _all_pages(self, condition, page_size):
+        rows, cursor = [], None
+        while True:
+            page = _module_case_page('模块A', condition, cursor, page_size)
+            rows.extend(page['cases'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                return rows
+
+    def test_cursor_walks_module_in_order(self):
+        rows = self._all_pages(_case_filters({}), page_size=2)
+
+        keys = [(row['case_id'], row['case_step_name'], row['case_step_info_id']) for row in rows]
+        self.assertEqual(len(keys), 7)
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(set(keys)), 7)
+
+    def test_cursor_with_filter(self):
+        rows = self._all_pages(_case_filters({'is_pass': '失败'}), page_size=2)
+        self.assertEqual({row['case_step_info_id'] for row in rows}, {'s1', 's3', 's5'})
+
+    def test_keyword_filter(self):
+        rows = self._all_pages(_case_filters({'q': 'case_1'}), page_size=10)
+        self.assertEqual({row['case_step_info_id'] for row in rows}, {'s1', 's4'})
+        rows = self._all_pages(_case_filters({'q': '登录'}), page_size=10)
+        self.assertEqual(len(rows), 7)
+
+    def test_module_summary(self):
+        response = self.client.get(reverse('api_auto:case_list'), {'is_pass': '失败'})
+        self.assertEqual(list(response.context['modules']), [{'part_name': '模块A', 'total': 3, 'failed': 3}])
+
+        response = self.client.get(reverse('api_auto:case_list'))
+        self.assertEqual([(module['part_name'], module['total'], module['failed'])
+                          for module in response.context['modules']], [('模块A', 7, 3), ('模块B', 1, 0)])
+
+    def test_module_endpoint(self):
+        response = self.client.get(reverse('api_auto:case_list_module'), {'part_name': '模块A', 'page_size': 5})
+        data = response.json()
+        self.assertEqual(len(data['cases']), 5)
+        self.assertIsNotNone(data['next_cursor'])
+
+        response = self.client.get(reverse('api_auto:case_list_module'),
+                                   {'part_name': '模块A', 'page_size': 5, 'cursor': data['next_cursor']})
+        self.assertEqual(len(response.json()['cases']), 2)
+        self.assertIsNone(response.json()['next_cursor'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('api_auto:case_list_module'), {'part_name': '模块A', 'cursor': '!!'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_missing_part_name(self):
+        response = self.client.get(reverse('api_auto:case_list_module'))
+        self.assertEqual(response.status_code, 400)
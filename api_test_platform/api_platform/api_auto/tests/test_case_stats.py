@@ -0,0 +1,115 @@
+"""用例执行统计表与仪表盘（user-022）"""
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api_auto.models import CaseStat, CaseStepInfo
+from api_auto.result_sink import ResultSink
+from api_auto.stats import apply_result_changes, apply_step_changes, rebuild_case_stats
+from .base import TEST_CACHES, PlatformTestCase
+
+
+@override_settings(CACHES=TEST_CACHES)
+class CaseStatsTest(PlatformTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_step('s1', 'case_01')
+        self.create_step('s2', 'case_02', is_pass='失败')
+        self.create_step('s3', 'case_03', part_name='模块B')
+        rebuild_case_stats()
+
+    def _stat(self, scope, key):
+        stat = CaseStat.objects.filter(scope=scope, key=key).first()
+        return stat and (stat.total, stat.passed, stat.failed)
+
+    def test_rebuild(self):
+        self.assertEqual(self._stat('total', ''), (3, 0, 1))
+        self.assertEqual(self._stat('module', '模块A'), (2, 0, 1))
+        self.assertEqual(self._stat('module', '模块B'), (1, 0, 0))
+        self.assertEqual(self._stat('api', '登录接口'), (3, 0, 1))
+
+    def test_result_sink_updates_stats(self):
+        steps = list(CaseStepInfo.objects.select_related('api').order_by('case_step_info_id'))
+        with ResultSink(batch_size=2, flush_interval_ms=60000) as sink:
+            for step, passed in zip(steps, (True, True, False)):
+                sink.add(step, passed)
+
+        self.assertEqual(self._stat('total', ''), (3, 2, 1))
+        self.assertEqual(self._stat('module', '模块A'), (2, 2, 0))
+        self.assertEqual(self._stat('module', '模块B'), (1, 0, 1))
+
+    def test_unchanged_result_keeps_stats(self):
+        apply_result_changes([('失败', '失败', '模块A', '登录接口')])
+        self.assertEqual(self._stat('total', ''), (3, 0, 1))
+
+    def test_rebuild_keeps_delta_committed_in_same_transaction(self):
+        with transaction.atomic():
+            CaseStepInfo.objects.filter(pk='s1').update(is_pass='通过')
+            apply_result_changes([('未执行', '通过', '模块A', '登录接口')])
+        rebuild_case_stats()
+        self.assertEqual(self._stat('total', ''), (3, 1, 1))
+
+    def test_step_changes_skipped_before_rebuild(self):
+        CaseStat.objects.all().delete()
+        apply_step_changes(added=[('失败', '模块C', '登录接口')])
+        self.assertFalse(CaseStat.objects.exists())
+
+    def test_delete_step_applies_delta(self):
+        response = self.client.post(reverse('api_auto:case_list'), {'delete_case': '1', 'case_step_id': 's2'})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self._stat('total', ''), (2, 0, 0))
+        self.assertEqual(self._stat('module', '模块A'), (1, 0, 0))
+        self.assertEqual(self._stat('api', '登录接口'), (2, 0, 0))
+
+    def test_delete_last_step_of_module_removes_row(self):
+        self.client.post(reverse('api_auto:case_list'), {'delete_case': '1', 'case_step_id': 's3'})
+
+        self.assertIsNone(self._stat('module', '模块B'))
+        self.assertEqual(self._stat('total', ''), (2, 0, 1))
+
+    def test_edit_step_moves_stats_between_modules(self):
+        response = self.client.post(reverse('api_auto:api_management_edit', args=['s2']), {
+            'case_id': 'case_02', 'case_name': '登录', 'is_run': '是', 'part_name': '模块C',
+            'case_step_name': 'step_01', 'api_name': '登录接口', 'api_request_type': 'POST',
+            'api_request_url': '/api/login', 'get_value_type': '无', 'variable_name': 'token',
+            'excepted_result_type': '无', 'excepted_result': 'token',
+        })
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self._stat('total', ''), (3, 0, 1))
+        self.assertEqual(self._stat('module', '模块A'), (1, 0, 0))
+        self.assertEqual(self._stat('module', '模块C'), (1, 0, 1))
+
+    def test_dashboard_pager_uses_failed_count_from_stats(self):
+        for index in range(25):
+            self.create_step(f"f{index:02d}", f"f_{index}", is_pass='失败')
+        rebuild_case_stats()
+
+        with override_settings(DASHBOARD_FAILED_PAGE_SIZE=20), \
+                CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('api_auto:dashboard'), {'page': 2})
+
+        self.assertEqual((response.context['page'], response.context['num_pages']), (2, 2))
+        self.assertEqual(len(response.context['failed_cases']), 6)
+        self.assertFalse([query for query in queries if 'COUNT(' in query['sql'] and 'case_step_info' in query['sql']])
+
+    def test_dashboard_pager_corrects_stale_stats(self):
+        for index in range(25):
+            self.create_step(f"f{index:02d}", f"f_{index}", is_pass='失败')
+        # 统计表滞后：少记失败数时按本页是否还有下一条补足页数
+        CaseStat.objects.filter(scope='total').update(failed=0)
+        with override_settings(DASHBOARD_FAILED_PAGE_SIZE=20):
+            response = self.client.get(reverse('api_auto:dashboard'))
+        self.assertEqual(response.context['num_pages'], 2)
+
+        # 多记失败数时页码超出实际范围回到实际的最后一页
+        cache.clear()
+        CaseStat.objects.filter(scope='total').update(failed=65)
+        with override_settings(DASHBOARD_FAILED_PAGE_SIZE=20):
+            response = self.client.get(reverse('api_auto:dashboard'), {'page': 4})
+        self.assertEqual((response.context['page'], response.context['num_pages']), (2, 2))
+        self.assertEqual(len(response.context['failed_cases']), 6)
@@ -0,0 +1,161 @@
+"""断言（user-012 JSONPath/schema/状态码/响应头，user-013 多重断言，user-014 性能断言）"""
+import json
+from unittest import mock
+
+import httpx
+from django.test import SimpleTestCase
+
+from common.check_utils import CheckUtils, MultiCheck
+from common.step_compiler import compile_step
+
+BODY = {'code': 0, 'data': {'total': 3, 'list': [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}], 'token': None}}
+
+
+def response(body=BODY, status_code=200, headers=None):
+    content = body if isinstance(body, str) else json.dumps(body)
+    return httpx.Response(status_code, text=content, headers=headers or {'Content-Type': 'application/json'})
+
+
+class CheckUtilsTest(SimpleTestCase):
+
+    def check(self, check_type, check_data, resp=None, **kwargs):
+        return CheckUtils(resp or response(), **kwargs).run_check(check_type, check_data)
+
+    def test_response_parsed_once(self):
+        check_utils = CheckUtils(response())
+        with mock.patch('common.check_utils.json.loads', wraps=json.loads) as loads:
+            check_utils.run_check('json键是否存在', 'code')
+            check_utils.run_check('json路径比较', {'$.code': 0})
+        loads.assert_called_once()
+
+    def test_path_comparisons(self):
+        result = self.check('json路径比较', {
+            '$.code': 0,
+            '$.data.total': {'>=': 1, '<': 10},
+            '$.data.list': {'len': {'between': [1, 5]}},
+            '$.data.list[1].name': {'in': ['b', 'c'], 'type': 'str'},
+            '$.data.list[*].id': {'type': 'int'},
+            '$.data.missing': {'exists': False},
+        })
+        self.assertTrue(result['check_result'], result['message'])
+
+    def test_path_failures_reported_together(self):
+        result = self.check('json路径比较', '{"$.data.total": {">": 5}, "$.data.nothing": 1, "code": {"type": "bool"}}')
+        self.assertFalse(result['check_result'])
+        self.assertEqual(result['code'], 4)
+        for expected in ("$.data.total: 期望> 5", "$.data.nothing: 未匹配到字段", "code: 期望type 'bool'"):
+            self.assertIn(expected, result['message'])
+
+    def test_nested_key_assertions(self):
+        self.assertTrue(self.check('json键是否存在', 'code, $.data.token')['check_result'])
+        self.assertTrue(self.check('json键值对', "{'$.data.list[0].id': 1}")['check_result'])
+        self.assertFalse(self.check('json键值对', "{'$.data.list[0].id': 2}")['check_result'])
+
+    def test_schema(self):
+        schema = {'type': 'object', 'required': ['code', 'data'],
+                  'properties': {'data': {'type': 'object', 'properties': {'total': {'type': 'string'}}}}}
+        result = self.check('json schema校验', json.dumps(schema))
+        self.assertFalse(result['check_result'])
+        self.assertIn('data/total', result['message'])
+
+        schema['properties']['data']['properties']['total'] = {'type': 'integer'}
+        self.assertTrue(self.check('json schema校验', schema)['check_result'])
+
+    def test_precompiled_step_data(self):
+        plan = compile_step({'case_step_info_id': 's1', '期望结果类型': 'json schema校验',
+                             '期望结果': '{"type": "object", "required": ["code"]}'})
+        self.assertTrue(hasattr(plan.check_data, 'iter_errors'))
+        self.assertTrue(self.check(plan.check_type, plan.check_data)['check_result'])
+
+    def test_non_json_response(self):
+        result = self.check('json路径比较', '{"$.code": 0}', response('<html></html>'))
+        self.assertFalse(result['check_result'])
+        self.assertIn('JSONPath比较失败', result['message'])
+
+    def test_status_assertion_overrides_non_200(self):
+        resp = response({'id': 9}, status_code=201)
+        self.assertEqual(self.check('json键是否存在', 'id', resp)['code'], 2)
+        result = self.check('状态码', '{"in": [200, 201]}', resp)
+        self.assertEqual((result['code'], result['check_result']), (0, True))
+        self.assertFalse(self.check('状态码', 200, resp)['check_result'])
+
+    def test_header_assertion(self):
+        resp = response(headers={'Content-Type': 'application/json; charset=utf-8', 'X-Trace-Id': 't1'})
+        self.assertTrue(self.check('响应头', {'content-type': {'contains': 'json'}, 'X-Trace-Id': {'exists': True},
+                                           'X-Debug': {'exists': False}}, resp)['check_result'])
+        result = self.check('响应头', '{"X-Missing": "1"}', resp)
+        self.assertIn('X-Missing: 响应头不存在', result['message'])
+
+
+class MultiCheckTest(SimpleTestCase):
+    ASSERTIONS = [
+        {'type': '状态码', 'data': 201},
+        {'type': 'json键是否存在', 'data': 'missing'},
+        {'type': 'json路径比较', 'data': {'$.data.total': 3}},
+    ]
+
+    def check(self, check_data, resp=None):
+        return CheckUtils(resp or response(status_code=201)).run_check('多重断言', check_data)
+
+    def test_all_failures_collected(self):
+        result = self.check(json.dumps(self.ASSERTIONS, ensure_ascii=False))
+
+        self.assertFalse(result['check_result'])
+        self.assertEqual([item['check_result'] for item in result['assertions']], [True, False, True])
+        self.assertIn('多重断言失败(1/3)', result['message'])
+        self.assertIn('[json键是否存在]', result['message'])
+
+    def test_short_circuit(self):
+        result = self.check({'short_circuit': True, 'assertions': self.ASSERTIONS})
+        self.assertEqual(len(result['assertions']), 2)
+        self.assertIn('短路跳过1个', result['message'])
+
+    def test_status_assertion_decides_code(self):
+        result = self.check([self.ASSERTIONS[0], self.ASSERTIONS[2]])
+        self.assertEqual((result['code'], result['check_result']), (0, True))
+
+    def test_invalid_spec(self):
+        for check_data in ('[]', '[{"data": 1}]', '[{"type": "多重断言", "data": []}]', 'not json'):
+            with self.subTest(check_data=check_data):
+                result = self.check(check_data)
+                self.assertFalse(result['check_result'])
+                self.assertIn('多重断言数据错误', result['message'])
+
+    def test_step_plan_precompiles_each_assertion(self):
+        plan = compile_step({'case_step_info_id': 's1', '期望结果类型': '多重断言',
+                             '期望结果': json.dumps(self.ASSERTIONS, ensure_ascii=False)})
+        self.assertIsInstance(plan.check_data, MultiCheck)
+        self.assertEqual(plan.check_data.assertions[1], ('json键是否存在', ('missing',)))
+        self.assertEqual(len(self.check(plan.check_data)['assertions']), 3)
+
+
+class SlaCheckTest(SimpleTestCase):
+    METRICS = {'response_time': 120.5, 'ttfb': 80.0, 'response_size': 2048}
+
+    def check(self, check_type, check_data, metrics=METRICS):
+        return CheckUtils(response(), metrics).run_check(check_type, check_data)
+
+    def test_within_limit(self):
+        self.assertTrue(self.check('最大响应时间', '200')['check_result'])
+        self.assertTrue(self.check('最大首字节时间', 80)['check_result'])
+        self.assertTrue(self.check('最大响应大小', '2048')['check_result'])
+
+    def test_over_limit(self):
+        result = self.check('最大响应时间', '100')
+        self.assertEqual((result['code'], result['check_result']), (4, False))
+        self.assertIn('实际120.5ms, 超过阈值100ms', result['message'])
+
+    def test_missing_metric_fails(self):
+        result = self.check('最大首字节时间', 500, metrics={'response_time': 10})
+        self.assertFalse(result['check_result'])
+        self.assertIn('未采集到ttfb指标', result['message'])
+
+    def test_invalid_limit(self):
+        for check_data in ('abc', '-1', True):
+            with self.subTest(check_data=check_data):
+                self.assertFalse(self.check('最大响应时间', check_data)['check_result'])
+
+    def test_combined_with_functional_assertions(self):
+        result = self.check('多重断言', [{'type': 'json键是否存在', 'data': 'code'},
+                                      {'type': '最大响应时间', 'data': 100}])
+        self.assertEqual([item['check_result'] for item in result['assertions']], [True, False])
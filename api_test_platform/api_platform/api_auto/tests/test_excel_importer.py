@@ -0,0 +1,107 @@
+"""Excel用例批量导入（user-017）"""
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from common.excel_to_mysql_importer import ExcelToMysqlImporter
+
+
+class _FakeSqlUtils():
+    """记录批量语句的SqlUtils替身：existing_steps为已有步骤行，fail_bulk为True时批量写入抛出异常"""
+
+    def __init__(self, existing_steps=(), fail_bulk=False):
+        self.existing_steps = list(existing_steps)
+        self.fail_bulk = fail_bulk
+        self.statements = []
+        self.transactions = 0
+
+    def execute_query(self, sql, params=None):
+        return self.existing_steps if 'case_step_info' in sql else []
+
+    def execute_update(self, sql, params=None):
+        self.statements.append((sql, [params]))
+
+    def execute_many_in_transaction(self, statements):
+        if self.fail_bulk:
+            raise Exception("Duplicate entry")
+        self.transactions += 1
+        self.statements.extend(statements)
+
+    def close(self):
+        pass
+
+
+class ExcelImporterTest(SimpleTestCase):
+
+    def setUp(self):
+        with mock.patch('common.excel_to_mysql_importer.SqlUtils'):
+            self.importer = ExcelToMysqlImporter()
+
+    @staticmethod
+    def _row(case_id, step_name, part_name='模块A', **fields):
+        return {'测试用例编号': case_id, '模块名称': part_name, '测试用例名称': f"{case_id}_{step_name}",
+                '测试用例步骤': step_name, '接口名称': '登录接口', '请求方式': 'POST', '请求地址': '/api/login',
+                **fields}
+
+    def _stored(self, step_id, row, fingerprint=None):
+        return {'CaseStepInfo_id': step_id, 'case_id': row['测试用例编号'], 'part_name': row['模块名称'],
+                'case_step_name': row['测试用例步骤'],
+                'row_fingerprint': fingerprint or self.importer.row_fingerprint(row)}
+
+    @staticmethod
+    def _items(rows):
+        return [{'case_id': f"case_{index}", 'case_info': [row]} for index, row in enumerate(rows)]
+
+    def _upserts(self):
+        return [params for sql, params in self.importer.sql_utils.statements if 'ON DUPLICATE KEY UPDATE' in sql]
+
+    def test_bulk_import_writes_one_statement_per_table(self):
+        self.importer.sql_utils = _FakeSqlUtils()
+        result = self.importer.bulk_import_case_info(self._items([self._row('case_01', 'step_01'),
+                                                                  self._row('case_02', 'step_01')]))
+
+        self.assertEqual((result['total'], result['success'], result['fail']), (2, 2, 0))
+        self.assertEqual(self.importer.sql_utils.transactions, 1)
+        # 同名接口合并为一行，用例和步骤各两行
+        self.assertEqual([len(params) for params in self._upserts()], [1, 2, 2])
+
+    def test_bulk_import_one_transaction_per_chunk(self):
+        self.importer.sql_utils = _FakeSqlUtils()
+        rows = [self._row(f"case_{index:02d}", 'step_01') for index in range(5)]
+
+        result = self.importer.bulk_import_case_info(iter(self._items(rows)), chunk_size=2)
+
+        self.assertEqual((result['total'], result['success']), (5, 5))
+        self.assertEqual(self.importer.sql_utils.transactions, 3)
+
+    def test_bulk_import_reuses_existing_step_id(self):
+        row = self._row('case_01', 'step_01')
+        self.importer.sql_utils = _FakeSqlUtils([self._stored('s1', row)])
+
+        self.importer.bulk_import_case_info(self._items([row, self._row('case_01', 'step_02')]))
+
+        step_ids = [params[0] for params in self._upserts()[2]]
+        self.assertEqual(step_ids[0], 's1')
+        self.assertNotIn(step_ids[1], ('s1', step_ids[0]))
+
+    def test_bulk_import_counts_invalid_rows(self):
+        self.importer.sql_utils = _FakeSqlUtils()
+        items = self._items([self._row('case_01', 'step_01'), self._row('case_02', 'step_01', 接口名称='')])
+
+        result = self.importer.bulk_import_case_info(items + [{'case_id': 'case_03', 'case_info': []}])
+
+        self.assertEqual((result['total'], result['success'], result['fail']), (3, 1, 2))
+        self.assertEqual([len(params) for params in self._upserts()], [1, 1, 1])
+
+    def test_bulk_failure_falls_back_to_row_import(self):
+        self.importer.sql_utils = _FakeSqlUtils(fail_bulk=True)
+        items = self._items([self._row('case_01', 'step_01'), self._row('case_02', 'step_01')])
+        result = {'total': 2, 'success': 0, 'fail': 0, 'fail_details': [], 'removed': 0}
+
+        with mock.patch.object(self.importer, '_import_item') as import_item, \
+                mock.patch.object(self.importer, '_delete_steps') as delete_steps:
+            self.importer._import_chunk(list(enumerate(items, 1)), self.importer._new_keys(), result, ['s9'])
+
+        # 失败的批次逐条重新导入，定位失败的用例
+        self.assertEqual([call.args[:2] for call in import_item.call_args_list], list(enumerate(items, 1)))
+        delete_steps.assert_called_once_with(['s9'], result)
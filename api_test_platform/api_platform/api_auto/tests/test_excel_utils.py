@@ -0,0 +1,52 @@
+"""只读流式读取Excel与合并单元格（user-018）"""
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+from openpyxl import Workbook
+
+from common.excel_utils import ExcelUtils
+
+
+class ExcelUtilsReadOnlyTest(SimpleTestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.file_path = os.path.join(temp_dir.name, 'test_cases.xlsx')
+        wb = Workbook()
+        sheet = wb.active
+        sheet.title = 'Sheet1'
+        sheet.append(['测试用例编号', '模块名称', '测试用例步骤', '期望结果'])
+        sheet.append(['case_01', '模块A', 'step_01', 'token'])
+        sheet.append([None, None, 'step_02', None])
+        sheet.append([None, None, 'step_03', None])
+        sheet.append(['case_02', '模块B', 'step_01', 'id'])
+        # 用例编号和模块名称合并三行，期望结果只合并前两行
+        sheet.merge_cells('A2:A4')
+        sheet.merge_cells('B2:B4')
+        sheet.merge_cells('D2:D3')
+        wb.save(self.file_path)
+
+    def test_read_only_merged_info(self):
+        excel = ExcelUtils(self.file_path, 'Sheet1', read_only=True)
+        self.assertEqual(sorted(excel.merged_cells), [(1, 3, 3, 4), (1, 4, 0, 1), (1, 4, 1, 2)])
+
+    def test_merged_anchor_map_excludes_anchor_cell(self):
+        excel = ExcelUtils(self.file_path, 'Sheet1', read_only=True)
+        anchor_map = excel.merged_anchor_map
+        self.assertFalse(anchor_map.get(1))
+        self.assertEqual(anchor_map[2], {0: (1, 0), 1: (1, 1), 3: (1, 3)})
+        self.assertEqual(anchor_map[3], {0: (1, 0), 1: (1, 1)})
+
+    def test_iter_rows_fills_merged_cells(self):
+        rows = list(ExcelUtils(self.file_path, 'Sheet1', read_only=True).iter_rows_by_dict())
+        self.assertEqual([(row['测试用例编号'], row['模块名称'], row['期望结果']) for row in rows], [
+            ('case_01', '模块A', 'token'), ('case_01', '模块A', 'token'), ('case_01', '模块A', ''),
+            ('case_02', '模块B', 'id'),
+        ])
+
+    def test_read_only_matches_full_load(self):
+        full = ExcelUtils(self.file_path, 'Sheet1').get_sheet_data_by_dict()
+        streamed = ExcelUtils(self.file_path, 'Sheet1', read_only=True).get_sheet_data_by_dict()
+        self.assertEqual(streamed, full)
@@ -0,0 +1,65 @@
+"""流式写入HTML报告（user-011）"""
+import io
+import unittest
+
+from django.test import SimpleTestCase
+
+from common.HTMLTestReportCN import StreamingHTMLTestRunner
+
+
+def _report_case_class(stream):
+    """写入报告的用例类（不放在模块级，避免被测试发现）；用例执行时可读取已写入报告的内容"""
+
+    class ReportCase(unittest.TestCase):
+        written = []
+
+        def test_01_pass(self):
+            print("用例输出")
+
+        def test_02_fail(self):
+            # 前一条用例完成后已写入报告
+            ReportCase.written.append(stream.getvalue().decode('utf8'))
+            self.fail("断言失败")
+
+        def test_03_error(self):
+            raise RuntimeError("执行异常")
+
+        def test_04_interrupt(self):
+            raise KeyboardInterrupt
+
+    return ReportCase
+
+
+class StreamingHTMLTestRunnerTest(SimpleTestCase):
+
+    def setUp(self):
+        self.stream = io.BytesIO()
+        self.ReportCase = _report_case_class(self.stream)
+        self.runner = StreamingHTMLTestRunner(stream=self.stream, verbosity=1, title='接口测试报告', tester='tester')
+
+    def _suite(self, *names):
+        return unittest.TestSuite(self.ReportCase(name) for name in names)
+
+    def test_rows_written_as_tests_complete(self):
+        result = self.runner.run(self._suite('test_01_pass', 'test_02_fail', 'test_03_error'))
+        report = self.stream.getvalue().decode('utf8')
+
+        self.assertIn("id='pt1_1'", self.ReportCase.written[0])
+        self.assertNotIn("id='ft1_2'", self.ReportCase.written[0])
+        for row_id in ("id='pt1_1'", "id='ft1_2'", "id='et1_3'", "id='c1'"):
+            self.assertIn(row_id, report)
+        self.assertIn("用例输出", report)
+        self.assertIn("执行异常", report)
+        self.assertTrue(report.rstrip().endswith('</html>'))
+        self.assertEqual((result.success_count, result.failure_count, result.error_count), (1, 1, 1))
+        # 用例行直接写入报告文件，不在结果对象中保留
+        self.assertEqual(result.result, [])
+
+    def test_interrupted_run_keeps_finished_rows(self):
+        with self.assertRaises(KeyboardInterrupt):
+            self.runner.run(self._suite('test_01_pass', 'test_04_interrupt'))
+        report = self.stream.getvalue().decode('utf8')
+
+        self.assertIn("id='pt1_1'", report)
+        self.assertIn(StreamingHTMLTestRunner.STREAM_STATUS, report)
+        self.assertTrue(report.rstrip().endswith('</html>'))
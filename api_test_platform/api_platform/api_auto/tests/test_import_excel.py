@@ -0,0 +1,117 @@
+"""Excel导入预览与增量导入（user-020）"""
+import os
+import time
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from api_auto.views import _pending_import_dir, _purge_pending_imports
+from common.excel_to_mysql_importer import ExcelToMysqlImporter
+from .test_excel_importer import _FakeSqlUtils
+
+
+class IncrementalImportTest(SimpleTestCase):
+
+    def setUp(self):
+        with mock.patch('common.excel_to_mysql_importer.SqlUtils'):
+            self.importer = ExcelToMysqlImporter()
+
+    @staticmethod
+    def _row(case_id, step_name, part_name='模块A', **fields):
+        return {'测试用例编号': case_id, '模块名称': part_name, '测试用例名称': f"{case_id}_{step_name}",
+                '测试用例步骤': step_name, '接口名称': '登录接口', '请求方式': 'POST', '请求地址': '/api/login',
+                **fields}
+
+    def _stored(self, step_id, row, fingerprint=None):
+        return {'CaseStepInfo_id': step_id, 'case_id': row['测试用例编号'], 'part_name': row['模块名称'],
+                'case_step_name': row['测试用例步骤'],
+                'row_fingerprint': fingerprint or self.importer.row_fingerprint(row)}
+
+    @staticmethod
+    def _items(rows):
+        return [{'case_id': f"case_{index}", 'case_info': [row]} for index, row in enumerate(rows)]
+
+    def test_fingerprint_ignores_result_column(self):
+        row = self._row('case_01', 'step_01')
+        self.assertEqual(self.importer.row_fingerprint(row), self.importer.row_fingerprint({**row, '是否通过': '失败'}))
+        self.assertNotEqual(self.importer.row_fingerprint(row),
+                            self.importer.row_fingerprint({**row, '期望结果': 'token'}))
+
+    def test_diff_multi_step_case(self):
+        step_1, step_2 = self._row('case_01', 'step_01'), self._row('case_01', 'step_02')
+        step_3 = self._row('case_01', 'step_03')
+        self.importer.sql_utils = _FakeSqlUtils([
+            self._stored('s1', step_1), self._stored('s2', step_2, fingerprint='old'), self._stored('s3', step_3),
+            self._stored('x1', self._row('case_09', 'step_01', part_name='模块B')),
+        ])
+        step_4 = self._row('case_01', 'step_04')
+
+        diff = self.importer.diff_case_info(self._items([step_1, step_2, step_4]))
+
+        self.assertEqual(diff['unchanged'], 1)
+        self.assertEqual([item['case_info'][0] for _, item in diff['changed']], [step_2])
+        self.assertEqual([item['case_info'][0] for _, item in diff['added']], [step_4])
+        # 只删除工作簿涉及模块中已移除的步骤
+        self.assertEqual([step['CaseStepInfo_id'] for step in diff['removed']], ['s3'])
+        self.assertEqual(diff['part_names'], {'模块A'})
+
+    def test_diff_without_fingerprint_is_changed(self):
+        row = self._row('case_01', 'step_01')
+        stored = {**self._stored('s1', row), 'row_fingerprint': None}
+        self.importer.sql_utils = _FakeSqlUtils([stored])
+
+        diff = self.importer.diff_case_info(self._items([row]))
+
+        self.assertEqual((len(diff['changed']), diff['unchanged']), (1, 0))
+
+    def test_apply_diff_writes_changes_and_deletes_in_one_transaction(self):
+        step_1, step_2 = self._row('case_01', 'step_01'), self._row('case_01', 'step_02')
+        self.importer.sql_utils = _FakeSqlUtils([self._stored('s1', step_1, fingerprint='old'),
+                                                 self._stored('s2', step_2)])
+
+        result = self.importer.apply_case_info_diff(self.importer.diff_case_info(self._items([step_1])))
+
+        self.assertEqual((result['total'], result['success'], result['removed']), (1, 1, 1))
+        self.assertEqual(self.importer.sql_utils.transactions, 1)
+        deletes = [params for sql, params in self.importer.sql_utils.statements if sql.startswith('DELETE')]
+        self.assertIn([('s2',)], deletes)
+
+    def test_removed_steps_accumulate(self):
+        self.importer.sql_utils = _FakeSqlUtils()
+        result = {'removed': 1}
+        self.importer._delete_steps(['s1', 's2'], result)
+        self.assertEqual(result['removed'], 3)
+
+
+class PendingImportPurgeTest(SimpleTestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        settings_override = override_settings(FRAMEWORK_DIR=Path(temp_dir.name))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _pending_file(self, name, age):
+        pending_dir = _pending_import_dir()
+        os.makedirs(pending_dir, exist_ok=True)
+        path = os.path.join(pending_dir, name)
+        with open(path, 'wb'):
+            pass
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_purge_removes_only_expired_files(self):
+        expired = self._pending_file('20260101000000_old.xlsx', age=2 * 24 * 60 * 60)
+        recent = self._pending_file('20260101000000_new.xlsx', age=60)
+
+        self.assertEqual(_purge_pending_imports(), 1)
+
+        self.assertFalse(os.path.exists(expired))
+        self.assertTrue(os.path.exists(recent))
+
+    def test_purge_without_pending_dir(self):
+        self.assertEqual(_purge_pending_imports(), 0)
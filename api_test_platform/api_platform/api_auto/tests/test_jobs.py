@@ -0,0 +1,57 @@
+"""后台执行任务（user-006）"""
+from datetime import timedelta
+from unittest import mock
+
+from django.test import override_settings
+from django.utils import timezone
+
+from api_auto.jobs import submit_job, claim_next_job, recover_stale_jobs, run_worker
+from api_auto.models import TestJob
+
+from .base import PlatformTestCase, TEST_CACHES
+
+
+@override_settings(CACHES=TEST_CACHES, JOB_HEARTBEAT_INTERVAL=3600, JOB_STALE_TIMEOUT=300)
+class JobWorkerTest(PlatformTestCase):
+
+    def _job(self, job_id, status='queued', **fields):
+        return TestJob.objects.create(job_id=job_id, job_type='run_all_cases', status=status, **fields)
+
+    def test_submit_only_queues(self):
+        with mock.patch('api_auto.jobs.execute_job') as execute_job:
+            job = submit_job('run_all_cases', ['s1', 's2'])
+        execute_job.assert_not_called()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.case_step_ids), ('queued', 's1,s2'))
+
+    def test_claim_oldest_queued_job_once(self):
+        first, second = self._job('job_01'), self._job('job_02')
+        TestJob.objects.filter(pk=second.pk).update(created_at=first.created_at + timedelta(seconds=1))
+
+        self.assertEqual(claim_next_job(), 'job_01')
+        self.assertEqual(claim_next_job(), 'job_02')
+        self.assertIsNone(claim_next_job())
+        first.refresh_from_db()
+        self.assertEqual(first.status, 'running')
+        self.assertIsNotNone(first.heartbeat_at)
+
+    def test_recover_stale_running_jobs(self):
+        stale = timezone.now() - timedelta(seconds=600)
+        self._job('stale', 'running', started_at=stale, heartbeat_at=stale)
+        self._job('no_heartbeat', 'running', started_at=stale)
+        self._job('alive', 'running', started_at=stale, heartbeat_at=timezone.now())
+        self._job('queued')
+
+        self.assertEqual(recover_stale_jobs(), 2)
+        self.assertEqual(dict(TestJob.objects.values_list('job_id', 'status')),
+                         {'stale': 'failed', 'no_heartbeat': 'failed', 'alive': 'running', 'queued': 'queued'})
+
+    def test_worker_runs_queued_jobs(self):
+        self._job('job_01')
+        self._job('job_02')
+        with mock.patch('api_auto.jobs._run_all_cases', side_effect=[None, RuntimeError("执行中断")]):
+            run_worker(once=True)
+
+        self.assertEqual(dict(TestJob.objects.values_list('job_id', 'status')),
+                         {'job_01': 'completed', 'job_02': 'failed'})
+        self.assertFalse(TestJob.objects.filter(finished_at__isnull=True).exists())
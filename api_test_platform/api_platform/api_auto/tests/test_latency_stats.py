@@ -0,0 +1,88 @@
+"""请求阶段计时与耗时统计（user-009）"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import SimpleTestCase
+
+from common.async_requests_utils import AsyncRequestsUtils
+from common.latency_stats import LatencyStats, RequestTrace, latency_histogram, percentile
+
+
+class LatencyHelpersTest(SimpleTestCase):
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 90), 90)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_histogram_buckets(self):
+        histogram = dict(latency_histogram([5, 10, 11, 30, 20000], buckets=(10, 50)))
+        self.assertEqual(histogram, {'<=10ms': 2, '<=50ms': 2, '>50ms': 1})
+
+    def test_summary_per_api(self):
+        stats = LatencyStats()
+        for index in range(10):
+            stats.add({'api_name': '登录接口', 'status': 'passed' if index else 'failed',
+                       'response_time': index + 1, 'ttfb': 1, 'request_size': 2, 'response_size': 3})
+        stats.add({'api_name': '查询接口', 'status': 'error', 'response_time': None})
+
+        rows = stats.summary(duration=2)
+        self.assertEqual([row['api_name'] for row in rows], ['登录接口', '查询接口'])
+        login = rows[0]
+        self.assertEqual((login['count'], login['errors'], login['p50'], login['p90'], login['max']), (10, 1, 5, 9, 10))
+        self.assertEqual((login['throughput'], login['request_bytes'], login['response_bytes']), (5, 20, 30))
+        self.assertIsNone(rows[1]['p90'])
+
+    def test_trace_excludes_dns_from_connect(self):
+        trace = RequestTrace()
+        trace.start()
+        trace._marks.update({'connection.connect_tcp.started': trace._start,
+                             'connection.connect_tcp.complete': trace._start + 0.05})
+        trace.record_dns(20.0)
+        timings = trace.timings()
+        self.assertEqual((timings['dns_time'], timings['connect_time']), (20.0, 30.0))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+class DnsTimingTest(SimpleTestCase):
+    """通过本机HTTP服务验证异步请求引擎记录域名解析耗时"""
+
+    def setUp(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.url = f"http://localhost:{server.server_address[1]}/"
+        self.engine = AsyncRequestsUtils()
+
+    async def _send_twice(self):
+        try:
+            async with self.engine.client() as client:
+                return [(await self.engine._send(client, 'GET', self.url))[1] for _ in range(2)]
+        finally:
+            await self.engine.close()
+
+    def test_dns_time_recorded_for_new_connection(self):
+        first, second = self.engine.run_sync(self._send_twice())
+
+        self.assertIsNotNone(first['dns_time'])
+        self.assertIsNotNone(first['connect_time'])
+        self.assertIsNotNone(first['ttfb'])
+        # 第二次请求复用连接，不再解析域名和建立连接
+        self.assertIsNone(second['dns_time'])
+        self.assertIsNone(second['connect_time'])
@@ -0,0 +1,75 @@
+"""压测模式调度（user-010）"""
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from test_runner.load_runner import LoadRunner
+
+CASES = [{'case_id': 'case_01', 'case_info': [{'测试用例步骤': 'step_01'}]}]
+
+
+class _FakeRequestsUtils():
+    """每次用例链执行产生一条通过的步骤记录，delay为单次执行耗时（秒）"""
+    delay = 0
+
+    def __init__(self):
+        self.step_records = []
+
+    def request_by_step(self, step_infos):
+        time.sleep(self.delay)
+        self.step_records = [{'api_name': '登录接口', 'status': 'passed', 'response_time': 10.0}]
+        return {'check_result': True}
+
+
+class LoadRunnerTest(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch('test_runner.load_runner.RequestsUtils', _FakeRequestsUtils)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(setattr, _FakeRequestsUtils, 'delay', 0)
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            LoadRunner([], duration=10)
+        with self.assertRaises(ValueError):
+            LoadRunner(CASES, duration=10, warmup=10)
+
+    def test_launch_schedule_with_ramp_up(self):
+        runner = LoadRunner(CASES, duration=30, rps=10, warmup=0, ramp_up=10)
+        times = [runner._launch_time(index) for index in range(200)]
+
+        self.assertEqual(times, sorted(times))
+        self.assertAlmostEqual(runner._launch_time(50), 10)
+        # 加压阶段速率线性增加：前10秒启动 rps*ramp_up/2 次，之后按目标速率启动
+        self.assertEqual(sum(1 for launch_time in times if launch_time < 10), 50)
+        self.assertEqual(sum(1 for launch_time in times if 10 <= launch_time < 11), 10)
+
+    def test_launch_schedule_without_ramp_up(self):
+        runner = LoadRunner(CASES, duration=30, rps=4, warmup=0, ramp_up=0)
+        self.assertEqual([runner._launch_time(index) for index in range(3)], [0, 0.25, 0.5])
+
+    def test_rate_mode_launches_on_schedule(self):
+        report = LoadRunner(CASES, duration=0.4, rps=50, concurrency=5, warmup=0, ramp_up=0).run()
+
+        self.assertEqual((report['iterations'], report['dropped']), (20, 0))
+        self.assertEqual((report['requests'], report['errors'], report['p90']), (20, 0, 10.0))
+
+    def test_rate_mode_drops_when_saturated(self):
+        _FakeRequestsUtils.delay = 0.2
+        report = LoadRunner(CASES, duration=0.3, rps=50, concurrency=1, warmup=0, ramp_up=0).run()
+
+        self.assertEqual(report['iterations'] + report['dropped'], 15)
+        self.assertGreater(report['dropped'], 0)
+
+    def test_warmup_excluded_from_stats(self):
+        report = LoadRunner(CASES, duration=0.4, rps=50, concurrency=5, warmup=0.2, ramp_up=0).run()
+        self.assertLess(report['iterations'], 20)
+        self.assertEqual(report['requests'], report['iterations'])
+
+    def test_concurrency_mode_runs_virtual_users(self):
+        _FakeRequestsUtils.delay = 0.01
+        report = LoadRunner(CASES, duration=0.2, concurrency=3, warmup=0, ramp_up=0).run()
+        self.assertGreater(report['iterations'], 3)
+        self.assertEqual(report['mode'], 'concurrency')
@@ -0,0 +1,88 @@
+"""并发执行（user-001）"""
+import unittest
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from common.HTMLTestReportCN import _TestResult
+from test_runner.parallel_runner import ParallelSuite
+
+
+def _case_group_class():
+    """模拟用例组的TestCase（不放在模块级，避免被测试发现当作测试用例执行）"""
+
+    class CaseGroup(unittest.TestCase):
+        """模拟一个用例组：输出一行文本后按结果通过/失败/出错"""
+
+        def __init__(self, case_id, outcome):
+            super().__init__('runTest')
+            self.case_id = case_id
+            self.outcome = outcome
+
+        def runTest(self):
+            print(f"执行用例组 {self.case_id}")
+            if self.outcome == 'fail':
+                self.fail(f"{self.case_id} 断言失败")
+            if self.outcome == 'error':
+                raise RuntimeError(f"{self.case_id} 执行异常")
+
+    return CaseGroup
+
+
+class ParallelSuiteTest(SimpleTestCase):
+    CaseGroup = _case_group_class()
+
+    def _groups(self):
+        return [self.CaseGroup(f"case_{index:02d}", outcome)
+                for index, outcome in enumerate(['pass', 'fail', 'error', 'pass', 'fail'])]
+
+    def test_parallel_report_matches_serial(self):
+        serial = _TestResult()
+        unittest.TestSuite(self._groups())(serial)
+        parallel = _TestResult()
+        ParallelSuite(self._groups(), workers=3)(parallel)
+
+        self.assertEqual((parallel.success_count, parallel.failure_count, parallel.error_count),
+                         (serial.success_count, serial.failure_count, serial.error_count))
+        self.assertEqual([(code, test.case_id) for code, test, *_ in parallel.result],
+                         [(code, test.case_id) for code, test, *_ in serial.result])
+        for code, test, output, trace, _ in parallel.result:
+            self.assertIn(f"执行用例组 {test.case_id}", output)
+            self.assertNotIn("执行用例组", output.replace(f"执行用例组 {test.case_id}", ''))
+            self.assertEqual(bool(trace), code != 0)
+
+    def test_group_merges_all_failures(self):
+        # 包含多个失败步骤的用例组
+        group = unittest.TestSuite([self.CaseGroup('case_01_1', 'fail'), self.CaseGroup('case_01_2', 'error')])
+        group.case_id = 'case_01'
+        result = _TestResult()
+        ParallelSuite([group], workers=1)(result)
+
+        code, _, output, trace, _ = result.result[0]
+        self.assertEqual(code, 2)
+        self.assertIn("case_01_1 断言失败", trace)
+        self.assertIn("case_01_2 执行异常", trace)
+        self.assertIn("执行用例组 case_01_1", output)
+        self.assertIn("执行用例组 case_01_2", output)
+
+    def test_submission_window_bounded(self):
+        groups = [self.CaseGroup(f"case_{index:02d}", 'pass') for index in range(12)]
+        suite = ParallelSuite(groups, workers=2)
+        result = _TestResult()
+        submit = suite._submit
+        in_flight = []
+
+        def tracked_submit(executor, test, variables_snapshot):
+            # 已提交数（含本次）减去已合并数
+            in_flight.append(len(in_flight) + 1 - len(result.result))
+            return submit(executor, test, variables_snapshot)
+
+        with mock.patch.object(suite, '_submit', side_effect=tracked_submit):
+            suite(result)
+
+        self.assertEqual(max(in_flight), suite.window)
+        self.assertEqual([test.case_id for _, test, *_ in result.result], [test.case_id for test in groups])
+
+    def test_unknown_pool_type(self):
+        with self.assertRaises(ValueError):
+            ParallelSuite([], pool_type='gevent')
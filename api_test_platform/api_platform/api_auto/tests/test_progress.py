@@ -0,0 +1,68 @@
+"""执行进度事件与推送（user-024）"""
+import tempfile
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+
+from api_auto.models import TestJob
+from api_auto.progress import format_sse, progress_stream, publish_progress, read_progress_events, stream_supported
+from .base import TEST_CACHES, PlatformTestCase
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ProgressStreamTest(PlatformTestCase):
+
+    def test_events_read_after_sequence(self):
+        for index in range(3):
+            self.assertEqual(publish_progress('job_01', {'case_id': f"case_{index}"}), index + 1)
+
+        self.assertEqual(read_progress_events('job_01', after=1),
+                         [(2, {'case_id': 'case_1'}), (3, {'case_id': 'case_2'})])
+        self.assertEqual(read_progress_events('job_02'), [])
+
+    def test_format_sse(self):
+        self.assertEqual(format_sse('case', {'case_id': '用例1'}, 5),
+                         'id: 5\nevent: case\ndata: {"case_id": "用例1"}\n\n')
+
+    @override_settings(PROGRESS_STREAM_INTERVAL=0)
+    def test_stream_replays_events_and_closes_when_done(self):
+        TestJob.objects.create(job_id='job_01', job_type='run_all_cases', status='completed', total=2, current=2)
+        publish_progress('job_01', {'case_id': 'case_1'})
+        publish_progress('job_01', {'case_id': 'case_2'})
+
+        async def collect():
+            return [message async for message in progress_stream('job_01', last_event_id=1)]
+
+        messages = async_to_sync(collect)()
+
+        self.assertEqual(messages[0], 'retry: 3000\n\n')
+        # 从Last-Event-ID之后补发
+        event_types = [line for message in messages[1:] for line in message.split('\n') if line.startswith('event:')]
+        self.assertEqual(event_types, ['event: case', 'event: progress', 'event: done'])
+        self.assertTrue(messages[1].startswith('id: 2\n'))
+
+    def test_wsgi_request_not_streamed(self):
+        self.assertFalse(stream_supported(RequestFactory().get('/')))
+
+    def test_stream_endpoint_unavailable_under_wsgi(self):
+        response = self.client.get(reverse('api_auto:run_progress_stream', args=['job_01']))
+        self.assertEqual(response.status_code, 503)
+
+    def test_run_all_response_asks_page_to_poll(self):
+        job = TestJob(job_id='job_01', job_type='run_all_cases')
+        with mock.patch('api_auto.views.submit_job', return_value=job):
+            response = self.client.post(reverse('api_auto:run_all_cases'))
+        self.assertEqual(response.json()['status'], 'queued')
+        self.assertFalse(response.json()['stream'])
+
+    def test_asgi_request_with_locmem_cache_not_streamed(self):
+        from django.core.handlers.asgi import ASGIRequest
+        self.assertFalse(stream_supported(mock.Mock(spec=ASGIRequest)))
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': tempfile.gettempdir()}})
+    def test_asgi_request_with_shared_cache_streamed(self):
+        from django.core.handlers.asgi import ASGIRequest
+        self.assertTrue(stream_supported(mock.Mock(spec=ASGIRequest)))
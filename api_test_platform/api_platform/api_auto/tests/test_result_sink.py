@@ -0,0 +1,47 @@
+"""执行结果批量回写（user-007）"""
+from django.test import override_settings
+
+from api_auto.models import CaseStepInfo
+from api_auto.result_sink import ResultSink
+
+from .base import PlatformTestCase, TEST_CACHES
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ResultSinkTest(PlatformTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_step('s1', 'case_01')
+        self.create_step('s2', 'case_02', is_pass='失败')
+        self.create_step('s3', 'case_03', part_name='模块B')
+        self.steps = list(CaseStepInfo.objects.select_related('api').order_by('case_step_info_id'))
+
+    def _is_pass(self, step_id):
+        return CaseStepInfo.objects.get(pk=step_id).is_pass
+
+    def test_flush_by_batch_size(self):
+        progress = []
+        with ResultSink(progress.append, batch_size=2, flush_interval_ms=60000) as sink:
+            sink.add(self.steps[0], True)
+            self.assertEqual(self._is_pass('s1'), '未执行')
+            sink.add(self.steps[1], True)
+            self.assertEqual(self._is_pass('s1'), '通过')
+            self.assertEqual(progress, [{'current': 2, 'success': 2, 'failure': 0}])
+            sink.add(self.steps[2], False)
+
+        self.assertEqual([self._is_pass(step_id) for step_id in ('s1', 's2', 's3')], ['通过', '通过', '失败'])
+        self.assertEqual(progress[-1], {'current': 3, 'success': 2, 'failure': 1})
+
+    def test_flush_by_interval(self):
+        with ResultSink(batch_size=100, flush_interval_ms=1) as sink:
+            sink._last_flush -= 1
+            sink.add(self.steps[0], False)
+            self.assertEqual(self._is_pass('s1'), '失败')
+
+    def test_flush_on_error_exit(self):
+        with self.assertRaises(RuntimeError):
+            with ResultSink(batch_size=10, flush_interval_ms=60000) as sink:
+                sink.add(self.steps[0], False)
+                raise RuntimeError("执行中断")
+        self.assertEqual(self._is_pass('s1'), '失败')
@@ -0,0 +1,98 @@
+"""执行历史记录（user-008）"""
+import threading
+import unittest
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from common import run_history
+from common.HTMLTestReportCN import _TestResult
+from common.run_history import RunHistoryRecorder, purge_run_history_if_due
+from test_runner.parallel_runner import ParallelSuite
+
+
+def step_record(status='passed'):
+    return {'case_step_info_id': 's1', 'case_id': 'case_01', 'part_name': '模块A', 'api_name': '登录接口',
+            'status': status, 'http_status': 200, 'dns_time': None, 'connect_time': None, 'tls_time': None,
+            'ttfb': 5.0, 'response_time': 10.0, 'request_size': 0, 'response_size': 2, 'message': '',
+            'started_at': None, 'finished_at': None}
+
+
+def _reporting_group_class():
+    """上报一条步骤记录的用例组（不放在模块级，避免被测试发现）"""
+
+    class ReportingGroup(unittest.TestCase):
+
+        def __init__(self, case_id):
+            super().__init__('runTest')
+            self.case_id = case_id
+
+        def runTest(self):
+            RunHistoryRecorder.record_active([step_record()])
+
+    return ReportingGroup
+
+
+class RunHistoryRecorderTest(SimpleTestCase):
+    ReportingGroup = _reporting_group_class()
+
+    def setUp(self):
+        patcher = mock.patch('common.run_history.SqlUtils')
+        self.sql_utils = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('common.run_history.purge_run_history_if_due')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_batched_insert_and_summary(self):
+        with RunHistoryRecorder('run_case', flush_size=2) as recorder:
+            recorder.record([step_record(), step_record('failed')])
+            self.assertEqual(self.sql_utils.execute_many.call_count, 1)
+            recorder.record([step_record()])
+
+        self.assertEqual(self.sql_utils.execute_many.call_count, 2)
+        self.assertEqual((recorder.total, recorder.passed, recorder.failed), (3, 2, 1))
+        self.assertIsNone(RunHistoryRecorder.active())
+
+    def test_active_recorder_isolated_per_thread(self):
+        started, release = threading.Barrier(2), threading.Event()
+        seen = {}
+
+        def run(name):
+            with RunHistoryRecorder('run_single_case') as recorder:
+                started.wait()
+                release.wait(5)
+                RunHistoryRecorder.record_active([step_record()])
+                seen[name] = (recorder, RunHistoryRecorder.active())
+
+        threads = [threading.Thread(target=run, args=(name,)) for name in ('first', 'second')]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        for recorder, active in seen.values():
+            self.assertIs(active, recorder)
+            self.assertEqual(recorder.total, 1)
+        self.assertIsNot(seen['first'][0], seen['second'][0])
+
+    def test_parallel_suite_threads_report_to_run(self):
+        with RunHistoryRecorder('run_case') as recorder:
+            ParallelSuite([self.ReportingGroup(f"case_{index}") for index in range(6)], workers=3)(_TestResult())
+        self.assertEqual(recorder.total, 6)
+
+
+class PurgeThrottleTest(SimpleTestCase):
+
+    @mock.patch('common.run_history._last_purge', None)
+    @mock.patch('common.run_history.config.HISTORY_PURGE_INTERVAL', 3600)
+    @mock.patch('common.run_history.purge_run_history', return_value=0)
+    def test_purge_once_per_interval(self, purge):
+        purge_run_history_if_due()
+        purge_run_history_if_due()
+        self.assertEqual(purge.call_count, 1)
+
+        run_history._last_purge -= 3600
+        purge_run_history_if_due()
+        self.assertEqual(purge.call_count, 2)
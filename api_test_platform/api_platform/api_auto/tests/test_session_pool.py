@@ -0,0 +1,43 @@
+"""连接池复用（user-003）"""
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from common.requests_utils import RequestsUtils
+from common.session_pool import SessionPool
+
+
+class SessionPoolTest(SimpleTestCase):
+
+    def setUp(self):
+        self.addCleanup(SessionPool.close)
+
+    def test_adapter_shared_per_host(self):
+        adapter = SessionPool.get_adapter('http://api.test:8080/login')
+        self.assertIs(SessionPool.get_adapter('http://api.test:8080/home?id=1'), adapter)
+        self.assertIsNot(SessionPool.get_adapter('https://api.test:8080/login'), adapter)
+
+    def test_sessions_share_pool_not_cookies(self):
+        first = SessionPool.new_session(('http://api.test',))
+        second = SessionPool.new_session(('http://api.test',))
+        first.cookies.set('sid', 'abc')
+
+        self.assertIs(first.get_adapter('http://api.test/login'), second.get_adapter('http://api.test/login'))
+        self.assertIsNone(second.cookies.get('sid'))
+
+    def test_keepalive_disabled_closes_connection(self):
+        with mock.patch('common.session_pool.config.HTTP_KEEPALIVE', 0):
+            session = SessionPool.new_session(('http://api.test',))
+        self.assertEqual(session.headers['Connection'], 'close')
+
+
+class RequestsUtilsSessionTest(SimpleTestCase):
+
+    def test_session_created_on_first_sync_request(self):
+        with mock.patch('common.requests_utils.SessionPool.new_session') as new_session:
+            requests_utils = RequestsUtils()
+            new_session.assert_not_called()
+
+            self.assertIs(requests_utils.session, new_session.return_value)
+            self.assertIs(requests_utils.session, new_session.return_value)
+        new_session.assert_called_once_with((requests_utils.host, requests_utils.host1))
@@ -0,0 +1,38 @@
+"""步骤执行计划预编译（user-005）"""
+import re
+
+from django.test import SimpleTestCase
+
+from common.step_compiler import compile_step, compile_template
+
+
+def step(**fields):
+    return {'case_step_info_id': 's1', '请求方式': 'post', '请求地址': '/api/login', '请求参数(get)': '',
+            '提交数据(post)': '{"email": "a@b.c"}', '取值方式': '正则匹配', '传值变量': 'token',
+            '取值代码': '"token":"(.+?)"', '期望结果类型': 'json键是否存在', '期望结果': 'token, id', **fields}
+
+
+class StepCompilerTest(SimpleTestCase):
+
+    def test_plan_cached_per_row_content(self):
+        plan = compile_step(step())
+        self.assertIs(compile_step(step()), plan)
+        # 行内容变化（编辑步骤）后重新编译
+        self.assertIsNot(compile_step(step(期望结果='token')), plan)
+        self.assertIsNot(compile_step(step(case_step_info_id='s2')), plan)
+
+    def test_plan_precompiles_row(self):
+        plan = compile_step(step())
+        self.assertEqual(plan.request_type, 'POST')
+        self.assertIsInstance(plan.extract_code, re.Pattern)
+        self.assertEqual(plan.check_data, ('token', 'id'))
+        self.assertEqual(plan.post_data.render({}), {'email': 'a@b.c'})
+
+    def test_template_without_placeholder_parsed_once(self):
+        template = compile_template('{"page": 1}')
+        self.assertIs(compile_template('{"page": 1}'), template)
+        self.assertIs(template.render({}), template.render({}))
+
+    def test_invalid_regex_kept_as_text(self):
+        plan = compile_step(step(取值代码='(unclosed'))
+        self.assertEqual(plan.extract_code, '(unclosed')
@@ -0,0 +1,31 @@
+"""参数模板（user-015）"""
+from django.test import SimpleTestCase
+
+from common.log_utils import logger
+from common.step_compiler import compile_template
+from common.template_utils import UnresolvedVariableError
+
+
+class PayloadTemplateTest(SimpleTestCase):
+
+    def test_typed_slot_keeps_type(self):
+        template = compile_template('{"user_id": "${user_id}", "name": "用户${user_id}"}')
+        self.assertEqual(template.render({'user_id': 7}), {'user_id': 7, 'name': '用户7'})
+
+    def test_nested_path(self):
+        template = compile_template('{"token": "${login.data.token}", "first": "${items[0].id}"}')
+        variables = {'login': '{"data": {"token": "t-1"}}', 'items': [{'id': 3}]}
+        self.assertEqual(template.render(variables), {'token': 't-1', 'first': 3})
+
+    def test_generator(self):
+        value = compile_template('{"n": "${random(5, 5)}"}').render({})
+        self.assertEqual(value, {'n': 5})
+
+    def test_unresolved_variable_fails_render(self):
+        for content in ('{"id": "${missing}"}', '{"name": "用户${missing}"}', '[${missing}]'):
+            with self.subTest(content=content), self.assertLogs(logger, 'WARNING'):
+                with self.assertRaises(UnresolvedVariableError):
+                    compile_template(content).render({})
+
+    def test_render_text_keeps_placeholder(self):
+        self.assertEqual(compile_template('/api/${missing}').render_text({}), '/api/${missing}')
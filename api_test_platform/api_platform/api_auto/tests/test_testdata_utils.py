@@ -0,0 +1,47 @@
+"""用例数据延迟加载与索引（user-004）"""
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from common.testdata_utils import TestdataUtils
+
+
+def row(step_id, case_id, part_name='模块A'):
+    return {'case_step_info_id': step_id, '测试用例编号': case_id, '模块名称': part_name, '测试用例步骤': step_id}
+
+
+class TestdataUtilsTest(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch('common.testdata_utils.SqlUtils')
+        self.sql_utils = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.sql_utils.get_mysql_test_case_info.return_value = [
+            row('s1', 'case_01'), row('s2', 'case_01'), row('s3', 'case_02'), row('s4', 'case_01', '模块B'),
+        ]
+        self.testdata_utils = TestdataUtils()
+
+    def test_full_query_deferred(self):
+        self.sql_utils.get_mysql_test_case_info.assert_not_called()
+        cases = self.testdata_utils.def_testcase_data_list_by_mysql()
+        self.assertEqual([case['case_id'] for case in cases], ['模块A_case_01', '模块A_case_02', '模块B_case_01'])
+        self.assertEqual([step['case_step_info_id'] for step in cases[0]['case_info']], ['s1', 's2'])
+
+    def test_selection_queries_only_selected_cases(self):
+        self.sql_utils.get_mysql_test_case_info_by_step_ids.return_value = [row('s3', 'case_02')]
+        cases = self.testdata_utils.get_testcases_by_step_ids(['s3'])
+
+        self.sql_utils.get_mysql_test_case_info_by_step_ids.assert_called_once_with(['s3'])
+        self.sql_utils.get_mysql_test_case_info.assert_not_called()
+        self.assertEqual([case['case_id'] for case in cases], ['模块A_case_02'])
+
+    def test_loaded_data_served_from_index(self):
+        self.testdata_utils.test_data_by_mysql
+
+        cases = self.testdata_utils.get_testcases_by_step_ids(['s2', 's1', 's4', 'missing'])
+        self.assertEqual([case['case_id'] for case in cases], ['模块A_case_01', '模块B_case_01'])
+        self.assertEqual([case['case_id'] for case in self.testdata_utils.get_testcases_by_part('模块B')],
+                         ['模块B_case_01'])
+        self.assertEqual(len(self.testdata_utils.get_testcases_by_case_id('case_01')), 2)
+        self.sql_utils.get_mysql_test_case_info_by_step_ids.assert_not_called()
+        self.sql_utils.get_mysql_test_case_info_by_part.assert_not_called()
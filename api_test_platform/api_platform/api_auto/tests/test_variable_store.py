@@ -0,0 +1,117 @@
+"""变量作用域（user-016）"""
+import threading
+import unittest
+
+from django.test import SimpleTestCase
+
+from common.HTMLTestReportCN import _TestResult
+from common.variable_store import RunVariables, VariableStore, case_role
+from test_runner.parallel_runner import ParallelSuite
+
+
+def steps(case_id, part_name='模块A'):
+    return [{'测试用例编号': case_id, '模块名称': part_name}]
+
+
+def _variable_group_class():
+    """读写执行级变量的用例组（不放在模块级，避免被测试发现）"""
+
+    class VariableGroup(unittest.TestCase):
+        seen = {}
+
+        def __init__(self, case_id, scope_role=None):
+            super().__init__('runTest')
+            self.case_id = case_id
+            self.scope_role = scope_role
+
+        def runTest(self):
+            variables = RunVariables.scope_for(steps(self.case_id))
+            if self.scope_role == 'setup':
+                variables['run.token'] = 't-1'
+            else:
+                VariableGroup.seen[self.case_id] = variables.get('token')
+
+    return VariableGroup
+
+
+class ScopedVariablesTest(SimpleTestCase):
+
+    def test_lookup_order_and_prefixed_writes(self):
+        with RunVariables(run={'token': 'run', 'tenant': 1}) as run_variables:
+            run_variables.module('模块A')['token'] = 'module'
+            variables = RunVariables.scope_for(steps('case_01'))
+            self.assertEqual(variables['token'], 'module')
+            variables['token'] = 'case'
+            self.assertEqual((variables['token'], variables['tenant']), ('case', 1))
+
+            variables['run.region'] = 'cn'
+            self.assertEqual(run_variables.run['region'], 'cn')
+            self.assertEqual(variables['run']['token'], 'run')
+            # 用例级变量不跨用例链
+            self.assertNotIn('token', RunVariables.scope_for(steps('case_02', '模块B')).case)
+
+    def test_setup_case_writes_module_scope(self):
+        self.assertEqual(case_role(steps('Setup_login')), 'setup')
+        self.assertEqual(case_role(steps('teardown_logout')), 'teardown')
+        with RunVariables() as run_variables:
+            RunVariables.scope_for(steps('setup_login'))['token'] = 't-1'
+            self.assertEqual(run_variables.module('模块A')['token'], 't-1')
+            self.assertEqual(RunVariables.scope_for(steps('case_01'))['token'], 't-1')
+            self.assertNotIn('token', RunVariables.scope_for(steps('case_01', '模块B')))
+
+    def test_without_run_variables_scopes_are_local(self):
+        first = RunVariables.scope_for(steps('setup_login'))
+        first['run.token'] = 't-1'
+        self.assertNotIn('token', RunVariables.scope_for(steps('case_01')))
+
+    def test_snapshot_round_trip(self):
+        run_variables = RunVariables(run={'token': 't-1'})
+        run_variables.module('模块A')['user_id'] = 7
+        copied = RunVariables.from_snapshot(run_variables.snapshot())
+        self.assertEqual((copied.run['token'], copied.module('模块A')['user_id']), ('t-1', 7))
+
+    def test_variable_store_snapshot_is_copy(self):
+        store = VariableStore({'a': 1})
+        snapshot = store.snapshot()
+        store['b'] = 2
+        self.assertEqual(snapshot, {'a': 1})
+        self.assertEqual(sorted(store), ['a', 'b'])
+
+
+class RunVariablesContextTest(SimpleTestCase):
+    VariableGroup = _variable_group_class()
+
+    def test_nested_scope_restored(self):
+        with RunVariables() as outer:
+            with RunVariables() as inner:
+                self.assertIs(RunVariables.active(), inner)
+            self.assertIs(RunVariables.active(), outer)
+        self.assertIsNone(RunVariables.active())
+
+    def test_active_variables_isolated_per_thread(self):
+        started, release = threading.Barrier(2), threading.Event()
+        seen = {}
+
+        def run(name):
+            with RunVariables() as run_variables:
+                RunVariables.scope_for(steps('case_01'))['run.owner'] = name
+                started.wait()
+                release.wait(5)
+                seen[name] = (RunVariables.active() is run_variables, run_variables.run['owner'])
+
+        threads = [threading.Thread(target=run, args=(name,)) for name in ('first', 'second')]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(seen, {'first': (True, 'first'), 'second': (True, 'second')})
+
+    def test_setup_variables_reach_parallel_threads(self):
+        self.VariableGroup.seen = {}
+        groups = [self.VariableGroup('setup_login', 'setup')]
+        groups += [self.VariableGroup(f"case_{index}") for index in range(4)]
+        with RunVariables():
+            ParallelSuite(groups, workers=2)(_TestResult())
+        self.assertEqual(self.VariableGroup.seen, {f"case_{index}": 't-1' for index in range(4)})
@@ -0,0 +1,83 @@
+"""按命名空间版本号失效的页面缓存（user-025）"""
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from api_auto.models import CaseStepInfo
+from api_auto.result_sink import ResultSink
+from api_auto.view_cache import (CASE_DETAIL, CONFIG_LIST, _version_key, bump_namespaces,
+                                 cache_page_by_namespace)
+from .base import TEST_CACHES, PlatformTestCase
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ViewCacheTest(PlatformTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.calls = 0
+        self.status = 200
+
+        @cache_page_by_namespace(CONFIG_LIST)
+        def view(request):
+            self.calls += 1
+            return HttpResponse(f"第{self.calls}次渲染", status=self.status)
+
+        self.view = view
+        self.factory = RequestFactory()
+
+    def _content(self, path='/config/', **params):
+        return self.view(self.factory.get(path, params)).content.decode()
+
+    def test_cached_until_namespace_bumped(self):
+        self.assertEqual(self._content(), "第1次渲染")
+        self.assertEqual(self._content(), "第1次渲染")
+
+        bump_namespaces(CONFIG_LIST)
+
+        self.assertEqual(self._content(), "第2次渲染")
+
+    def test_other_namespace_keeps_cache(self):
+        self._content()
+        bump_namespaces(CASE_DETAIL)
+        self.assertEqual(self._content(), "第1次渲染")
+
+    def test_lost_version_rebuilt(self):
+        self._content()
+        cache.delete(_version_key(CONFIG_LIST))
+        # 版本号按重建时的毫秒时间生成，不会与丢失前的版本号重复
+        with mock.patch('api_auto.view_cache.time.time', return_value=time.time() + 1):
+            self.assertEqual(self._content(), "第2次渲染")
+        self.assertEqual(self._content(), "第2次渲染")
+
+    def test_query_string_cached_separately(self):
+        self._content()
+        self._content(page=2)
+        self.assertEqual(self.calls, 2)
+
+    def test_post_and_error_response_not_cached(self):
+        self.view(self.factory.post('/config/'))
+        self.view(self.factory.post('/config/'))
+        self.status = 404
+        self._content()
+        self._content()
+        self.assertEqual(self.calls, 4)
+
+    def test_model_save_invalidates(self):
+        view = cache_page_by_namespace(CASE_DETAIL)(self.view.__wrapped__)
+        view(self.factory.get('/case-detail/s1/'))
+        self.create_step('s1', 'case_01')
+        view(self.factory.get('/case-detail/s1/'))
+        self.assertEqual(self.calls, 2)
+
+    def test_result_bulk_update_invalidates(self):
+        view = cache_page_by_namespace(CASE_DETAIL)(self.view.__wrapped__)
+        step = self.create_step('s1', 'case_01')
+        view(self.factory.get('/case-detail/s1/'))
+        with ResultSink(batch_size=1) as sink:
+            sink.add(CaseStepInfo.objects.select_related('api').get(pk=step.pk), True)
+        view(self.factory.get('/case-detail/s1/'))
+        self.assertEqual(self.calls, 2)
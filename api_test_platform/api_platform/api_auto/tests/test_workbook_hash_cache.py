@@ -0,0 +1,115 @@
+"""工作簿内容哈希缓存与按模块失效（user-019）"""
+import os
+import json
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from api_auto.models import CaseInfo, CaseStepInfo
+from common.excel_utils import WorkbookHashCache
+from .base import TEST_CACHES, PlatformTestCase
+
+
+class WorkbookHashCacheTest(SimpleTestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache_path = os.path.join(temp_dir.name, 'hash_cache.json')
+
+    def _saved_cache(self, **entries):
+        hash_cache = WorkbookHashCache(self.cache_path)
+        for file_hash, part_names in entries.items():
+            hash_cache.add(file_hash, f"{file_hash}.xlsx", 3, part_names)
+        hash_cache.save()
+        return WorkbookHashCache(self.cache_path)
+
+    def test_clear_removes_file_without_loading(self):
+        hash_cache = self._saved_cache(hash_1=['模块A'])
+
+        with mock.patch('common.excel_utils.json.load') as json_load:
+            hash_cache.clear()
+
+        json_load.assert_not_called()
+        self.assertFalse(os.path.exists(self.cache_path))
+        self.assertNotIn('hash_1', WorkbookHashCache(self.cache_path))
+
+    def test_invalidate_parts_keeps_other_modules(self):
+        hash_cache = self._saved_cache(hash_1=['模块A'], hash_2=['模块B'], hash_3=['模块A', '模块C'])
+
+        self.assertEqual(hash_cache.invalidate_parts({'模块A'}), 2)
+
+        reloaded = WorkbookHashCache(self.cache_path)
+        self.assertEqual([file_hash in reloaded for file_hash in ('hash_1', 'hash_2', 'hash_3')],
+                         [False, True, False])
+
+    def test_invalidate_parts_drops_entries_without_modules(self):
+        with open(self.cache_path, 'w', encoding='utf-8') as fp:
+            json.dump({'legacy': {'file_name': 'old.xlsx', 'rows': 1}}, fp)
+
+        self.assertEqual(WorkbookHashCache(self.cache_path).invalidate_parts({'模块B'}), 1)
+        # 全部失效后删除缓存文件
+        self.assertFalse(os.path.exists(self.cache_path))
+
+    def test_invalidate_parts_without_file(self):
+        self.assertEqual(WorkbookHashCache(self.cache_path).invalidate_parts({'模块A'}), 0)
+        self.assertFalse(os.path.exists(self.cache_path))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class WorkbookHashCacheSignalTest(PlatformTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.hash_cache = self.hash_cache_cls.return_value
+        self.hash_cache.exists.return_value = True
+        self.hash_cache.invalidate_parts.reset_mock()
+
+    def _invalidated(self):
+        return [call.args[0] for call in self.hash_cache.invalidate_parts.call_args_list]
+
+    def test_step_edit_and_delete_invalidate_module(self):
+        step = self.create_step('s1', 'case_01')
+        self.hash_cache.invalidate_parts.reset_mock()
+
+        step.excepted_result = 'token'
+        step.save()
+        step.delete()
+
+        self.assertEqual(self._invalidated(), [{'模块A'}, {'模块A'}])
+
+    def test_step_moved_invalidates_both_modules(self):
+        step = CaseStepInfo.objects.get(pk=self.create_step('s1', 'case_01').pk)
+        self.hash_cache.invalidate_parts.reset_mock()
+
+        step.part_name = '模块B'
+        step.save()
+
+        self.assertEqual(self._invalidated(), [{'模块A', '模块B'}])
+
+    def test_api_and_case_invalidate_modules_of_their_steps(self):
+        self.create_step('s1', 'case_01')
+        self.create_step('s2', 'case_02', part_name='模块B')
+        self.hash_cache.invalidate_parts.reset_mock()
+
+        self.api.api_request_url = '/api/v2/login'
+        self.api.save()
+        CaseInfo.objects.create(case_info_id='c2', case_id='case_02', case_name='登录')
+
+        self.assertEqual(self._invalidated(), [{'模块A', '模块B'}, {'模块B'}])
+
+    def test_without_cache_file_skips_invalidation(self):
+        self.hash_cache.exists.return_value = False
+
+        self.create_step('s1', 'case_01').delete()
+
+        self.hash_cache.invalidate_parts.assert_not_called()
+
+    def test_result_update_keeps_hash_cache(self):
+        self.create_step('s1', 'case_01')
+        self.hash_cache.invalidate_parts.reset_mock()
+
+        CaseStepInfo.objects.filter(case_step_info_id='s1').update(is_pass='通过')
+
+        self.hash_cache.invalidate_parts.assert_not_called()
@@ -0,0 +1,77 @@
+"""
+页面缓存：GET页面的渲染结果按URL缓存，缓存键版本号由页面依赖的命名空间版本号组成（Django缓存键版本）。
+模型保存/删除时（signals.py）递增相关命名空间的版本号，旧版本的缓存不再命中，到期后由缓存后端清除。
+"""
+import time
+import hashlib
+import functools
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from common.log_utils import logger
+
+# 页面依赖的数据：命名空间 -> 数据变化时需要失效的页面
+API_CONFIG = 'api_config'
+CONFIG_LIST = 'config_list'
+CASE_DETAIL = 'case_detail'
+
+
+def _version_key(namespace):
+    return f"view_cache_version_{namespace}"
+
+
+def _new_version():
+    # 版本号丢失（被淘汰或缓存重启）时用当前毫秒时间重建，不会与之前用过的版本号重复
+    return int(time.time() * 1000)
+
+
+def namespace_versions(namespaces):
+    """读取命名空间版本号（一次get_many），不存在的初始化"""
+    keys = [_version_key(namespace) for namespace in namespaces]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _new_version(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_namespaces(*namespaces):
+    """递增命名空间版本号，使依赖它的页面缓存全部失效；缓存不可用时只记录警告"""
+    for namespace in namespaces:
+        try:
+            cache.incr(_version_key(namespace))
+        except ValueError:
+            # 版本号不存在：说明该命名空间下没有可命中的缓存
+            cache.add(_version_key(namespace), _new_version(), None)
+        except Exception as e:
+            logger.warning(f"页面缓存失效失败: {namespace}, 错误: {str(e)}")
+
+
+def cache_page_by_namespace(*namespaces):
+    """
+    视图装饰器：GET请求的200响应按完整URL缓存（超时时间使用缓存后端默认值），
+    缓存键版本号为各命名空间版本号的组合；其他请求直接执行视图。缓存的页面不能包含CSRF令牌等用户相关内容
+    """
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return view_func(request, *args, **kwargs)
+            try:
+                version = '.'.join(str(version) for version in namespace_versions(namespaces))
+                key = 'view_page_' + hashlib.md5(request.get_full_path().encode('utf-8')).hexdigest()
+                cached = cache.get(key, version=version)
+            except Exception as e:
+                logger.warning(f"页面缓存读取失败，直接渲染: {str(e)}")
+                return view_func(request, *args, **kwargs)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                cache.set(key, (response.content, response['Content-Type']), version=version)
+            return response
+        return wrapper
+    return decorator
@@ -1,22 +1,28 @@
 import os
+import json
+import base64
 import shutil
-import subprocess
+import time
 from django.shortcuts import render, get_object_or_404, redirect, reverse
 from django.views.decorators.csrf import csrf_exempt
-from django.core.cache import cache
 from django.contrib import messages
-from django.db.models import F, Q, Count
+from django.db import transaction
+from django.db.models import F, Q, Count, OuterRef, Subquery
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger  # 内置分页
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.conf import settings
 from django.core.files.storage import FileSystemStorage
 
 from common.log_utils import logger
 # 导入自定义模型和工具
-from .models import CaseStepInfo, ApiInfo, CaseInfo, ConfigUrl
+from .models import CaseStepInfo, ApiInfo, CaseInfo, ConfigUrl, TestJob, TestRun
 from .forms import ExcelUploadForm
+from .jobs import submit_job
+from .stats import (latest_latency_comparison, dashboard_stats, apply_result_changes, invalidate_case_stats,
+                    track_step_changes)
+from .view_cache import API_CONFIG, CONFIG_LIST, CASE_DETAIL, bump_namespaces, cache_page_by_namespace
 from common.excel_to_mysql_importer import ExcelToMysqlImporter
-from common.excel_utils import ExcelUtils
+from common.excel_utils import ExcelUtils, WorkbookHashCache, file_content_hash
 from test_runner.run_case import RunCase
 
 
@@ -26,8 +32,129 @@ def index(request):
 
 
 # Excel导入视图
+# 导入预览最多展示的新增/变化/删除明细条数
+IMPORT_PREVIEW_LIMIT = 100
+# 待确认的上传文件保留时长（秒），预览后未确认也未取消的文件在下次上传时清理
+PENDING_IMPORT_MAX_AGE = 24 * 60 * 60
+
+
+def _pending_import_dir():
+    """待确认的上传文件目录（测试数据目录下的隐藏目录，不会被目录批量导入读取）"""
+    return settings.FRAMEWORK_DIR / 'test_data' / '.pending'
+
+
+def _purge_pending_imports(max_age=PENDING_IMPORT_MAX_AGE):
+    """删除超过保留时长的待确认上传文件（关闭预览页面等情况不会走确认/取消），返回删除的文件数"""
+    pending_dir = _pending_import_dir()
+    if not os.path.isdir(pending_dir):
+        return 0
+    expire_time = time.time() - max_age
+    removed = 0
+    for entry in os.scandir(pending_dir):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < expire_time:
+                os.remove(entry.path)
+                removed += 1
+        except OSError as e:
+            logger.warning(f"清理过期待导入文件失败: {entry.name}, 错误: {str(e)}")
+    if removed:
+        logger.info(f"已清理过期待导入文件 {removed} 个")
+    return removed
+
+
+def _diff_excel_file(importer, file_path):
+    """只读模式逐行读取Excel并与数据库按行指纹对比，返回增量导入计划"""
+    excel_utils = ExcelUtils(file_path, sheet_name='Sheet1', read_only=True)
+    try:
+        wrapped_case_info = ({'case_id': f"case_{i}", 'case_info': [case]} for i, case in
+                             enumerate(excel_utils.iter_rows_by_dict()))
+        return importer.diff_case_info(wrapped_case_info)
+    finally:
+        excel_utils.close()
+
+
+def _import_preview(diff, filename):
+    """增量导入计划转换为预览页面数据（明细最多IMPORT_PREVIEW_LIMIT条）"""
+    def case_rows(entries):
+        rows = []
+        for idx, case_item in entries[:IMPORT_PREVIEW_LIMIT]:
+            excel_row = (case_item.get('case_info') or [{}])[0]
+            rows.append({
+                'row': idx,
+                'case_id': excel_row.get('测试用例编号', ''),
+                'part_name': excel_row.get('模块名称', ''),
+                'case_step_name': excel_row.get('测试用例步骤', ''),
+                'api_name': excel_row.get('接口名称', ''),
+            })
+        return rows
+
+    return {
+        'filename': filename,
+        'total': diff['total'],
+        'added_count': len(diff['added']),
+        'changed_count': len(diff['changed']),
+        'unchanged_count': diff['unchanged'],
+        'removed_count': len(diff['removed']),
+        'added': case_rows(diff['added']),
+        'changed': case_rows(diff['changed']),
+        'removed': diff['removed'][:IMPORT_PREVIEW_LIMIT],
+        'limit': IMPORT_PREVIEW_LIMIT,
+        'has_changes': bool(diff['added'] or diff['changed'] or diff['removed']),
+    }
+
+
+def _confirm_import(request):
+    """确认导入：上传文件移入test_data，重新对比后只写入差异部分"""
+    filename = os.path.basename(request.POST.get('import_file', ''))
+    pending_path = os.path.join(_pending_import_dir(), filename)
+    if not filename or not os.path.isfile(pending_path):
+        messages.error(request, "待导入文件不存在或已过期，请重新上传！")
+        return redirect(reverse('api_auto:import_excel'))
+
+    file_path = os.path.join(settings.FRAMEWORK_DIR / 'test_data', filename)
+    shutil.move(pending_path, file_path)
+    try:
+        importer = ExcelToMysqlImporter()
+        try:
+            # 预览后数据库可能已变化，按当前数据重新对比
+            diff = _diff_excel_file(importer, file_path)
+            import_result = importer.apply_case_info_diff(diff)
+        finally:
+            importer.close()
+        invalidate_case_stats()
+        # 导入工具直接写SQL，不触发模型信号
+        bump_namespaces(API_CONFIG, CASE_DETAIL)
+        # 记录已成功导入的文件内容哈希，批量导入测试数据目录时跳过
+        if not import_result['fail']:
+            hash_cache = WorkbookHashCache()
+            hash_cache.add(file_content_hash(file_path), filename,
+                           import_result['total'] + import_result['unchanged'], diff['part_names'])
+            hash_cache.save()
+        messages.success(request,
+                         f"增量导入完成！写入：{import_result['total']}（成功：{import_result['success']}，"
+                         f"失败：{import_result['fail']}），未变化跳过：{import_result['unchanged']}，"
+                         f"删除步骤：{import_result['removed']}")
+    except Exception as e:
+        messages.error(request, f"数据导入失败：{str(e)}")
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        return redirect(reverse('api_auto:import_excel'))
+
+    return redirect(reverse('api_auto:case_list'))
+
+
 def import_excel(request):
-    """Excel导入页面：上传Excel到test_data，再导入MySQL"""
+    """Excel导入页面：上传Excel后预览与数据库的差异（新增/变化/删除），确认后增量导入MySQL"""
+    if request.method == 'POST' and 'confirm_import' in request.POST:
+        return _confirm_import(request)
+
+    if request.method == 'POST' and 'cancel_import' in request.POST:
+        pending_path = os.path.join(_pending_import_dir(), os.path.basename(request.POST.get('import_file', '')))
+        if os.path.isfile(pending_path):
+            os.remove(pending_path)
+        messages.info(request, "已取消导入")
+        return redirect(reverse('api_auto:import_excel'))
+
     if request.method == 'POST':
         form = ExcelUploadForm(request.POST, request.FILES)
         if form.is_valid():
@@ -37,57 +164,114 @@ def import_excel(request):
                 messages.error(request, "仅支持xls/xlsx格式文件！")
                 return redirect(reverse('api_auto:import_excel'))
 
-            # 2. 保存文件到test_data目录
-            test_data_dir = settings.FRAMEWORK_DIR / 'test_data'
-            fs = FileSystemStorage(location=test_data_dir)
+            # 2. 保存文件到待确认目录（确认导入后再移入test_data），同时清理过期未确认的文件
+            _purge_pending_imports()
+            fs = FileSystemStorage(location=_pending_import_dir())
             import datetime
             timestamp = datetime.datetime.now().strftime('%Y%m%d%H%M%S')
-            filename = f"{timestamp}_{excel_file.name}"
-            fs.save(filename, excel_file)
-            file_path = os.path.join(test_data_dir, filename)
+            filename = fs.save(f"{timestamp}_{excel_file.name}", excel_file)
+            file_path = fs.path(filename)
             messages.success(request, f"Excel文件上传成功：{filename}")
 
-            # 3. 导入数据库
+            # 3. 预览：与数据库按行指纹对比，不写入
             try:
                 importer = ExcelToMysqlImporter()
-                excel_utils = ExcelUtils(file_path, sheet_name='Sheet1')
-                case_info_list = excel_utils.get_sheet_data_by_dict()
-                wrapped_case_info = [{'case_id': f"case_{i}", 'case_info': [case]} for i, case in
-                                     enumerate(case_info_list)]
-                import_result = importer.import_case_info(wrapped_case_info)
-                importer.close()
-                messages.success(request,
-                                 f"数据导入完成！总条数：{import_result['total']}，成功：{import_result['success']}，失败：{import_result['fail']}")
+                try:
+                    diff = _diff_excel_file(importer, file_path)
+                finally:
+                    importer.close()
             except Exception as e:
-                messages.error(request, f"数据导入失败：{str(e)}")
+                messages.error(request, f"Excel解析失败：{str(e)}")
                 if os.path.exists(file_path):
                     os.remove(file_path)
                 return redirect(reverse('api_auto:import_excel'))
 
-            return redirect(reverse('api_auto:case_list'))
+            return render(request, 'api_auto/import_excel.html', {
+                'form': ExcelUploadForm(),
+                'preview': _import_preview(diff, filename),
+            })
     else:
         form = ExcelUploadForm()
 
     return render(request, 'api_auto/import_excel.html', {'form': form})
 
 
-def case_list(request):
-    """用例列表：按模块分组、批量执行、删除"""
-    # 1. 获取所有用例数据并按模块分组
-    modules = CaseStepInfo.objects.values('part_name').distinct().order_by('part_name')
-    module_cases = {}
+# 用例列表每个模块每次加载的步骤数（page_size参数可调整，不超过CASE_PAGE_MAX_SIZE）
+CASE_PAGE_SIZE = 50
+CASE_PAGE_MAX_SIZE = 500
+CASE_PASS_STATUSES = ('通过', '失败', '未执行')
+
+
+def _case_filters(params):
+    """
+    用例列表搜索条件：keyword匹配用例编号前缀（可使用模块+用例编号联合索引）或接口名称包含关键字，
+    is_pass按执行结果筛选（未执行包含空值）
+    """
+    condition = Q()
+    keyword = params.get('q', '').strip()
+    if keyword:
+        condition &= Q(case_id__startswith=keyword) | Q(api__api_name__icontains=keyword)
+    is_pass = params.get('is_pass', '').strip()
+    if is_pass == '未执行':
+        condition &= Q(is_pass__isnull=True) | Q(is_pass__in=('', '未执行'))
+    elif is_pass:
+        condition &= Q(is_pass=is_pass)
+    return condition
+
+
+def _encode_case_cursor(row):
+    """分页游标：本页最后一条的排序键 (case_id, case_step_name, 步骤ID)"""
+    raw = json.dumps([row['case_id'], row['case_step_name'], row['case_step_info_id']], ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def _decode_case_cursor(cursor):
+    try:
+        case_id, case_step_name, case_step_info_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError):
+        raise ValueError("分页游标无效，请刷新页面")
+    return case_id, case_step_name, case_step_info_id
+
+
+def _module_case_page(part_name, condition, cursor=None, page_size=CASE_PAGE_SIZE):
+    """
+    模块内键集分页：按 (case_id, case_step_name, 步骤ID) 排序，取游标之后的page_size条。
+    按联合索引顺序扫描，翻页深度不影响查询耗时；多取一条判断是否还有下一页，接口名称通过一次JOIN取得
+    """
+    queryset = CaseStepInfo.objects.filter(condition, part_name=part_name)
+    if cursor:
+        case_id, case_step_name, case_step_info_id = _decode_case_cursor(cursor)
+        queryset = queryset.filter(
+            Q(case_id__gt=case_id) |
+            Q(case_id=case_id, case_step_name__gt=case_step_name) |
+            Q(case_id=case_id, case_step_name=case_step_name, case_step_info_id__gt=case_step_info_id)
+        )
+    rows = list(queryset.order_by('case_id', 'case_step_name', 'case_step_info_id').values(
+        'case_step_info_id', 'case_id', 'case_step_name', 'is_pass', 'api__api_name'
+    )[:page_size + 1])
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+    return {
+        'cases': [{
+            'case_step_info_id': row['case_step_info_id'],
+            'case_id': row['case_id'],
+            'case_step_name': row['case_step_name'],
+            'api_name': row['api__api_name'],
+            'is_pass': row['is_pass'] or '未执行',
+        } for row in rows],
+        'next_cursor': _encode_case_cursor(rows[-1]) if has_next else None,
+    }
 
-    for module in modules:
-        module_cases[module['part_name']] = CaseStepInfo.objects.filter(
-            part_name=module['part_name']
-        ).select_related('api').order_by('case_id', 'case_step_name')
 
-    # 2. 处理删除请求
+def case_list(request):
+    """用例列表：按模块分组（模块内的步骤由case_list_module分页懒加载）、搜索筛选、批量执行、删除"""
+    # 1. 处理删除请求
     if request.method == 'POST' and 'delete_case' in request.POST:
         case_step_id = request.POST.get('case_step_id')
         try:
             case = CaseStepInfo.objects.get(case_step_info_id=case_step_id)
-            case.delete()
+            with track_step_changes(CaseStepInfo.objects.filter(pk=case.pk)):
+                case.delete()
             messages.success(request, "用例删除成功！")
             return redirect(reverse('api_auto:case_list'))
         except CaseStepInfo.DoesNotExist:
@@ -96,30 +280,45 @@ def case_list(request):
             messages.error(request, f"删除失败：{str(e)}")
         return redirect(reverse('api_auto:case_list'))
 
-    # 3. 执行所有用例逻辑
+    # 2. 执行所有用例逻辑（提交后台任务，不阻塞Web请求）
     if request.method == 'POST' and 'run_all' in request.POST:
         try:
-            run_case_path = os.path.join(settings.FRAMEWORK_DIR, 'test_runner', 'run_case.py')
-            result = subprocess.run(
-                [settings.PYTHON_EXECUTABLE, run_case_path],
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-            if result.returncode == 0:
-                messages.success(request, f"所有用例执行完成！结果：{result.stdout}")
-            else:
-                messages.error(request, f"用例执行失败！错误：{result.stderr}")
+            job = submit_job('run_case_report', request.POST.getlist('case_ids'))
+            messages.success(request, f"用例执行任务已提交后台执行！任务ID：{job.job_id}")
         except Exception as e:
             messages.error(request, f"执行异常：{str(e)}")
         return redirect(reverse('api_auto:case_list'))
 
+    # 3. 模块汇总：一次GROUP BY查询各模块符合条件的步骤数和失败数
+    modules = CaseStepInfo.objects.filter(_case_filters(request.GET)).values('part_name').annotate(
+        total=Count('case_step_info_id'),
+        failed=Count('case_step_info_id', filter=Q(is_pass='失败')),
+    ).order_by('part_name')
+
     return render(request, 'api_auto/case_list.html', {
-        'module_cases': module_cases,  # 按模块分组的用例数据
+        'modules': modules,  # 模块列表（含步骤数）
+        'keyword': request.GET.get('q', ''),
+        'is_pass': request.GET.get('is_pass', ''),
+        'pass_statuses': CASE_PASS_STATUSES,
+        'page_size': CASE_PAGE_SIZE,
     })
 
 
+def case_list_module(request):
+    """用例列表懒加载（AJAX请求）：返回一个模块内游标之后的一页步骤，搜索条件与用例列表一致"""
+    part_name = request.GET.get('part_name')
+    if part_name is None:
+        return JsonResponse({'status': 'error', 'message': '缺少模块名称'}, status=400)
+    try:
+        page_size = min(max(int(request.GET.get('page_size') or CASE_PAGE_SIZE), 1), CASE_PAGE_MAX_SIZE)
+        page = _module_case_page(part_name, _case_filters(request.GET), request.GET.get('cursor'), page_size)
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    return JsonResponse({'status': 'success', 'part_name': part_name, **page})
+
+
 # 接口配置视图
+@cache_page_by_namespace(API_CONFIG)
 def api_config(request):
     """接口配置页面：管理API基础信息"""
     apis = ApiInfo.objects.all().order_by('api_name')
@@ -128,6 +327,7 @@ def api_config(request):
     })
 
 # 用例详情视图
+@cache_page_by_namespace(CASE_DETAIL)
 def case_detail(request, case_step_id):
     """用例详情：展示完整用例信息"""
     case_step = get_object_or_404(CaseStepInfo, case_step_info_id=case_step_id)
@@ -144,8 +344,10 @@ def run_single_case(request, case_step_id):
     from test_runner.run_single_case import RunSingleCase
 
     try:
-        # 获取用例记录
-        case_step = CaseStepInfo.objects.get(case_step_info_id=case_step_id)
+        # 检查用例记录是否存在（同时取出原执行结果、模块和接口名称，用于增量更新统计）
+        case_step = CaseStepInfo.objects.select_related('api').only(
+            'case_step_info_id', 'is_pass', 'part_name', 'api', 'api__api_name'
+        ).get(case_step_info_id=case_step_id)
 
         logger.debug("初始化RunSingleCase执行器")
         runner = RunSingleCase(case_step_id)
@@ -155,14 +357,18 @@ def run_single_case(request, case_step_id):
 
         # 根据执行结果更新数据库
         if result['status'] == 'success':
-            case_step.is_pass = "通过"
+            is_pass = "通过"
             logger.info(f"用例执行成功, 更新数据库状态为通过: {case_step_id}")
         else:
-            case_step.is_pass = "失败"
+            is_pass = "失败"
             logger.warning(f"用例执行失败, 更新数据库状态为失败: {case_step_id}")
 
-        # 保存执行结果到数据库
-        case_step.save()
+        # 只更新is_pass列，避免整行UPDATE
+        with transaction.atomic():
+            CaseStepInfo.objects.filter(case_step_info_id=case_step_id).update(is_pass=is_pass)
+            apply_result_changes([(case_step.is_pass, is_pass, case_step.part_name, case_step.api.api_name)])
+        # queryset.update不触发模型信号，直接失效用例详情页缓存
+        bump_namespaces(CASE_DETAIL)
 
         # 记录详细执行结果
         logger.debug(f"用例执行结果: {result}")
@@ -184,104 +390,98 @@ def run_single_case(request, case_step_id):
 
 @csrf_exempt
 def run_all_cases(request):
-    """执行全量用例并保存结果到数据库"""
+    """提交全量用例执行任务（后台进程池执行），GET请求返回任务进度"""
     if request.method == 'GET':
-        # 返回当前执行进度
-        progress = cache.get('test_progress', {
-            'total': 0,
-            'current': 0,
-            'status': 'idle'
-        })
-        return JsonResponse(progress)
+        # 返回指定任务（未指定时为最近一次任务）的执行进度
+        job_id = request.GET.get('job_id')
+        jobs = TestJob.objects.filter(job_type='run_all_cases')
+        job = jobs.filter(job_id=job_id).first() if job_id else jobs.first()
+        if not job:
+            return JsonResponse({'total': 0, 'current': 0, 'status': 'idle'})
+        return JsonResponse(job.to_progress())
 
     try:
-        logger.info("开始执行全量用例")
-        # 1. 初始化执行状态
-        total_cases = CaseStepInfo.objects.count()
-        cache.set('test_progress', {
-            'total': total_cases,
-            'current': 0,
-            'status': 'running'
-        }, 3600)
-
-        # 2. 获取所有用例并执行
-        case_steps = CaseStepInfo.objects.all()
-        success_count = 0
-        failure_count = 0
-
-        for index, case_step in enumerate(case_steps):
-            # 执行单条用例
-            from test_runner.run_single_case import RunSingleCase
-            runner = RunSingleCase(case_step.case_step_info_id)
-            result = runner.run()
-
-            # 更新用例状态
-            case_step.is_pass = "通过" if result['passed'] else "失败"
-            case_step.save()
-
-            # 更新执行进度
-            if result['passed']:
-                success_count += 1
-            else:
-                failure_count += 1
-
-            cache.set('test_progress', {
-                'total': total_cases,
-                'current': index + 1,
-                'status': 'running',
-                'success': success_count,
-                'failure': failure_count
-            }, 3600)
-
-        # 3. 返回执行结果
-        cache.set('test_progress', {
-            'total': total_cases,
-            'current': total_cases,
-            'status': 'completed',
-            'success': success_count,
-            'failure': failure_count
-        }, 60)
-
-        return JsonResponse({
-            'status': 'completed',
-            'total': total_cases,
-            'success': success_count,
-            'failure': failure_count
-        })
+        from .progress import stream_supported
 
+        logger.info("提交全量用例执行任务")
+        job = submit_job('run_all_cases', request.POST.getlist('case_ids'))
+        # stream：页面是否订阅进度推送（否则轮询GET接口）
+        return JsonResponse({**job.to_progress(), 'stream': stream_supported(request)})
     except Exception as e:
-        logger.error(f"全量执行失败: {str(e)}", exc_info=True)
-        cache.set('test_progress', {
-            'status': 'failed',
-            'message': str(e)
-        }, 60)
+        logger.error(f"全量执行任务提交失败: {str(e)}", exc_info=True)
         return JsonResponse({
             'status': 'error',
             'message': str(e)
         }, status=500)
 
-def dashboard(request):
-    """仪表盘视图，展示用例执行情况"""
-    # 获取用例统计信息
-    stats = CaseStepInfo.objects.aggregate(
-        total=Count('case_step_info_id'),
-        passed=Count('case_step_info_id', filter=Q(is_pass="通过")),
-        failed=Count('case_step_info_id', filter=Q(is_pass="失败"))
-    )
+async def run_progress_stream(request, job_id):
+    """
+    任务执行进度推送（Server-Sent Events）：按任务ID推送每条用例的执行结果和汇总进度，任务结束后关闭。
+    需以ASGI方式部署（api_platform/asgi.py）并使用文件/Redis缓存，否则返回503，页面改为轮询
+    """
+    from .progress import progress_stream, stream_supported
+
+    if not stream_supported(request):
+        return JsonResponse({'status': 'error', 'message': '当前部署不支持进度推送，请轮询任务进度'}, status=503)
+    if not await TestJob.objects.filter(job_id=job_id).aexists():
+        return JsonResponse({'status': 'error', 'message': '任务不存在'}, status=404)
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID') or 0)
+    except ValueError:
+        last_event_id = 0
+    response = StreamingHttpResponse(progress_stream(job_id, last_event_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # 关闭Nginx缓冲，事件立即送达
+    return response
 
-    # 计算通过率
-    pass_rate = (stats['passed'] / stats['total'] * 100) if stats['total'] > 0 else 0
 
-    # 获取失败用例列表
-    failed_cases = CaseStepInfo.objects.filter(is_pass="失败").select_related('api')
+def dashboard(request):
+    """仪表盘视图，展示用例执行情况（统计读取用例执行统计表，失败用例分页）"""
+    # 获取用例统计信息（全部/按模块/按接口）
+    case_stats = dashboard_stats()
+    stats = case_stats['total']
+
+    # 失败用例分页：页数按统计中的失败数计算，不再单独计数；按主键排序可直接使用is_pass索引。
+    # 每页多取一条判断是否还有下一页，统计滞后于实际失败数时据此修正页数
+    page_size = settings.DASHBOARD_FAILED_PAGE_SIZE
+    num_pages = max((stats['failed'] + page_size - 1) // page_size, 1)
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+    failed_steps = CaseStepInfo.objects.filter(is_pass="失败").select_related('api').only(
+        'case_step_info_id', 'case_id', 'case_step_name', 'part_name', 'api', 'api__api_name'
+    ).order_by('case_step_info_id')
+    failed_cases = list(failed_steps[(page - 1) * page_size:page * page_size + 1])
+    if not failed_cases and page > 1:
+        # 页码超出实际范围（统计多记失败数或页码无效）时才计数一次，回到实际的最后一页
+        page = max((failed_steps.count() + page_size - 1) // page_size, 1)
+        failed_cases = list(failed_steps[(page - 1) * page_size:page * page_size + 1])
+    has_next = len(failed_cases) > page_size
+    failed_cases = failed_cases[:page_size]
+    num_pages = max(num_pages, page + 1) if has_next else page
+
+    # 最近执行批次（执行批次表在写入时已汇总通过/失败数）
+    recent_runs = TestRun.objects.only('run_id', 'run_type', 'status', 'total', 'passed', 'failed', 'started_at')[:10]
+
+    # 最近一次执行的接口耗时统计（与上一次执行对比）
+    latest_run, latency_rows = latest_latency_comparison()
 
     return render(request, 'api_auto/dashboard.html', {
-        'pass_rate': round(pass_rate, 2),
+        'pass_rate': stats['pass_rate'],
         'stats': stats,
-        'failed_cases': failed_cases
+        'module_stats': case_stats['modules'],
+        'api_stats': case_stats['apis'],
+        'failed_cases': failed_cases,
+        'page': page,
+        'num_pages': num_pages,
+        'recent_runs': recent_runs,
+        'latest_run': latest_run,
+        'latency_rows': latency_rows
     })
 
 
+@cache_page_by_namespace(CONFIG_LIST)
 def config_list(request):
     """环境配置列表"""
     configs = ConfigUrl.objects.all().order_by('section', 'key_name')
@@ -348,22 +548,84 @@ def config_delete(request, config_id):
     return redirect('api_auto:config_list')
 
 
-def api_management(request):
-    """接口管理页面"""
-    # 获取所有用例数据（关联接口信息）
-    cases = CaseStepInfo.objects.select_related('api').all()
+# 接口管理列表每页条数（page_size参数可调整，不超过API_MANAGEMENT_MAX_PAGE_SIZE）
+API_MANAGEMENT_PAGE_SIZE = 20
+API_MANAGEMENT_MAX_PAGE_SIZE = 200
+# 允许排序的列：排序参数 -> 查询字段（前缀"-"表示降序）
+API_MANAGEMENT_SORT_FIELDS = {
+    'case_id': 'case_id',
+    'part_name': 'part_name',
+    'case_step_name': 'case_step_name',
+    'api_name': 'api__api_name',
+}
+
+
+def _api_management_page(params):
+    """
+    接口管理列表：一条JOIN接口信息的查询，只取展示列；用例名称按用例编号通过子查询取得（只对当前页的行执行），
+    筛选、排序、分页都在SQL中完成。返回 (分页对象, 排序参数)
+    """
+    case_names = CaseInfo.objects.filter(case_id=OuterRef('case_id')).values('case_name')[:1]
+    queryset = CaseStepInfo.objects.values(
+        'case_step_info_id', 'case_id', 'case_step_name', 'part_name', 'api__api_name'
+    ).annotate(case_name=Subquery(case_names))
+
+    keyword = params.get('q', '').strip()
+    if keyword:
+        queryset = queryset.filter(
+            Q(case_id__startswith=keyword) | Q(api__api_name__icontains=keyword) |
+            Q(case_id__in=CaseInfo.objects.filter(case_name__icontains=keyword).values('case_id'))
+        )
+
+    sort = params.get('sort', 'case_id')
+    if sort.lstrip('-') not in API_MANAGEMENT_SORT_FIELDS:
+        sort = 'case_id'
+    field = API_MANAGEMENT_SORT_FIELDS[sort.lstrip('-')]
+    queryset = queryset.order_by(f"-{field}" if sort.startswith('-') else field, 'case_step_info_id')
 
-    # 获取所有关联的用例信息
-    case_ids = [case.case_id for case in cases]
-    case_infos = CaseInfo.objects.filter(case_id__in=case_ids)
-    case_info_map = {info.case_id: info for info in case_infos}
+    try:
+        page_size = min(max(int(params.get('page_size') or API_MANAGEMENT_PAGE_SIZE), 1),
+                        API_MANAGEMENT_MAX_PAGE_SIZE)
+    except ValueError:
+        page_size = API_MANAGEMENT_PAGE_SIZE
+    paginator = Paginator(queryset, page_size)
+    try:
+        page = paginator.page(params.get('page', 1))
+    except PageNotAnInteger:
+        page = paginator.page(1)
+    except EmptyPage:
+        page = paginator.page(paginator.num_pages)
+    return page, sort
 
-    # 将用例信息附加到对应的CaseStepInfo对象
-    for case in cases:
-        case.case_info = case_info_map.get(case.case_id)
 
+def api_management(request):
+    """接口管理页面（分页，支持按用例编号/用例名称/接口名称搜索和按列排序）"""
+    page, sort = _api_management_page(request.GET)
     return render(request, 'api_auto/api_management.html', {
-        'cases': cases
+        'page_obj': page,
+        'cases': page.object_list,
+        'keyword': request.GET.get('q', ''),
+        'sort': sort,
+    })
+
+
+def api_management_list(request):
+    """接口管理列表（AJAX请求）：参数与接口管理页面一致，返回当前页数据"""
+    page, sort = _api_management_page(request.GET)
+    return JsonResponse({
+        'status': 'success',
+        'page': page.number,
+        'num_pages': page.paginator.num_pages,
+        'count': page.paginator.count,
+        'sort': sort,
+        'results': [{
+            'case_step_info_id': row['case_step_info_id'],
+            'case_id': row['case_id'],
+            'case_name': row['case_name'],
+            'case_step_name': row['case_step_name'],
+            'part_name': row['part_name'],
+            'api_name': row['api__api_name'],
+        } for row in page.object_list],
     })
 
 
@@ -375,40 +637,44 @@ def api_management_add(request):
         form = ApiManagementForm(request.POST)
         if form.is_valid():
             try:
-                # 保存API信息
-                api = ApiInfo(
-                    api_id=f"api_{form.cleaned_data['case_id']}_{form.cleaned_data['case_step_name']}",
-                    api_name=form.cleaned_data['api_name'],
-                    api_request_type=form.cleaned_data['api_request_type'],
-                    api_request_url=form.cleaned_data['api_request_url'],
-                    api_url_params=form.cleaned_data['api_url_params'],
-                    api_post_data=form.cleaned_data['api_post_data']
-                )
-                api.save()
-
-                # 保存用例信息
-                case_info = CaseInfo(
-                    case_info_id=f"case_{form.cleaned_data['case_id']}",
-                    case_id=form.cleaned_data['case_id'],
-                    case_name=form.cleaned_data['case_name'],
-                    is_run=form.cleaned_data['is_run']
-                )
-                case_info.save()
-
-                # 保存用例步骤信息
-                case_step = CaseStepInfo(
-                    case_step_info_id=f"step_{form.cleaned_data['case_id']}_{form.cleaned_data['case_step_name']}",
-                    case_id=form.cleaned_data['case_id'],
-                    case_step_name=form.cleaned_data['case_step_name'],
-                    part_name=form.cleaned_data['part_name'],
-                    api=api,
-                    get_value_type=form.cleaned_data['get_value_type'],
-                    variable_name=form.cleaned_data['variable_name'],
-                    get_value_code=form.cleaned_data['get_value_code'],
-                    excepted_result_type=form.cleaned_data['excepted_result_type'],
-                    excepted_result=form.cleaned_data['excepted_result']
-                )
-                case_step.save()
+                api_id = f"api_{form.cleaned_data['case_id']}_{form.cleaned_data['case_step_name']}"
+                case_step_id = f"step_{form.cleaned_data['case_id']}_{form.cleaned_data['case_step_name']}"
+                # 主键已存在时覆盖原记录，统计表按覆盖前后的步骤增量更新
+                with track_step_changes(CaseStepInfo.objects.filter(Q(pk=case_step_id) | Q(api_id=api_id))):
+                    # 保存API信息
+                    api = ApiInfo(
+                        api_id=api_id,
+                        api_name=form.cleaned_data['api_name'],
+                        api_request_type=form.cleaned_data['api_request_type'],
+                        api_request_url=form.cleaned_data['api_request_url'],
+                        api_url_params=form.cleaned_data['api_url_params'],
+                        api_post_data=form.cleaned_data['api_post_data']
+                    )
+                    api.save()
+
+                    # 保存用例信息
+                    case_info = CaseInfo(
+                        case_info_id=f"case_{form.cleaned_data['case_id']}",
+                        case_id=form.cleaned_data['case_id'],
+                        case_name=form.cleaned_data['case_name'],
+                        is_run=form.cleaned_data['is_run']
+                    )
+                    case_info.save()
+
+                    # 保存用例步骤信息
+                    case_step = CaseStepInfo(
+                        case_step_info_id=case_step_id,
+                        case_id=form.cleaned_data['case_id'],
+                        case_step_name=form.cleaned_data['case_step_name'],
+                        part_name=form.cleaned_data['part_name'],
+                        api=api,
+                        get_value_type=form.cleaned_data['get_value_type'],
+                        variable_name=form.cleaned_data['variable_name'],
+                        get_value_code=form.cleaned_data['get_value_code'],
+                        excepted_result_type=form.cleaned_data['excepted_result_type'],
+                        excepted_result=form.cleaned_data['excepted_result']
+                    )
+                    case_step.save()
 
                 messages.success(request, "接口管理记录添加成功！")
                 return redirect('api_auto:api_management')
@@ -435,7 +701,11 @@ def api_management_edit(request, case_step_id):
         form = ApiManagementForm(request.POST, instance=case_step)
         if form.is_valid():
             try:
-                form.save()
+                case_step = form.save(commit=False)
+                # 页面编辑后与导入时的Excel行不再一致，清空行指纹使下次导入重新写入
+                case_step.row_fingerprint = None
+                with track_step_changes(CaseStepInfo.objects.filter(pk=case_step.pk)):
+                    case_step.save()
                 messages.success(request, "接口管理记录更新成功！")
                 return redirect('api_auto:api_management')
             except Exception as e:
@@ -469,12 +739,14 @@ def api_management_delete(request, case_step_id):
     """删除接口管理记录"""
     case_step = get_object_or_404(CaseStepInfo, case_step_info_id=case_step_id)
     try:
-        # 删除关联的API信息和用例信息
-        if case_step.api:
-            case_step.api.delete()
-        if case_step.case_info:
-            case_step.case_info.delete()
-        case_step.delete()
+        # 删除接口时级联删除引用该接口的全部步骤，统计表按删除前后的步骤增量更新
+        with track_step_changes(CaseStepInfo.objects.filter(Q(pk=case_step.pk) | Q(api_id=case_step.api_id))):
+            # 删除关联的API信息和用例信息
+            if case_step.api:
+                case_step.api.delete()
+            if case_step.case_info:
+                case_step.case_info.delete()
+            case_step.delete()
         messages.success(request, "接口管理记录删除成功！")
     except Exception as e:
         messages.error(request, f"删除失败：{str(e)}")
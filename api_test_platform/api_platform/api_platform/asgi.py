@@ -5,6 +5,9 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
+
+执行进度推送（Server-Sent Events）的长连接需要以ASGI方式部署，例如：
+    uvicorn api_platform.asgi:application --host 0.0.0.0 --port 8000
 """
 
 import os
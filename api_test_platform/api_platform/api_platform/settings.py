@@ -22,6 +22,7 @@ if framework_root_dir not in sys.path:
     sys.path.append(framework_root_dir)
 
 from common.config import CONFIG
+from django.core.exceptions import ImproperlyConfigured
 from pathlib import Path
 
 # 项目根路径
@@ -30,6 +31,24 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 FRAMEWORK_DIR = BASE_DIR.parent
 # 3. 关键：添加PYTHON_EXECUTABLE配置（获取当前虚拟环境的Python可执行文件路径）
 PYTHON_EXECUTABLE = sys.executable  # 自动获取虚拟环境的python.exe路径
+# 后台任务：Web请求只写入排队中的任务记录，由python manage.py run_job_worker启动的工作进程领取执行
+# 工作进程数即用例执行任务的最大并发数（与Web进程数无关）
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+# 工作进程无任务时的轮询间隔（秒）、执行中任务的心跳间隔（秒）、心跳超时秒数（超时的执行中任务记为失败）
+JOB_POLL_INTERVAL = 2
+JOB_HEARTBEAT_INTERVAL = 30
+JOB_STALE_TIMEOUT = 300
+# 执行结果批量回写：累计条数或间隔毫秒数任一达到即刷新
+RESULT_FLUSH_SIZE = 100
+RESULT_FLUSH_INTERVAL_MS = 1000
+# 仪表盘统计缓存秒数：本进程写入执行结果时主动失效，后台任务进程的写入在过期后生效
+DASHBOARD_STATS_TTL = 60
+# 仪表盘失败用例每页条数
+DASHBOARD_FAILED_PAGE_SIZE = 20
+# 执行进度推送：事件保留秒数、事件流检查间隔（秒）、无事件时的保活间隔（秒）
+PROGRESS_EVENT_TTL = 3600
+PROGRESS_STREAM_INTERVAL = 0.5
+PROGRESS_KEEPALIVE_SECONDS = 15
 
 
 # Quick-start development settings - unsuitable for production
@@ -115,6 +134,33 @@ DATABASES = {
 }
 
 
+# 缓存：后端由config.ini [cache]配置（默认框架根目录下的文件缓存）；执行进度推送和页面缓存在多进程部署时需要file或redis后端
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'api_platform'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', 'cache'),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+if CONFIG['CACHE_BACKEND'] not in CACHE_BACKENDS:
+    raise ImproperlyConfigured(f"不支持的缓存后端: {CONFIG['CACHE_BACKEND']}，可选: {', '.join(CACHE_BACKENDS)}")
+if CONFIG['CACHE_BACKEND'] == 'redis':
+    try:
+        import redis  # noqa: F401
+    except ImportError:
+        raise ImproperlyConfigured("缓存后端为redis时需要安装redis库（pip install redis）")
+cache_backend, cache_location = CACHE_BACKENDS[CONFIG['CACHE_BACKEND']]
+cache_location = CONFIG['CACHE_LOCATION'] or cache_location
+if CONFIG['CACHE_BACKEND'] == 'file':
+    cache_location = str(FRAMEWORK_DIR / cache_location)  # 绝对路径时保持不变
+CACHES = {
+    'default': {
+        'BACKEND': cache_backend,
+        'LOCATION': cache_location,
+        'TIMEOUT': CONFIG['CACHE_TIMEOUT'],
+        'KEY_PREFIX': 'api_platform',
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
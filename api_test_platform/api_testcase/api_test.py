@@ -3,6 +3,8 @@ import unittest
 import logging
 from common.testdata_utils import TestdataUtils
 from common.requests_utils import RequestsUtils
+from common.run_history import RunHistoryRecorder
+from common.variable_store import case_role
 from common.log_utils import logger
 
 class APITestBase(unittest.TestCase):
@@ -14,14 +16,19 @@ class APITestBase(unittest.TestCase):
     def tearDown(self):
         logger.info(f"测试用例执行结束: {self._testMethodName}")
 
+# 执行顺序：前置用例 -> 普通用例 -> 后置用例
+ROLE_ORDER = {'setup': 0, None: 1, 'teardown': 2}
+
+
 def generate_test_suite(case_infos):
-    """生成测试套件"""
+    """生成测试套件（前置用例排在最前，后置用例排在最后，其他用例保持原顺序）"""
     test_suite = unittest.TestSuite()
 
     if not case_infos:
         logger.warning("未提供任何用例信息")
         return test_suite
 
+    case_infos = sorted(case_infos, key=lambda case: ROLE_ORDER[case_role(case.get('case_info'))])
     for case in case_infos:
         if not validate_case_data(case):
             logger.error(f"用例数据验证失败: {case.get('case_id', 'unknown')}")
@@ -63,6 +70,8 @@ class APITest(APITestBase):
         super().__init__(methodName)
         self.case_id = case_id
         self.case_info = case_info
+        self.step_records = []
+        self.scope_role = case_role(case_info)
         self._init_test_metadata()
         # 动态添加测试方法
         setattr(self.__class__, self._testMethodName, lambda x: x._execute_test_case())
@@ -88,7 +97,11 @@ class APITest(APITestBase):
 
     def _execute_test_case(self):
         """实际执行测试用例"""
-        result = RequestsUtils().request_by_step(self.case_info)
+        requests_utils = RequestsUtils()
+        result = requests_utils.request_by_step(self.case_info)
+        # 步骤执行记录上报到当前执行批次（未开启记录时忽略）
+        self.step_records = requests_utils.step_records
+        RunHistoryRecorder.record_active(self.step_records)
         self.assertTrue(
             result.get('check_result', False),
             result.get('message', '测试用例失败')
@@ -569,12 +569,13 @@ function html_escape(s) {
 </script>
 %(heading)s
 %(report)s
+%(latency)s
 %(ending)s
 
 </body>
 </html>
 """
-    # variables: (title, generator, stylesheet, heading, report, ending)
+    # variables: (title, generator, stylesheet, heading, report, latency, ending)
 
     # ------------------------------------------------------------------------
     # Stylesheet
@@ -814,6 +815,46 @@ table       { font-size: 100%; }
 %(id)s: %(output)s
 """  # variables: (id, output)
 
+    # ------------------------------------------------------------------------
+    # Latency
+    #
+    # 按接口统计请求耗时分位数和吞吐量（耗时单位ms）
+    LATENCY_TMPL = """
+<h4 style="font-family: Microsoft YaHei">接口耗时统计</h4>
+<table id='latency_table' class="table table-condensed table-bordered table-hover">
+<tr class="text-center success" style="font-weight: bold;font-size: 14px;">
+    <td>接口名称</td>
+    <td>请求数</td>
+    <td>失败数</td>
+    <td>平均(ms)</td>
+    <td>P50(ms)</td>
+    <td>P90(ms)</td>
+    <td>P99(ms)</td>
+    <td>最大(ms)</td>
+    <td>首字节P90(ms)</td>
+    <td>吞吐量(次/秒)</td>
+    <td>请求/响应流量(字节)</td>
+</tr>
+%(latency_list)s
+</table>
+"""  # variables: (latency_list)
+
+    LATENCY_ROW_TMPL = """
+<tr class="text-center">
+    <td class="text-left">%(api_name)s</td>
+    <td>%(count)s</td>
+    <td>%(errors)s</td>
+    <td>%(avg)s</td>
+    <td>%(p50)s</td>
+    <td>%(p90)s</td>
+    <td>%(p99)s</td>
+    <td>%(max)s</td>
+    <td>%(ttfb_p90)s</td>
+    <td>%(throughput)s</td>
+    <td>%(request_bytes)s / %(response_bytes)s</td>
+</tr>
+"""  # variables: (api_name, count, errors, avg, p50, p90, p99, max, ttfb_p90, throughput, request_bytes, response_bytes)
+
     # ------------------------------------------------------------------------
     # ENDING
     #
@@ -946,15 +987,86 @@ class _TestResult(TestResult):
         # 添加收集失败用例名字 -- Gelomen
         self.failCase += "<li>" + str(test) + "</li>"
 
+    # 汇总在工作线程/进程中已执行完成的用例结果，供并发执行模式合并使用
+    def addOutcome(self, test, code, output, trace, use_time):
+        self.testsRun += 1
+        self.result.append((code, test, output, trace, use_time))
+        if code == 0:
+            self.success_count += 1
+            flag = '  S  '
+        elif code == 1:
+            self.failure_count += 1
+            self.failures.append((test, trace))
+            self.failCase += "<li>" + str(test) + "</li>"
+            flag = '  F  '
+        else:
+            self.error_count += 1
+            self.errors.append((test, trace))
+            self.errorCase += "<li>" + str(test) + "</li>"
+            flag = '  E  '
+        sys.stderr.write(flag)
+        if self.verbosity > 1:
+            sys.stderr.write(str(test))
+        sys.stderr.write('\n')
+
+
+# 流式结果：用例完成后立即交给报告写入器写入文件，只保留计数，不保存用例结果和失败/错误堆栈
+class _StreamingTestResult(_TestResult):
+
+    def __init__(self, writer, verbosity=1):
+        _TestResult.__init__(self, verbosity)
+        self.writer = writer
+
+    def _add_result(self, code, test, output, trace, use_time):
+        self.writer.write_test(code, test, output, trace, use_time)
+        sys.stderr.write(('  S  ', '  F  ', '  E  ')[code])
+        if self.verbosity > 1:
+            sys.stderr.write(str(test))
+        sys.stderr.write('\n')
+
+    def _use_time(self):
+        return round(self.test_end_time - self.test_start_time, 2)
+
+    def addSuccess(self, test):
+        self.success_count += 1
+        output = self.complete_output()
+        self._add_result(0, test, output, '', self._use_time())
+
+    def addError(self, test, err):
+        self.error_count += 1
+        output = self.complete_output()
+        self._add_result(2, test, output, self._exc_info_to_string(err, test), self._use_time())
+
+    def addFailure(self, test, err):
+        self.failure_count += 1
+        output = self.complete_output()
+        self._add_result(1, test, output, self._exc_info_to_string(err, test), self._use_time())
+
+    def addOutcome(self, test, code, output, trace, use_time):
+        self.testsRun += 1
+        if code == 0:
+            self.success_count += 1
+        elif code == 1:
+            self.failure_count += 1
+        else:
+            self.error_count += 1
+        self._add_result(code, test, output, trace, use_time)
+
+    def wasSuccessful(self):
+        return self.failure_count == 0 and self.error_count == 0
+
 
 # 新增 need_screenshot 参数，-1为无需截图，否则需要截图  -- Gelomen
 class HTMLTestRunner(Template_mixin):
     """
     """
 
-    def __init__(self, stream=sys.stdout, verbosity=2, title=None, description=None, tester=None):
+    def __init__(self, stream=sys.stdout, verbosity=2, title=None, description=None, tester=None,
+                 latency_stats=None):
         self.need_screenshot = 0
         self.stream = stream
+        # 接口耗时统计（common.latency_stats.LatencyStats），为空时报告不展示耗时统计
+        self.latency_stats = latency_stats
         self.verbosity = verbosity
         if title is None:
             self.title = self.DEFAULT_TITLE
@@ -1052,6 +1164,7 @@ class HTMLTestRunner(Template_mixin):
 
         heading = self._generate_heading(report_attrs)
         report = self._generate_report(result)["report"]
+        latency = self._generate_latency()
         ending = self._generate_ending()
         output = self.HTML_TMPL % dict(
             title=saxutils.escape(self.title),
@@ -1062,6 +1175,7 @@ class HTMLTestRunner(Template_mixin):
             error=error,
             heading=heading,
             report=report,
+            latency=latency,
             ending=ending,
         )
         self.stream.write(output.encode('utf8'))
@@ -1256,10 +1370,176 @@ class HTMLTestRunner(Template_mixin):
         if not has_output:
             return
 
+    def _generate_latency(self):
+        if self.latency_stats is None:
+            return ''
+        duration = (self.stopTime - self.startTime).total_seconds()
+        rows = []
+        for row in self.latency_stats.summary(duration):
+            values = {key: ('-' if value is None else value) for key, value in row.items()}
+            values['api_name'] = saxutils.escape(str(row['api_name']))
+            rows.append(self.LATENCY_ROW_TMPL % values)
+        if not rows:
+            return ''
+        return self.LATENCY_TMPL % dict(latency_list=''.join(rows))
+
     def _generate_ending(self):
         return self.ENDING_TMPL
 
 
+# 流式报告：开始执行时写入页头，每条用例完成后追加一行并刷新到磁盘，结束时写入汇总
+# 内存只保留按测试类的计数，执行中断时文件中保留已完成用例的部分报告
+class StreamingHTMLTestRunner(HTMLTestRunner):
+
+    # 执行中的占位标题，正常结束时替换为完整汇总
+    STREAM_STATUS = '执行中（报告未正常结束时为已完成用例的部分结果）'
+
+    # 统计按钮、饼图和失败/错误合集由页面根据已写入的用例行计算，部分报告同样可用
+    STREAM_SCRIPT_TMPL = r"""
+<script language="javascript" type="text/javascript">
+    $(function(){
+        var Pass = $("tr[id^='pt']").length, fail = $("tr[id^='ft']").length, error = $("tr[id^='et']").length;
+        var count = Pass + fail + error;
+        var passrate = count ? (Pass * 100 / count).toFixed(2) + '%' : '0.00%';
+        var buttons = $('#show_detail_line a');
+        buttons.eq(0).text('概要{ ' + passrate + ' }');
+        buttons.eq(1).text('失败{ ' + fail + ' }');
+        buttons.eq(2).text('通过{ ' + Pass + ' }');
+        buttons.eq(3).text('错误{ ' + error + ' }');
+        buttons.eq(4).text('所有{ ' + count + ' }');
+        $("tr[id^='ft'] div.testcase").each(function () {
+            $('#failCaseOl').append($('<li>').text($(this).text()));
+        });
+        $("tr[id^='et'] div.testcase").each(function () {
+            $('#errorCaseOl').append($('<li>').text($(this).text()));
+        });
+    });
+</script>
+"""
+
+    # 汇总写在文件末尾，页面加载时移动到原位置（类汇总行移动到该类第一条用例之前）
+    STREAM_SUMMARY_TMPL = r"""
+<div id='report_summary'>
+%(heading)s
+</div>
+<table style="display: none;"><tbody id='class_rows'>
+%(class_rows)s
+</tbody></table>
+<script language="javascript" type="text/javascript">
+    $('#report_heading').replaceWith($('#report_summary'));
+    $('#class_rows tr').each(function () {
+        var cid = $(this).find('a.detail').attr('id').substr(1);
+        var first = $("tr[id='pt" + cid + "_1'], tr[id='ft" + cid + "_1'], tr[id='et" + cid + "_1']");
+        $(this).insertBefore(first);
+    });
+</script>
+"""  # variables: (heading, class_rows)
+
+    def __init__(self, stream=sys.stdout, verbosity=2, title=None, description=None, tester=None,
+                 latency_stats=None):
+        HTMLTestRunner.__init__(self, stream, verbosity, title, description, tester, latency_stats)
+        # 测试类 -> [cid, 用例数, 通过, 失败, 错误, 耗时]
+        self.class_stats = {}
+
+    def run(self, test, callback=None):
+        "Run the given test case or test suite, writing each result to the report as it completes."
+        result = _StreamingTestResult(self, self.verbosity)
+        self.start_report()
+        try:
+            test(result)
+        finally:
+            self.stopTime = datetime.datetime.now()
+            self.finish_report(result)
+        print("\n\033[36;0m--------------------- 测试结束 ---------------------\n"
+              "------------- 合计耗时: %s -------------\033[0m" % (self.stopTime - self.startTime), file=sys.stderr)
+        return result
+
+    def _write(self, content):
+        self.stream.write(content.encode('utf8'))
+        self.stream.flush()
+
+    def start_report(self):
+        """写入页头、占位标题和结果表头"""
+        html_head = self.HTML_TMPL[:self.HTML_TMPL.index('%(heading)s')]
+        counts = dict(Pass="$(\"tr[id^='pt']\").length",
+                      fail="$(\"tr[id^='ft']\").length",
+                      error="$(\"tr[id^='et']\").length")
+        parameters = ''.join(self.HEADING_ATTRIBUTE_TMPL % dict(name=name, value=saxutils.escape(value)) for name, value in [
+            ('测试人员', self.tester),
+            ('开始时间', str(self.startTime)[:19]),
+            ('测试结果', self.STREAM_STATUS),
+        ])
+        heading = self.HEADING_TMPL % dict(
+            title=saxutils.escape(self.title),
+            parameters=parameters,
+            description=saxutils.escape(self.description),
+        )
+        report_head = self.REPORT_TMPL[:self.REPORT_TMPL.index('%(test_list)s')] % dict(
+            passrate='-', Pass='-', fail='-', error='-', count='-'
+        )
+        self._write(
+            html_head % dict(title=saxutils.escape(self.title), generator='HTMLTestRunner %s' % __version__,
+                             stylesheet=self._generate_stylesheet(), **counts)
+            + self.STREAM_SCRIPT_TMPL
+            + "<div id='report_heading'>" + heading + "</div>\n"
+            + report_head
+        )
+
+    def write_test(self, code, test, output, trace, use_time):
+        """追加一条用例结果行（由_StreamingTestResult在用例完成时调用）"""
+        stats = self.class_stats.setdefault(test.__class__, [len(self.class_stats), 0, 0, 0, 0, 0])
+        stats[1] += 1
+        stats[2 + code] += 1
+        stats[5] += use_time
+        rows = []
+        self._generate_report_test(rows, stats[0], stats[1] - 1, code, test, output, trace)
+        self._write(''.join(rows))
+
+    def getReportAttributes(self, result):
+        # 失败/错误合集不在内存中拼接，由页面脚本根据用例行生成
+        report_attrs = HTMLTestRunner.getReportAttributes(self, result)
+        collections = {'失败用例合集': result.failure_count, '错误用例合集': result.error_count}
+        return [(name, '' if collections.get(name) else value) for name, value in report_attrs]
+
+    def finish_report(self, result):
+        """写入总计行、汇总标题、类汇总行、耗时统计和页尾"""
+        report_attrs = self.getReportAttributes(result)
+        class_rows = []
+        sum_ns = 0
+        for cls, (cid, count, np, nf, ne, ns) in self.class_stats.items():
+            ns = round(ns, 2)
+            sum_ns += ns
+            class_rows.append(self.REPORT_CLASS_TMPL % dict(
+                style=ne > 0 and 'errorClass' or nf > 0 and 'failClass' or 'passClass',
+                name=cls.__name__,
+                doc=cls.__doc__ and cls.__doc__.split("\n")[0] or "",
+                count=count,
+                Pass=np,
+                fail=nf,
+                error=ne,
+                cid='c%s' % (cid + 1),
+                time_usage=str(ns) + "秒"
+            ))
+        report_tail = self.REPORT_TMPL[self.REPORT_TMPL.index('%(test_list)s') + len('%(test_list)s'):] % dict(
+            count=str(result.success_count + result.failure_count + result.error_count),
+            Pass=str(result.success_count),
+            fail=str(result.failure_count),
+            error=str(result.error_count),
+            time_usage=str(round(sum_ns, 2)) + "秒",
+            passrate=self.passrate,
+        )
+        html_tail = self.HTML_TMPL[self.HTML_TMPL.index('%(heading)s'):] % dict(
+            heading=self.STREAM_SUMMARY_TMPL % dict(
+                heading=self._generate_heading(report_attrs),
+                class_rows=''.join(class_rows),
+            ),
+            report='',
+            latency=self._generate_latency(),
+            ending=self._generate_ending(),
+        )
+        self._write(report_tail + html_tail)
+
+
 # 集成创建文件夹、保存截图、获得截图名字等方法，与HTMLTestReportCN交互从而实现嵌入截图  -- Gelomen
 class ReportDirectory(object):
 
@@ -0,0 +1,216 @@
+import os
+import asyncio
+import threading
+from urllib.parse import urlsplit
+from common import config
+from common.check_utils import CheckUtils
+from common.requests_utils import RequestsUtils
+from common.run_history import utc_now
+from common.session_pool import SessionPool
+from common.latency_stats import RequestTrace, current_trace
+from common.step_compiler import compile_step
+from common.variable_store import RunVariables
+from common.log_utils import logger
+
+try:
+    import httpx
+except ImportError:
+    logger.warning("httpx库未安装，异步请求引擎不可用，回退为requests同步请求")
+    httpx = None
+
+
+class _SharedTransport(httpx.AsyncBaseTransport if httpx is not None else object):
+    """用例链客户端的传输层：按请求主机分发到引擎共享的连接池（含跨主机重定向），客户端关闭时不关闭共享连接池"""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def handle_async_request(self, request):
+        transport = self.engine._get_transport(str(request.url))
+        return await transport.handle_async_request(request)
+
+    async def aclose(self):
+        pass
+
+
+class AsyncRequestsUtils(RequestsUtils):
+    """异步请求引擎：在同一个事件循环上并发执行多条用例链（步骤字典格式与RequestsUtils一致）"""
+
+    # 进程级共享引擎及其后台事件循环（同步调用方通过run_sync提交协程）
+    _shared = None
+    _shared_pid = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_concurrency=None, per_host_limit=None):
+        # 请求通过httpx发送，只复用请求设置，不创建requests会话
+        self._init_settings()
+        self.max_concurrency = max_concurrency or config.ASYNC_MAX_CONCURRENCY
+        self.per_host_limit = per_host_limit or config.ASYNC_PER_HOST_LIMIT
+        self._transports = {}
+        self._semaphore = None
+        self._host_semaphores = {}
+        self._loop = None
+        logger.debug(f"异步请求引擎并发上限: 全局{self.max_concurrency}，单主机{self.per_host_limit}")
+
+    @classmethod
+    def shared(cls):
+        """获取进程级共享引擎（fork出的子进程会重新创建，避免复用父进程的事件循环线程）"""
+        with cls._shared_lock:
+            if cls._shared is None or cls._shared_pid != os.getpid():
+                engine = cls()
+                engine._start_loop()
+                cls._shared = engine
+                cls._shared_pid = os.getpid()
+            return cls._shared
+
+    def _start_loop(self):
+        """在守护线程中启动事件循环，供同步调用方提交协程"""
+        self._loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=self._loop.run_forever, name='AsyncRequestsLoop', daemon=True)
+        thread.start()
+
+    def run_sync(self, coro):
+        """同步等待协程执行完成（未启动后台事件循环时直接asyncio.run）"""
+        if self._loop is None:
+            return asyncio.run(coro)
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _get_transport(self, url):
+        """按主机获取共享连接池（事件循环内所有用例链复用）"""
+        host_key = SessionPool.get_host_key(url)
+        if host_key not in self._transports:
+            self._transports[host_key] = SessionPool.new_async_transport()
+        return self._transports[host_key]
+
+    def _get_semaphore(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _get_host_semaphore(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+
+    def client(self):
+        """
+        创建用例链的请求客户端，调用方以async with使用，用例链的所有步骤复用同一个客户端，结束时关闭
+        Cookie保存在客户端自己的CookieJar中（用例链之间隔离），连接复用引擎按主机共享的连接池（关闭引擎时统一关闭）
+        跟随重定向，重定向过程中各跳响应的Set-Cookie与requests.Session一致写回客户端
+        """
+        return httpx.AsyncClient(
+            transport=_SharedTransport(self),
+            timeout=httpx.Timeout(self.timeout),
+            follow_redirects=True,
+            trust_env=False
+        )
+
+    async def _send(self, client, method, url, **kwargs):
+        """
+        发送请求（同时受全局并发上限和单主机并发上限约束）
+        返回 (响应, 各阶段耗时)，计时从获取到并发许可后开始，不含排队等待时间，包含重定向跳转
+        """
+        trace = RequestTrace()
+        request = client.build_request(method, url, extensions={'trace': trace.async_callback}, **kwargs)
+        async with self._get_semaphore(), self._get_host_semaphore(url):
+            token = current_trace.set(trace)
+            try:
+                trace.start()
+                response = await client.send(request)
+                trace.finish()
+            finally:
+                current_trace.reset(token)
+        return response, trace.timings()
+
+    async def request(self, step_info, temp_variables=None, client=None):
+        """执行单个请求步骤：变量替换 -> 发送请求 -> 变量提取 -> 结果断言（未传入用例链客户端时单独创建）"""
+        if client is None:
+            async with self.client() as client:
+                return await self.request(step_info, temp_variables, client)
+        temp_variables = self.temp_variables if temp_variables is None else temp_variables
+        try:
+            plan = compile_step(step_info)
+            request_type = plan.request_type
+            logger.info(f"开始处理请求步骤: {step_info['测试用例步骤']}, 方式: {request_type}")
+
+            if request_type == 'GET':
+                url = self.host1 + plan.url_path
+                kwargs = {'params': plan.url_params.render(temp_variables)}
+            elif request_type == 'POST':
+                url = self.host + plan.url_path
+                kwargs = {
+                    'headers': self.headers,
+                    'params': plan.url_params.render(temp_variables),
+                    'json': plan.post_data.render(temp_variables)
+                }
+            else:
+                err_msg = f"不支持的请求方式: {request_type}"
+                logger.error(err_msg)
+                return {'code': 1, 'result': err_msg, 'check_result': False, 'message': err_msg}
+
+            logger.debug(f"发送{request_type}请求: {url}, 参数: {kwargs}")
+            response, timings = await self._send(client, request_type, url, **kwargs)
+            logger.debug(f"{request_type}响应状态码: {response.status_code}, 响应内容: {response.text[:500]}")
+
+            metrics = self._response_metrics(response, timings, response.request.content)
+            self._extract_variable(step_info, response, temp_variables, plan)
+            result = CheckUtils(response, metrics).run_check(
+                check_type=plan.check_type,
+                check_data=plan.check_data
+            )
+            result.update(metrics)
+            logger.info(f"请求步骤处理完成: {step_info['测试用例步骤']}, 结果: {result.get('code')}")
+            return result
+
+        except (httpx.ConnectError, httpx.TimeoutException):
+            err_msg = f"[{step_info['接口名称']}]请求连接超时"
+            logger.error(err_msg, exc_info=True)
+            return {'code': 4, 'result': err_msg, 'check_result': False, 'message': err_msg}
+        except httpx.HTTPError as e:
+            err_msg = f"[{step_info['接口名称']}]Request异常: {str(e)}"
+            logger.error(err_msg, exc_info=True)
+            return {'code': 4, 'result': err_msg, 'check_result': False, 'message': err_msg}
+        except Exception as e:
+            err_msg = f"用例[{step_info['测试用例编号']}]步骤[{step_info['测试用例步骤']}]异常: {str(e)}"
+            logger.error(err_msg, exc_info=True)
+            return {'code': 4, 'result': err_msg, 'check_result': False, 'message': err_msg}
+
+    async def request_by_step(self, step_infos, temp_variables=None, step_records=None):
+        """按顺序执行一条用例链的所有步骤，用例级变量仅在本条用例链内传递（step_records不为空时追加各步骤执行记录）"""
+        temp_variables = RunVariables.scope_for(step_infos) if temp_variables is None else temp_variables
+        final_result = {'code': 0, 'result': '所有步骤执行完成', 'check_result': True, 'message': ''}
+
+        async with self.client() as client:
+            for step_info in step_infos:
+                started_at = utc_now()
+                temp_result = await self.request(step_info, temp_variables, client)
+                if step_records is not None:
+                    step_records.append(self._build_step_record(step_info, temp_result, started_at))
+                if temp_result['code'] != 0:
+                    final_result = temp_result
+                    logger.error(f"步骤{step_info['测试用例步骤']}执行失败，终止后续步骤")
+                    break
+
+        return final_result
+
+    async def run_cases(self, case_list):
+        """在同一事件循环上并发执行多条用例链，返回结果顺序与case_list一致"""
+        return await asyncio.gather(*[self.request_by_step(case['case_info']) for case in case_list])
+
+    async def close(self):
+        for transport in self._transports.values():
+            await transport.aclose()
+        self._transports.clear()
+
+
+if __name__ == "__main__":
+    test_cases = [
+        {'case_id': 'case_01', 'case_info': [
+            {'测试用例编号': 'case_01', '测试用例名称': '登录失败接口', '用例执行': '是', '测试用例步骤': 'step1',
+             '接口名称': '登录失败接口', '请求方式': 'POST', '请求地址': '/api/login',
+             '请求参数(get)': '', '提交数据(post)': '{"email": "123123"}', '取值方式': '', '传值变量': '',
+             '取值代码': '', '期望结果类型': 'json键是否存在', '期望结果': 'error'}]}
+    ]
+    engine = AsyncRequestsUtils.shared()
+    logger.info(f"测试结果: {engine.run_sync(engine.run_cases(test_cases))}")
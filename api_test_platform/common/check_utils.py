@@ -1,18 +1,212 @@
 import ast
 import re
+import json
+import jsonpath
+from collections import namedtuple
+from functools import lru_cache
 from common.log_utils import logger
 
+try:
+    import jsonschema
+except ImportError:
+    logger.warning("jsonschema库未安装，json schema校验断言不可用")
+    jsonschema = None
+
+# 断言结果中保留的响应体长度（完整响应体不随结果复制）
+RESULT_BODY_LIMIT = 2000
+
+# 简单JSONPath（$.a.b[0]['c']）按路径逐级取值，其他表达式（通配符、过滤、递归）交给jsonpath库
+SIMPLE_PATH_PATTERN = re.compile(r"^\$((\.\w+)|(\[\d+\])|(\['[^']+'\]))*$")
+PATH_TOKEN_PATTERN = re.compile(r"\.(\w+)|\[(\d+)\]|\['([^']+)'\]")
+
+# 类型断言支持的类型名称
+TYPE_NAMES = {
+    'str': str, 'string': str,
+    'int': int, 'integer': int,
+    'float': float,
+    'number': (int, float),
+    'bool': bool, 'boolean': bool,
+    'list': list, 'array': list,
+    'dict': dict, 'object': dict,
+    'null': type(None),
+}
+
+_MISSING = object()
+
+# 多重断言：assertions为 ((断言类型, 断言数据), ...)，short_circuit为True时遇到第一个失败即停止
+MultiCheck = namedtuple('MultiCheck', ['assertions', 'short_circuit'])
+
+# 多重断言类型名称
+MULTI_CHECK_TYPE = '多重断言'
+
+# 性能断言类型 -> (指标字段, 单位)，指标由RequestsUtils采集后传入CheckUtils
+SLA_CHECK_TYPES = {
+    '最大响应时间': ('response_time', 'ms'),
+    '最大首字节时间': ('ttfb', 'ms'),
+    '最大响应大小': ('response_size', '字节'),
+}
+
+
+@lru_cache(maxsize=2000)
+def compile_path(expr):
+    """编译JSONPath：简单路径返回取值步骤元组，复杂表达式返回None（按表达式缓存）"""
+    if not SIMPLE_PATH_PATTERN.match(expr):
+        return None
+    steps = []
+    for key, index, quoted_key in PATH_TOKEN_PATTERN.findall(expr):
+        steps.append(int(index) if index else (key or quoted_key))
+    return tuple(steps)
+
+
+def find_path(data, expr):
+    """按JSONPath取值，返回匹配值列表（未匹配返回空列表）"""
+    steps = compile_path(expr)
+    if steps is None:
+        return jsonpath.jsonpath(data, expr) or []
+    value = data
+    for step in steps:
+        try:
+            value = value[step]
+        except (KeyError, IndexError, TypeError):
+            return []
+    return [value]
+
+
+@lru_cache(maxsize=500)
+def _compile_schema(schema_text):
+    schema = json.loads(schema_text)
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
+
+
+def get_schema_validator(schema):
+    """获取编译后的JSON Schema校验器（按规范化后的schema文本缓存）"""
+    if jsonschema is None:
+        raise RuntimeError("jsonschema库未安装，无法执行json schema校验")
+    if not isinstance(schema, str):
+        schema = json.dumps(schema, sort_keys=True, ensure_ascii=False)
+    return _compile_schema(schema)
+
+
+def parse_check_data(check_data):
+    """解析结构化断言数据：优先按JSON解析（支持true/false/null），失败时按Python字面量解析"""
+    if not isinstance(check_data, str):
+        return check_data
+    try:
+        return json.loads(check_data)
+    except ValueError:
+        return ast.literal_eval(check_data)
+
+
+def parse_sla_limit(check_data):
+    """解析性能断言阈值（非负数字，如500或"1.5"）"""
+    if isinstance(check_data, bool):
+        raise ValueError(f"性能断言阈值必须为数字: {check_data}")
+    if isinstance(check_data, (int, float)):
+        limit = check_data
+    else:
+        try:
+            limit = float(str(check_data).strip())
+        except ValueError:
+            raise ValueError(f"性能断言阈值必须为数字: {check_data}")
+        limit = int(limit) if limit.is_integer() else limit
+    if limit < 0:
+        raise ValueError(f"性能断言阈值不能为负数: {check_data}")
+    return limit
+
+
+def parse_multi_check(check_data):
+    """
+    解析多重断言数据，支持两种格式：
+    [{"type": "状态码", "data": 200}, {"type": "json键是否存在", "data": "token"}]
+    {"short_circuit": true, "assertions": [...]}
+    """
+    if isinstance(check_data, MultiCheck):
+        return check_data
+    spec = parse_check_data(check_data)
+    short_circuit = False
+    if isinstance(spec, dict):
+        short_circuit = bool(spec.get('short_circuit', False))
+        spec = spec.get('assertions')
+    if not isinstance(spec, list) or not spec:
+        raise ValueError(f"多重断言数据必须为非空列表: {check_data}")
+    assertions = []
+    for item in spec:
+        if not isinstance(item, dict) or not item.get('type'):
+            raise ValueError(f"多重断言项缺少断言类型: {item}")
+        if item['type'] == MULTI_CHECK_TYPE:
+            raise ValueError("多重断言不支持嵌套")
+        assertions.append((item['type'], item.get('data')))
+    return MultiCheck(tuple(assertions), short_circuit)
+
+
+def _compare(actual, rules, path):
+    """按比较规则检查实际值，返回不匹配描述列表"""
+    if not isinstance(rules, dict):
+        rules = {'==': rules}
+    errors = []
+    for operator, expect in rules.items():
+        try:
+            if operator == '==':
+                passed = actual == expect
+            elif operator == '!=':
+                passed = actual != expect
+            elif operator == '>':
+                passed = actual > expect
+            elif operator == '>=':
+                passed = actual >= expect
+            elif operator == '<':
+                passed = actual < expect
+            elif operator == '<=':
+                passed = actual <= expect
+            elif operator == 'between':
+                passed = expect[0] <= actual <= expect[1]
+            elif operator == 'in':
+                passed = actual in expect
+            elif operator == 'contains':
+                passed = expect in actual
+            elif operator == 'regex':
+                passed = re.search(expect, str(actual)) is not None
+            elif operator == 'type':
+                if expect not in TYPE_NAMES:
+                    errors.append(f"{path}: 不支持的类型{expect}")
+                    continue
+                expect_type = TYPE_NAMES[expect]
+                # bool是int的子类，数值类型断言时排除布尔值
+                passed = isinstance(actual, expect_type) and not (
+                    isinstance(actual, bool) and expect not in ('bool', 'boolean'))
+            elif operator == 'len':
+                errors.extend(_compare(len(actual), expect, f"len({path})"))
+                continue
+            else:
+                errors.append(f"{path}: 不支持的比较方式{operator}")
+                continue
+        except TypeError as e:
+            errors.append(f"{path}: {operator} {expect} 无法比较（实际{actual!r}）: {str(e)}")
+            continue
+        if not passed:
+            errors.append(f"{path}: 期望{operator} {expect!r}, 实际{actual!r}")
+    return errors
+
 
 class CheckUtils():
-    def __init__(self, check_response=None):
+    def __init__(self, check_response=None, metrics=None):
         self.ck_response = check_response
+        # 请求耗时(ms)和响应大小(字节)，用于性能断言
+        self.metrics = metrics or {}
+        self._response_text = None
+        self._response_json = _MISSING
+        self._json_error = None
         # 初始化结果模板（补充check_result和message字段，与请求工具兼容）
+        # 响应体只保留截断后的文本，各断言结果浅拷贝模板，不重复复制完整响应
         self.base_result = {
             'code': 0 if check_response.status_code == 200 else 2,
-            'response_reason': self.ck_response.reason,
+            # requests响应为reason，httpx响应为reason_phrase
+            'response_reason': getattr(self.ck_response, 'reason', None) or getattr(self.ck_response, 'reason_phrase', ''),
             'response_code': self.ck_response.status_code,
             'response_headers': dict(self.ck_response.headers),  # 转为dict，避免对象序列化问题
-            'reponse_body': self.ck_response.text,
+            'reponse_body': self.response_text[:RESULT_BODY_LIMIT],
             'check_result': False,
             'message': ''
         }
@@ -22,8 +216,35 @@ class CheckUtils():
             'json键是否存在': self.check_key,
             'json键值对': self.check_key_value,
             '正则匹配': self.check_rerexp,
+            'json路径比较': self.check_path,
+            'json schema校验': self.check_schema,
+            '状态码': self.check_status,
+            '响应头': self.check_header,
+            '最大响应时间': self.check_max_response_time,
+            '最大首字节时间': self.check_max_ttfb,
+            '最大响应大小': self.check_max_response_size,
+            MULTI_CHECK_TYPE: self.check_multi,
         }
 
+    @property
+    def response_text(self):
+        """响应文本（只解码一次）"""
+        if self._response_text is None:
+            self._response_text = self.ck_response.text
+        return self._response_text
+
+    @property
+    def response_json(self):
+        """解析后的响应JSON（只解析一次，解析失败时每次访问抛出同样的ValueError）"""
+        if self._response_json is _MISSING and self._json_error is None:
+            try:
+                self._response_json = json.loads(self.response_text)
+            except ValueError as e:
+                self._json_error = e
+        if self._json_error is not None:
+            raise ValueError(str(self._json_error))
+        return self._response_json
+
     def no_check(self, check_data=None):
         """无断言：默认通过"""
         result = self.base_result.copy()
@@ -43,9 +264,13 @@ class CheckUtils():
 
         try:
             # 解析响应JSON
-            response_json = self.ck_response.json()
-            check_keys = [key.strip() for key in check_data.split(',')]
-            missing_keys = [key for key in check_keys if key not in response_json]
+            response_json = self.response_json
+            # 支持预编译的键列表（StepPlan）或逗号分隔的原文；$开头的键按JSONPath检查嵌套字段
+            if isinstance(check_data, (list, tuple)):
+                check_keys = list(check_data)
+            else:
+                check_keys = [key.strip() for key in check_data.split(',')]
+            missing_keys = [key for key in check_keys if not self._has_key(response_json, key)]
 
             if not missing_keys:
                 result['check_result'] = True
@@ -79,16 +304,17 @@ class CheckUtils():
 
         try:
             # 解析断言数据和响应JSON
-            expect_data = ast.literal_eval(check_data)
-            response_json = self.ck_response.json()
+            expect_data = check_data if isinstance(check_data, dict) else ast.literal_eval(check_data)
+            response_json = self.response_json
             mismatch_items = []
 
-            # 检查每个键值对
+            # 检查每个键值对（$开头的键按JSONPath取嵌套字段）
             for key, expect_val in expect_data.items():
-                if key not in response_json:
+                actual_val = self._get_value(response_json, key)
+                if actual_val is _MISSING:
                     mismatch_items.append(f"键{key}不存在")
-                elif response_json[key] != expect_val:
-                    mismatch_items.append(f"键{key}: 期望{expect_val}, 实际{response_json[key]}")
+                elif actual_val != expect_val:
+                    mismatch_items.append(f"键{key}: 期望{expect_val}, 实际{actual_val}")
 
             if not mismatch_items:
                 result['check_result'] = True
@@ -121,8 +347,8 @@ class CheckUtils():
             return result
 
         try:
-            pattern = re.compile(check_data)
-            match_result = re.findall(pattern, self.ck_response.text)
+            pattern = check_data if isinstance(check_data, re.Pattern) else re.compile(check_data)
+            match_result = re.findall(pattern, self.response_text)
 
             if match_result:
                 result['check_result'] = True
@@ -130,7 +356,7 @@ class CheckUtils():
                 logger.debug(result['message'])
             else:
                 result['code'] = 4
-                result['message'] = f"正则匹配失败，表达式: {check_data}, 响应内容: {self.ck_response.text[:200]}"
+                result['message'] = f"正则匹配失败，表达式: {pattern.pattern}, 响应内容: {self.response_text[:200]}"
                 logger.error(result['message'])
 
         except re.error as e:
@@ -145,6 +371,264 @@ class CheckUtils():
 
         return result
 
+    @staticmethod
+    def _get_value(response_json, key):
+        """取响应字段值：$开头按JSONPath取第一个匹配值，否则取顶层键（不存在返回_MISSING）"""
+        if key.startswith('$'):
+            values = find_path(response_json, key)
+            return values[0] if values else _MISSING
+        if isinstance(response_json, dict) and key in response_json:
+            return response_json[key]
+        return _MISSING
+
+    def _has_key(self, response_json, key):
+        return self._get_value(response_json, key) is not _MISSING
+
+    def check_path(self, check_data=None):
+        """
+        JSONPath比较断言，断言数据格式：{"$.data.total": {">=": 1}, "$.data.list": {"len": {"between": [1, 10]}},
+        "$.data.name": {"type": "str"}, "$.code": 0}；值不是字典时按相等比较，exists为false时检查字段不存在
+        """
+        result = self.base_result.copy()
+        if not check_data:
+            result['code'] = 4
+            result['message'] = '断言数据为空，无法执行JSONPath比较'
+            logger.error(result['message'])
+            return result
+
+        try:
+            rules = parse_check_data(check_data)
+            if not isinstance(rules, dict):
+                raise ValueError(f"断言数据必须为字典格式: {check_data}")
+            response_json = self.response_json
+            errors = []
+            for path, path_rules in rules.items():
+                path_rules = dict(path_rules) if isinstance(path_rules, dict) else {'==': path_rules}
+                should_exist = path_rules.pop('exists', True)
+                values = find_path(response_json, path) if path.startswith('$') else (
+                    [] if self._get_value(response_json, path) is _MISSING else [response_json[path]])
+                if not values:
+                    if should_exist:
+                        errors.append(f"{path}: 未匹配到字段")
+                    continue
+                if not should_exist:
+                    errors.append(f"{path}: 期望字段不存在, 实际{values[0]!r}")
+                    continue
+                errors.extend(_compare(values[0], path_rules, path))
+
+            if not errors:
+                result['check_result'] = True
+                result['message'] = f"JSONPath比较通过，共{len(rules)}个字段"
+                logger.debug(result['message'])
+            else:
+                result['code'] = 4
+                result['message'] = f"JSONPath比较失败: {';'.join(errors)}"
+                logger.error(result['message'])
+
+        except (ValueError, SyntaxError) as e:
+            result['code'] = 4
+            result['message'] = f"JSONPath比较失败：{str(e)}"
+            logger.error(result['message'])
+        except Exception as e:
+            result['code'] = 4
+            result['message'] = f"JSONPath比较异常: {str(e)}"
+            logger.error(result['message'], exc_info=True)
+
+        return result
+
+    def check_schema(self, check_data=None):
+        """JSON Schema校验（校验器按schema编译后缓存，多次执行不重复编译）"""
+        result = self.base_result.copy()
+        if not check_data:
+            result['code'] = 4
+            result['message'] = '断言数据为空，无法执行json schema校验'
+            logger.error(result['message'])
+            return result
+
+        try:
+            # 支持预编译的校验器（StepPlan）或schema原文
+            validator = check_data if hasattr(check_data, 'iter_errors') else get_schema_validator(parse_check_data(check_data))
+            errors = [f"{'/'.join(str(p) for p in error.absolute_path) or '$'}: {error.message}"
+                      for error in validator.iter_errors(self.response_json)]
+
+            if not errors:
+                result['check_result'] = True
+                result['message'] = 'json schema校验通过'
+                logger.debug(result['message'])
+            else:
+                result['code'] = 4
+                # 只展示前5个错误，避免信息过长
+                result['message'] = f"json schema校验失败({len(errors)}处): {';'.join(errors[:5])}"
+                logger.error(result['message'])
+
+        except (ValueError, SyntaxError) as e:
+            result['code'] = 4
+            result['message'] = f"json schema校验失败：{str(e)}"
+            logger.error(result['message'])
+        except Exception as e:
+            result['code'] = 4
+            result['message'] = f"json schema校验异常: {str(e)}"
+            logger.error(result['message'], exc_info=True)
+
+        return result
+
+    def check_status(self, check_data=None):
+        """状态码断言，断言数据为状态码（如201）或比较规则（如{"in": [200, 201]}），通过时不再按非200处理"""
+        result = self.base_result.copy()
+        if check_data in (None, ''):
+            result['code'] = 4
+            result['message'] = '断言数据为空，无法检查状态码'
+            logger.error(result['message'])
+            return result
+
+        try:
+            rules = parse_check_data(check_data)
+            errors = _compare(self.ck_response.status_code, rules, '状态码')
+            if not errors:
+                result['code'] = 0
+                result['check_result'] = True
+                result['message'] = f"状态码检查通过: {self.ck_response.status_code}"
+                logger.debug(result['message'])
+            else:
+                result['code'] = 4
+                result['message'] = f"状态码检查失败: {';'.join(errors)}"
+                logger.error(result['message'])
+
+        except (ValueError, SyntaxError) as e:
+            result['code'] = 4
+            result['message'] = f"状态码检查失败：{str(e)}"
+            logger.error(result['message'])
+
+        return result
+
+    def check_header(self, check_data=None):
+        """响应头断言（头名称不区分大小写），断言数据格式：{"Content-Type": {"contains": "json"}, "X-Trace-Id": {"exists": true}}"""
+        result = self.base_result.copy()
+        if not check_data:
+            result['code'] = 4
+            result['message'] = '断言数据为空，无法检查响应头'
+            logger.error(result['message'])
+            return result
+
+        try:
+            rules = parse_check_data(check_data)
+            if not isinstance(rules, dict):
+                raise ValueError(f"断言数据必须为字典格式: {check_data}")
+            headers = self.ck_response.headers
+            errors = []
+            for name, header_rules in rules.items():
+                header_rules = dict(header_rules) if isinstance(header_rules, dict) else {'==': header_rules}
+                should_exist = header_rules.pop('exists', True)
+                value = headers.get(name)
+                if value is None:
+                    if should_exist:
+                        errors.append(f"{name}: 响应头不存在")
+                    continue
+                if not should_exist:
+                    errors.append(f"{name}: 期望响应头不存在, 实际{value!r}")
+                    continue
+                errors.extend(_compare(value, header_rules, name))
+
+            if not errors:
+                result['check_result'] = True
+                result['message'] = f"响应头检查通过，共{len(rules)}个"
+                logger.debug(result['message'])
+            else:
+                result['code'] = 4
+                result['message'] = f"响应头检查失败: {';'.join(errors)}"
+                logger.error(result['message'])
+
+        except (ValueError, SyntaxError) as e:
+            result['code'] = 4
+            result['message'] = f"响应头检查失败：{str(e)}"
+            logger.error(result['message'])
+
+        return result
+
+    def _check_sla(self, check_type, check_data):
+        """性能断言：采集到的指标不超过阈值时通过，未采集到指标时判定失败"""
+        result = self.base_result.copy()
+        metric, unit = SLA_CHECK_TYPES[check_type]
+        try:
+            limit = parse_sla_limit(check_data)
+        except ValueError as e:
+            result['code'] = 4
+            result['message'] = f"{check_type}检查失败：{str(e)}"
+            logger.error(result['message'])
+            return result
+
+        actual = self.metrics.get(metric)
+        if actual is None:
+            result['code'] = 4
+            result['message'] = f"{check_type}检查失败：未采集到{metric}指标"
+            logger.error(result['message'])
+        elif actual <= limit:
+            result['check_result'] = True
+            result['message'] = f"{check_type}检查通过: {actual}{unit} <= {limit}{unit}"
+            logger.debug(result['message'])
+        else:
+            result['code'] = 4
+            result['message'] = f"{check_type}检查失败: 实际{actual}{unit}, 超过阈值{limit}{unit}"
+            logger.error(result['message'])
+        return result
+
+    def check_max_response_time(self, check_data=None):
+        """最大响应时间断言（ms，发送请求到读取完响应体）"""
+        return self._check_sla('最大响应时间', check_data)
+
+    def check_max_ttfb(self, check_data=None):
+        """最大首字节时间断言（ms）"""
+        return self._check_sla('最大首字节时间', check_data)
+
+    def check_max_response_size(self, check_data=None):
+        """最大响应大小断言（字节）"""
+        return self._check_sla('最大响应大小', check_data)
+
+    def check_multi(self, check_data=None):
+        """
+        多重断言：对同一响应依次执行多个断言（响应只解析一次），汇总所有失败信息；
+        short_circuit为True时遇到第一个失败即停止。各断言结果保存在assertions字段中
+        """
+        result = self.base_result.copy()
+        try:
+            multi_check = parse_multi_check(check_data)
+        except (ValueError, SyntaxError) as e:
+            result['code'] = 4
+            result['message'] = f"多重断言数据错误：{str(e)}"
+            logger.error(result['message'])
+            return result
+
+        details = []
+        failures = []
+        for check_type, data in multi_check.assertions:
+            if check_type in self.ck_rules:
+                sub_result = self.ck_rules[check_type](data)
+            else:
+                sub_result = {'check_result': False, 'message': f"不支持的断言类型: {check_type}"}
+            details.append({'type': check_type, 'check_result': sub_result['check_result'],
+                            'message': sub_result['message']})
+            if not sub_result['check_result']:
+                failures.append(f"[{check_type}] {sub_result['message']}")
+                if multi_check.short_circuit:
+                    break
+
+        result['assertions'] = details
+        total = len(multi_check.assertions)
+        if not failures:
+            # 包含状态码断言时，以断言结果为准，不再按非200处理
+            if any(check_type == '状态码' for check_type, _ in multi_check.assertions):
+                result['code'] = 0
+            result['check_result'] = True
+            result['message'] = f"多重断言通过，共{total}个断言"
+            logger.debug(result['message'])
+        else:
+            result['code'] = 4
+            skipped = total - len(details)
+            result['message'] = (f"多重断言失败({len(failures)}/{total}"
+                                 f"{f'，短路跳过{skipped}个' if skipped else ''}): {' | '.join(failures)}")
+            logger.error(result['message'])
+        return result
+
     def run_check(self, check_type=None, check_data=None):
         """执行断言（移除200状态码限制，支持所有状态码断言）"""
         logger.info(f"开始执行断言: 类型={check_type}, 数据={check_data}")
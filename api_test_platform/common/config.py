@@ -1,4 +1,5 @@
 import os
+import ast
 from common.config_utils import ConfigUtils
 # from common.log_utils import logger
 
@@ -44,6 +45,57 @@ def load_config(env='test_env'):
     config_dict['REPORT_PATH'] = get_abs_path('path', 'REPORT_PATH', 'tests_report/')
     config_dict['CASE_PATH'] = get_abs_path('path', 'CASE_PATH', 'api_testcase/')
 
+    # ------------------------------ 并发执行配置 ------------------------------
+    # 优先从环境变量读取，命令行参数（--workers/--pool）在run_case.py中再次覆盖
+    config_dict['RUN_WORKERS'] = int(os.getenv('RUN_WORKERS',
+                                               config_utils.read_int('run', 'WORKERS', default=1)
+                                               ))
+    config_dict['RUN_POOL_TYPE'] = os.getenv('RUN_POOL_TYPE',
+                                             config_utils.read_value('run', 'POOL_TYPE', default='thread')
+                                             )
+    # 异步请求引擎并发上限（全局/单主机）
+    config_dict['ASYNC_MAX_CONCURRENCY'] = config_utils.read_int('run', 'MAX_CONCURRENCY', default=100)
+    config_dict['ASYNC_PER_HOST_LIMIT'] = config_utils.read_int('run', 'PER_HOST_LIMIT', default=20)
+
+    # ------------------------------ HTTP连接池配置 ------------------------------
+    config_dict['HTTP_POOL_SIZE'] = config_utils.read_int('pool', 'POOL_SIZE', default=20)
+    config_dict['HTTP_KEEPALIVE'] = config_utils.read_int('pool', 'KEEPALIVE', default=30)
+    config_dict['HTTP2'] = config_utils.read_bool('pool', 'HTTP2', default=False)
+
+    # ------------------------------ 执行历史配置 ------------------------------
+    config_dict['HISTORY_KEEP_DAYS'] = config_utils.read_int('history', 'KEEP_DAYS', default=30)
+    config_dict['HISTORY_FLUSH_SIZE'] = config_utils.read_int('history', 'FLUSH_SIZE', default=200)
+    config_dict['HISTORY_PURGE_INTERVAL'] = config_utils.read_int('history', 'PURGE_INTERVAL', default=3600)
+
+    # ------------------------------ 压测模式配置 ------------------------------
+    config_dict['LOAD_CONCURRENCY'] = config_utils.read_int('load', 'CONCURRENCY', default=10)
+    config_dict['LOAD_DURATION'] = config_utils.read_int('load', 'DURATION', default=60)
+    config_dict['LOAD_WARMUP'] = config_utils.read_int('load', 'WARMUP', default=5)
+    config_dict['LOAD_RAMP_UP'] = config_utils.read_int('load', 'RAMP_UP', default=10)
+
+    # ------------------------------ 全局变量配置 ------------------------------
+    # 请求参数中通过${name}或${global.name}引用，值按Python字面量解析（如数字），解析失败时按字符串使用
+    global_variables = {}
+    for name, value in config_utils.read_section('variables').items():
+        try:
+            global_variables[name] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            global_variables[name] = value
+    config_dict['GLOBAL_VARIABLES'] = global_variables
+
+    # ------------------------------ Excel导入配置 ------------------------------
+    config_dict['IMPORT_CHUNK_SIZE'] = config_utils.read_int('import', 'CHUNK_SIZE', default=500)
+    config_dict['IMPORT_WORKERS'] = config_utils.read_int('import', 'WORKERS', default=4)
+
+    # ------------------------------ 缓存配置 ------------------------------
+    config_dict['CACHE_BACKEND'] = config_utils.read_value('cache', 'BACKEND', default='file')
+    config_dict['CACHE_LOCATION'] = config_utils.read_value('cache', 'LOCATION', default='')
+    config_dict['CACHE_TIMEOUT'] = config_utils.read_int('cache', 'TIMEOUT', default=300)
+
+    # ------------------------------ 变量作用域配置 ------------------------------
+    config_dict['SCOPE_SETUP_PREFIX'] = config_utils.read_value('scope', 'SETUP_PREFIX', default='setup')
+    config_dict['SCOPE_TEARDOWN_PREFIX'] = config_utils.read_value('scope', 'TEARDOWN_PREFIX', default='teardown')
+
     # ------------------------------ 日志配置 ------------------------------
     log_level_str = os.getenv('LOG_LEVEL', config_utils.read_value('log', 'LOG_LEVEL', default='20'))
     log_level_map = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40, 'CRITICAL': 50}
@@ -117,6 +169,44 @@ LOG_LEVEL = CONFIG['LOG_LEVEL']
 REPORT_PATH = CONFIG['REPORT_PATH']
 CASE_PATH = CONFIG['CASE_PATH']
 
+# 并发执行配置
+RUN_WORKERS = CONFIG['RUN_WORKERS']
+RUN_POOL_TYPE = CONFIG['RUN_POOL_TYPE']
+ASYNC_MAX_CONCURRENCY = CONFIG['ASYNC_MAX_CONCURRENCY']
+ASYNC_PER_HOST_LIMIT = CONFIG['ASYNC_PER_HOST_LIMIT']
+
+# HTTP连接池配置
+HTTP_POOL_SIZE = CONFIG['HTTP_POOL_SIZE']
+HTTP_KEEPALIVE = CONFIG['HTTP_KEEPALIVE']
+HTTP2 = CONFIG['HTTP2']
+
+# 执行历史配置
+HISTORY_KEEP_DAYS = CONFIG['HISTORY_KEEP_DAYS']
+HISTORY_FLUSH_SIZE = CONFIG['HISTORY_FLUSH_SIZE']
+HISTORY_PURGE_INTERVAL = CONFIG['HISTORY_PURGE_INTERVAL']
+
+# 压测模式配置
+LOAD_CONCURRENCY = CONFIG['LOAD_CONCURRENCY']
+LOAD_DURATION = CONFIG['LOAD_DURATION']
+LOAD_WARMUP = CONFIG['LOAD_WARMUP']
+LOAD_RAMP_UP = CONFIG['LOAD_RAMP_UP']
+
+# 全局变量
+GLOBAL_VARIABLES = CONFIG['GLOBAL_VARIABLES']
+
+# Excel导入配置
+IMPORT_CHUNK_SIZE = CONFIG['IMPORT_CHUNK_SIZE']
+IMPORT_WORKERS = CONFIG['IMPORT_WORKERS']
+
+# 缓存配置
+CACHE_BACKEND = CONFIG['CACHE_BACKEND']
+CACHE_LOCATION = CONFIG['CACHE_LOCATION']
+CACHE_TIMEOUT = CONFIG['CACHE_TIMEOUT']
+
+# 变量作用域配置
+SCOPE_SETUP_PREFIX = CONFIG['SCOPE_SETUP_PREFIX']
+SCOPE_TEARDOWN_PREFIX = CONFIG['SCOPE_TEARDOWN_PREFIX']
+
 # 邮件配置
 SMTP_SERVER = CONFIG['SMTP_SERVER']
 SMTP_PORT = CONFIG['SMTP_PORT']
@@ -4,6 +4,8 @@ import configparser
 class ConfigUtils():
     def __init__(self,config_path):
         self.cfg = configparser.ConfigParser()
+        # 保留键名大小写（全局变量名区分大小写）
+        self.cfg.optionxform = str
         self.cfg.read(config_path,encoding='utf-8')
 
 
@@ -31,3 +33,8 @@ class ConfigUtils():
             return default
         return value.lower() in ('true', '1', 'yes', 'on')
 
+    def read_section(self, section):
+        """读取整个section为字典，section不存在时返回空字典"""
+        if not self.cfg.has_section(section):
+            return {}
+        return dict(self.cfg.items(section))
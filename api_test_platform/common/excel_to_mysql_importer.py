@@ -1,5 +1,8 @@
+import json
 import uuid
+import hashlib
 from common.sql_utils import SqlUtils
+from common.check_utils import SLA_CHECK_TYPES, parse_sla_limit
 from common.config import CONFIG
 from common.log_utils import logger
 
@@ -26,6 +29,11 @@ class ExcelToMysqlImporter:
             "期望结果": [("case_step_info", "excepted_result")],
             "是否通过": [("case_step_info", "is_pass")]
         }
+        # 性能断言类型允许带单位填写，如"最大响应时间(ms)"
+        self.result_type_aliases = {f"{check_type}({unit})": check_type
+                                    for check_type, (_, unit) in SLA_CHECK_TYPES.items()}
+        # 参与行指纹计算的列（是否通过是执行结果，不算用例内容变化）
+        self.fingerprint_fields = [key for key in self.field_mapping if key != "是否通过"]
         logger.info("ExcelToMysqlImporter初始化完成，目标数据库：%s", self.target_db)
 
     def _generate_short_uuid(self, length=10):
@@ -37,6 +45,11 @@ class ExcelToMysqlImporter:
         else:
             return "否"
 
+    def row_fingerprint(self, excel_row):
+        """行指纹：用例内容列（去除首尾空白）的SHA256，再次导入时据此判断该行是否变化"""
+        content = [self._cell(excel_row, key) for key in self.fingerprint_fields]
+        return hashlib.sha256(json.dumps(content, ensure_ascii=False).encode("utf-8")).hexdigest()
+
     def _get_api_id_by_name(self, api_name):
         sql = """SELECT api_id FROM api_info WHERE api_name = %s LIMIT 1"""
         result = self.sql_utils.execute_query(sql, (api_name,))
@@ -47,9 +60,10 @@ class ExcelToMysqlImporter:
         result = self.sql_utils.execute_query(sql, (case_id, case_name))
         return result[0]["CaseInfo_id"] if result else None
 
-    def _get_case_step_id(self, case_id, part_name):
-        sql = """SELECT CaseStepInfo_id FROM case_step_info WHERE case_id = %s AND part_name = %s LIMIT 1"""
-        result = self.sql_utils.execute_query(sql, (case_id, part_name))
+    def _get_case_step_id(self, case_id, part_name, case_step_name):
+        sql = """SELECT CaseStepInfo_id FROM case_step_info
+                 WHERE case_id = %s AND part_name = %s AND case_step_name = %s LIMIT 1"""
+        result = self.sql_utils.execute_query(sql, (case_id, part_name, case_step_name))
         return result[0]["CaseStepInfo_id"] if result else None
 
     def _handle_api_info(self, excel_row):
@@ -133,12 +147,17 @@ class ExcelToMysqlImporter:
         excepted_result_type = excel_row.get("期望结果类型", "").strip() or "无"
         excepted_result = excel_row.get("期望结果", "").strip()
         is_pass = excel_row.get("是否通过", "").strip() or "未执行"
+        row_fingerprint = self.row_fingerprint(excel_row)
+        excepted_result_type = self.result_type_aliases.get(excepted_result_type, excepted_result_type)
+        if excepted_result_type in SLA_CHECK_TYPES:
+            # 阈值不是数字时本条导入失败，避免执行时才发现
+            parse_sla_limit(excepted_result)
 
         if not (case_id and case_info_id and api_id):
             logger.warning(f"必要参数缺失（case_id={case_id}，case_info_id={case_info_id}），跳过case_step_info处理")
             return
 
-        exist_step_id = self._get_case_step_id(case_id, part_name)
+        exist_step_id = self._get_case_step_id(case_id, part_name, case_step_name)
         if exist_step_id:
             update_sql = """
                 UPDATE case_step_info 
@@ -149,13 +168,14 @@ class ExcelToMysqlImporter:
                     excepted_result_type = %s, 
                     excepted_result = %s, 
                     is_pass = %s,
-                    api_id = %s 
+                    api_id = %s,
+                    row_fingerprint = %s 
                 WHERE CaseStepInfo_id = %s
             """
             self.sql_utils.execute_update(
                 update_sql,
                 (case_step_name, get_value_type, variable_name, get_value_code,
-                 excepted_result_type, excepted_result, is_pass, api_id, exist_step_id)
+                 excepted_result_type, excepted_result, is_pass, api_id, row_fingerprint, exist_step_id)
             )
             logger.debug("【更新case_step_info】case_id=%s，part_name=%s，step_id=%s", case_id, part_name, exist_step_id)
         else:
@@ -163,53 +183,62 @@ class ExcelToMysqlImporter:
                 INSERT INTO case_step_info (
                     CaseStepInfo_id, case_id, case_step_name, part_name, api_id,
                     get_value_type, variable_name, excepted_result_type,
-                    excepted_result, get_value_code, is_pass
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    excepted_result, get_value_code, is_pass, row_fingerprint
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """
             self.sql_utils.execute_update(
                 insert_sql,
                 (case_info_id, case_id, case_step_name, part_name, api_id,
                  get_value_type, variable_name, excepted_result_type,
-                 excepted_result, get_value_code, is_pass)
+                 excepted_result, get_value_code, is_pass, row_fingerprint)
             )
             logger.debug("【插入case_step_info】case_id=%s，part_name=%s，step_id=%s（复用case_info.CaseInfo_id）",
                          case_id, part_name, case_info_id)
 
+    def _import_item(self, idx, case_item, result):
+        """逐行导入一条用例（每行一个事务），结果累加到result"""
+        try:
+            case_id = case_item.get("case_id", f"unknown_{idx}")
+            case_info_rows = case_item.get("case_info", [])
+            if not case_info_rows:
+                err_msg = f"第{idx}条无case_info数据"
+                logger.warning(err_msg)
+                result["fail"] += 1
+                result["fail_details"].append(err_msg)
+                return
+
+            for excel_row in case_info_rows:
+                with self.sql_utils.transaction():
+                    api_id = self._handle_api_info(excel_row)
+                    if not api_id:
+                        raise Exception("api_info处理失败，未获取到api_id")
+
+                    case_info_id = self._handle_case_info(excel_row)
+                    if not case_info_id:
+                        raise Exception("case_info处理失败，未获取到case_info.CaseInfo_id")
+
+                    self._handle_case_step_info(excel_row, case_info_id, api_id)
+
+            result["success"] += 1
+            logger.info("第%d条数据导入成功：case_id=%s", idx, case_id)
+        except Exception as e:
+            err_msg = f"第{idx}条数据导入失败：{str(e)}"
+            logger.error(err_msg, exc_info=True)
+            result["fail"] += 1
+            result["fail_details"].append(err_msg)
+
     def import_case_info(self, case_info_list):
         result = {"total": len(case_info_list), "success": 0, "fail": 0, "fail_details": []}
         logger.info("开始导入case_info数据，总条数：%d", result["total"])
 
         for idx, case_item in enumerate(case_info_list, 1):
-            try:
-                case_id = case_item.get("case_id", f"unknown_{idx}")
-                case_info_rows = case_item.get("case_info", [])
-                if not case_info_rows:
-                    err_msg = f"第{idx}条无case_info数据"
-                    logger.warning(err_msg)
-                    result["fail"] += 1
-                    result["fail_details"].append(err_msg)
-                    continue
-
-                for excel_row in case_info_rows:
-                    with self.sql_utils.transaction():
-                        api_id = self._handle_api_info(excel_row)
-                        if not api_id:
-                            raise Exception("api_info处理失败，未获取到api_id")
-
-                        case_info_id = self._handle_case_info(excel_row)
-                        if not case_info_id:
-                            raise Exception("case_info处理失败，未获取到case_info.CaseInfo_id")
-
-                        self._handle_case_step_info(excel_row, case_info_id, api_id)
-
-                result["success"] += 1
-                logger.info("第%d条数据导入成功：case_id=%s", idx, case_id)
-            except Exception as e:
-                err_msg = f"第{idx}条数据导入失败：{str(e)}"
-                logger.error(err_msg, exc_info=True)
-                result["fail"] += 1
-                result["fail_details"].append(err_msg)
+            self._import_item(idx, case_item, result)
 
+        self._log_import_result(result)
+        return result
+
+    @staticmethod
+    def _log_import_result(result):
         logger.info("=" * 50)
         logger.info("case_info数据导入完成：")
         logger.info(f"总条数：{result['total']} | 成功：{result['success']} | 失败：{result['fail']}")
@@ -218,6 +247,298 @@ class ExcelToMysqlImporter:
             for detail in result["fail_details"]:
                 logger.info(f"  - {detail}")
         logger.info("=" * 50)
+
+    # ------------------------------ 批量导入 ------------------------------
+    API_UPSERT_SQL = """
+        INSERT INTO api_info (
+            api_id, api_name, api_request_type,
+            api_request_url, api_url_params, api_post_data
+        ) VALUES (%s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            api_request_type = VALUES(api_request_type),
+            api_request_url = VALUES(api_request_url),
+            api_url_params = VALUES(api_url_params),
+            api_post_data = VALUES(api_post_data)
+    """
+    CASE_UPSERT_SQL = """
+        INSERT INTO case_info (CaseInfo_id, case_id, case_name, is_run)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE is_run = VALUES(is_run)
+    """
+    STEP_UPSERT_SQL = """
+        INSERT INTO case_step_info (
+            CaseStepInfo_id, case_id, case_step_name, part_name, api_id,
+            get_value_type, variable_name, excepted_result_type,
+            excepted_result, get_value_code, is_pass, row_fingerprint
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            case_step_name = VALUES(case_step_name),
+            get_value_type = VALUES(get_value_type),
+            variable_name = VALUES(variable_name),
+            get_value_code = VALUES(get_value_code),
+            excepted_result_type = VALUES(excepted_result_type),
+            excepted_result = VALUES(excepted_result),
+            is_pass = VALUES(is_pass),
+            api_id = VALUES(api_id),
+            row_fingerprint = VALUES(row_fingerprint)
+    """
+    STEP_DELETE_SQL = "DELETE FROM case_step_info WHERE CaseStepInfo_id = %s"
+
+    @staticmethod
+    def _new_keys():
+        return {"api": {}, "case": {}, "step": {}, "step_ids": set()}
+
+    @staticmethod
+    def _merge_keys(target, source):
+        for kind in ("api", "case", "step"):
+            target[kind].update(source[kind])
+        target["step_ids"].update(source["step_ids"])
+
+    def _load_existing_keys(self):
+        """每张表一次查询，加载已有记录的业务键 -> 主键映射（与逐行导入的匹配条件一致）"""
+        keys = self._new_keys()
+        for row in self.sql_utils.execute_query("SELECT api_id, api_name FROM api_info"):
+            keys["api"].setdefault(row["api_name"], row["api_id"])
+        for row in self.sql_utils.execute_query("SELECT CaseInfo_id, case_id, case_name FROM case_info"):
+            keys["case"].setdefault((row["case_id"], row["case_name"]), row["CaseInfo_id"])
+        sql = "SELECT CaseStepInfo_id, case_id, part_name, case_step_name FROM case_step_info"
+        for row in self.sql_utils.execute_query(sql):
+            keys["step"].setdefault((row["case_id"], row["part_name"], row["case_step_name"]), row["CaseStepInfo_id"])
+            keys["step_ids"].add(row["CaseStepInfo_id"])
+        logger.debug("已加载现有记录：api_info=%d，case_info=%d，case_step_info=%d",
+                     len(keys["api"]), len(keys["case"]), len(keys["step"]))
+        return keys
+
+    @staticmethod
+    def _cell(excel_row, key, default=""):
+        value = excel_row.get(key, default)
+        return "" if value is None else str(value).strip()
+
+    @classmethod
+    def part_name_of(cls, excel_row):
+        """Excel行对应的模块名称（未填写时为“未分类”，与导入时写入的part_name一致）"""
+        return cls._cell(excel_row, "模块名称") or "未分类"
+
+    @classmethod
+    def _step_key(cls, excel_row):
+        """步骤业务键 (case_id, part_name, case_step_name)：同一用例同一模块下按步骤名区分多个步骤"""
+        return (cls._cell(excel_row, "测试用例编号"), cls.part_name_of(excel_row),
+                cls._cell(excel_row, "测试用例步骤") or "默认步骤")
+
+    def _plan_row(self, excel_row, key_sources, item_keys):
+        """
+        计算一行的三张表写入参数（不访问数据库），新分配的主键记录到item_keys。
+        key_sources为按优先级查找的业务键映射；校验规则与逐行导入一致。
+        """
+        def lookup(kind, key):
+            for source in key_sources:
+                if key in source[kind]:
+                    return source[kind][key]
+            return None
+
+        api_name = self._cell(excel_row, "接口名称")
+        if not api_name:
+            raise Exception("api_info处理失败，未获取到api_id")
+        api_id = lookup("api", api_name)
+        if not api_id:
+            api_id = item_keys["api"][api_name] = self._generate_short_uuid(length=10)
+        api_params = (
+            api_id, api_name, self._cell(excel_row, "请求方式").upper(), self._cell(excel_row, "请求地址"),
+            self._cell(excel_row, "请求参数(get)") or "{}", self._cell(excel_row, "提交数据(post)") or "{}"
+        )
+
+        case_id = self._cell(excel_row, "测试用例编号")
+        case_name = self._cell(excel_row, "测试用例名称")
+        if not (case_id and case_name):
+            raise Exception("case_info处理失败，未获取到case_info.CaseInfo_id")
+        case_info_id = lookup("case", (case_id, case_name))
+        if not case_info_id:
+            case_info_id = item_keys["case"][(case_id, case_name)] = self._generate_short_uuid(length=10)
+        case_params = (case_info_id, case_id, case_name, self._convert_is_run(excel_row.get("用例执行", "是")))
+
+        part_name = self.part_name_of(excel_row)
+        excepted_result_type = self._cell(excel_row, "期望结果类型") or "无"
+        excepted_result_type = self.result_type_aliases.get(excepted_result_type, excepted_result_type)
+        excepted_result = self._cell(excel_row, "期望结果")
+        if excepted_result_type in SLA_CHECK_TYPES:
+            parse_sla_limit(excepted_result)
+        step_key = self._step_key(excel_row)
+        step_id = lookup("step", step_key)
+        if not step_id:
+            # 新步骤复用case_info.CaseInfo_id作为主键（与逐行导入一致），主键已被其他步骤占用时本条失败
+            step_id = case_info_id
+            if any(step_id in source["step_ids"] for source in key_sources):
+                raise Exception(f"case_step_info主键冲突：{step_id}已被其他步骤使用")
+            item_keys["step"][step_key] = step_id
+            item_keys["step_ids"].add(step_id)
+        step_params = (
+            step_id, case_id, step_key[2], part_name, api_id,
+            self._cell(excel_row, "取值方式") or "无", self._cell(excel_row, "传值变量"),
+            excepted_result_type, excepted_result, self._cell(excel_row, "取值代码"),
+            self._cell(excel_row, "是否通过") or "未执行", self.row_fingerprint(excel_row)
+        )
+        return api_params, case_params, step_params
+
+    def _import_chunk(self, chunk, keys, result, delete_step_ids=()):
+        """
+        批量导入一批用例：内存中计算插入/更新参数，三张表各一条executemany（INSERT ... ON DUPLICATE KEY UPDATE）
+        在同一个事务中提交；批量写入失败时该批回滚并逐条重新导入，定位失败的用例。
+        delete_step_ids为同一事务中要删除的步骤（增量导入时工作簿中已移除的步骤）
+        """
+        chunk_keys = self._new_keys()
+        api_rows, case_rows, step_rows = {}, {}, {}
+        planned = []
+        for idx, case_item in chunk:
+            case_info_rows = case_item.get("case_info", [])
+            if not case_info_rows:
+                err_msg = f"第{idx}条无case_info数据"
+                logger.warning(err_msg)
+                result["fail"] += 1
+                result["fail_details"].append(err_msg)
+                continue
+            item_keys = self._new_keys()
+            try:
+                rows = [self._plan_row(excel_row, (item_keys, chunk_keys, keys), item_keys)
+                        for excel_row in case_info_rows]
+            except Exception as e:
+                err_msg = f"第{idx}条数据导入失败：{str(e)}"
+                logger.error(err_msg)
+                result["fail"] += 1
+                result["fail_details"].append(err_msg)
+                continue
+            self._merge_keys(chunk_keys, item_keys)
+            # 同一主键按出现顺序以最后一行为准（与逐行导入的覆盖顺序一致）
+            for api_params, case_params, step_params in rows:
+                api_rows[api_params[0]] = api_params
+                case_rows[case_params[0]] = case_params
+                step_rows[step_params[0]] = step_params
+            planned.append((idx, case_item))
+
+        if not planned and not delete_step_ids:
+            return
+        statements = [
+            (self.API_UPSERT_SQL, list(api_rows.values())),
+            (self.CASE_UPSERT_SQL, list(case_rows.values())),
+            (self.STEP_UPSERT_SQL, list(step_rows.values())),
+        ]
+        if delete_step_ids:
+            statements.append((self.STEP_DELETE_SQL, [(step_id,) for step_id in delete_step_ids]))
+        try:
+            self.sql_utils.execute_many_in_transaction(statements)
+        except Exception as e:
+            logger.error("批量写入失败，本批%d条改为逐条导入：%s", len(planned), str(e))
+            for idx, case_item in planned:
+                self._import_item(idx, case_item, result)
+            if delete_step_ids:
+                self._delete_steps(delete_step_ids, result)
+            # 逐条导入可能已写入部分记录，重新加载业务键
+            fresh_keys = self._load_existing_keys()
+            keys.clear()
+            keys.update(fresh_keys)
+            return
+
+        self._merge_keys(keys, chunk_keys)
+        result["success"] += len(planned)
+        result["removed"] = result.get("removed", 0) + len(delete_step_ids)
+        logger.info("批量导入%d条用例：api_info=%d，case_info=%d，case_step_info=%d，删除步骤=%d",
+                    len(planned), len(api_rows), len(case_rows), len(step_rows), len(delete_step_ids))
+
+    def _delete_steps(self, delete_step_ids, result):
+        """批量写入失败后单独删除已移除的步骤"""
+        try:
+            self.sql_utils.execute_many_in_transaction([
+                (self.STEP_DELETE_SQL, [(step_id,) for step_id in delete_step_ids])
+            ])
+            result["removed"] = result.get("removed", 0) + len(delete_step_ids)
+        except Exception as e:
+            err_msg = f"删除已移除的步骤失败：{str(e)}"
+            logger.error(err_msg, exc_info=True)
+            result["fail_details"].append(err_msg)
+
+    def bulk_import_case_info(self, case_info_list, chunk_size=None):
+        """
+        批量导入（结果格式与import_case_info一致）：已有记录的业务键一次性加载到内存，
+        每chunk_size条用例一个事务批量写入；case_info_list可以是生成器，按批消费
+        """
+        chunk_size = chunk_size or CONFIG["IMPORT_CHUNK_SIZE"]
+        result = {"total": 0, "success": 0, "fail": 0, "fail_details": []}
+        logger.info("开始批量导入case_info数据，每批%d条", chunk_size)
+
+        keys = self._load_existing_keys()
+        chunk = []
+        for idx, case_item in enumerate(case_info_list, 1):
+            result["total"] += 1
+            chunk.append((idx, case_item))
+            if len(chunk) >= chunk_size:
+                self._import_chunk(chunk, keys, result)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk, keys, result)
+
+        self._log_import_result(result)
+        return result
+
+    # ------------------------------ 增量导入 ------------------------------
+    def _load_existing_steps(self):
+        """加载已有步骤及其行指纹：(case_id, part_name, case_step_name) -> 步骤（匹配条件与导入一致，重复时取第一条）"""
+        steps = {}
+        sql = "SELECT CaseStepInfo_id, case_id, part_name, case_step_name, row_fingerprint FROM case_step_info"
+        for row in self.sql_utils.execute_query(sql):
+            steps.setdefault((row["case_id"], row["part_name"], row["case_step_name"]), row)
+        return steps
+
+    def diff_case_info(self, case_info_list):
+        """
+        按行指纹对比工作簿与数据库（只读，不写入），返回增量导入计划：
+        added/changed为待写入的 [(序号, 用例)]，unchanged为未变化的用例数，
+        removed为工作簿涉及的模块（part_names）中已不存在于工作簿的步骤；步骤按 (用例编号, 模块, 步骤名) 匹配，多步骤用例逐步对比，
+        新增的步骤计入added、删除的步骤计入removed；没有行指纹的已有步骤（历史导入）视为变化
+        """
+        existing = self._load_existing_steps()
+        diff = {"total": 0, "added": [], "changed": [], "unchanged": 0, "removed": [], "part_names": set()}
+        seen_keys, part_names = set(), diff["part_names"]
+        for idx, case_item in enumerate(case_info_list, 1):
+            diff["total"] += 1
+            statuses = set()
+            for excel_row in case_item.get("case_info", []):
+                key = self._step_key(excel_row)
+                seen_keys.add(key)
+                part_names.add(key[1])
+                step = existing.get(key)
+                if step is None:
+                    statuses.add("added")
+                elif step["row_fingerprint"] == self.row_fingerprint(excel_row):
+                    statuses.add("unchanged")
+                else:
+                    statuses.add("changed")
+            if statuses == {"unchanged"}:
+                diff["unchanged"] += 1
+            elif not statuses or statuses == {"added"}:
+                # 无数据的用例照常交给导入记录失败
+                diff["added"].append((idx, case_item))
+            else:
+                diff["changed"].append((idx, case_item))
+
+        diff["removed"] = [step for key, step in existing.items()
+                           if key[1] in part_names and key not in seen_keys]
+        logger.info("增量导入对比完成：总条数%d，新增%d，变化%d，未变化%d，删除%d",
+                    diff["total"], len(diff["added"]), len(diff["changed"]), diff["unchanged"], len(diff["removed"]))
+        return diff
+
+    def apply_case_info_diff(self, diff):
+        """
+        增量导入：只写入新增/变化的用例，并删除工作簿中已移除的步骤，全部在一个事务中批量执行。
+        结果格式与import_case_info一致，另含unchanged（跳过的未变化用例数）和removed（删除的步骤数）
+        """
+        items = diff["added"] + diff["changed"]
+        delete_step_ids = [step["CaseStepInfo_id"] for step in diff["removed"]]
+        result = {"total": len(items), "success": 0, "fail": 0, "fail_details": [],
+                  "unchanged": diff["unchanged"], "removed": 0}
+        logger.info("开始增量导入：写入%d条用例，跳过未变化%d条，删除步骤%d条",
+                    len(items), diff["unchanged"], len(delete_step_ids))
+        if items or delete_step_ids:
+            self._import_chunk(items, self._load_existing_keys(), result, delete_step_ids)
+        self._log_import_result(result)
         return result
 
     def close(self):
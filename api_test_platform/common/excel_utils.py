@@ -1,7 +1,14 @@
 import os
-import psutil
+import json
 import glob
+import psutil
+import hashlib
+import zipfile
+import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from xml.etree import ElementTree
 from common import config
+from common.config import CONFIG
 from common.log_utils import logger
 from common.excel_to_mysql_importer import ExcelToMysqlImporter
 # 兼容xls和xlsx格式（根据文件后缀选择库）
@@ -15,20 +22,32 @@ except ImportError:
 try:
     from openpyxl import load_workbook
     from openpyxl.styles import Font
+    from openpyxl.utils.cell import range_boundaries
 except ImportError:
     logger.warning("openpyxl库未安装，仅支持xls格式")
     load_workbook = None
 
 
+# xlsx工作表XML命名空间（只读模式下解析合并单元格）
+SHEET_XML_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+
+
 class ExcelUtils():
-    def __init__(self, file_path, sheet_name):
-        """初始化Excel工具类（兼容xls/xlsx）"""
+    def __init__(self, file_path, sheet_name, read_only=False):
+        """
+        初始化Excel工具类（兼容xls/xlsx）
+        :param read_only: 只读流式模式（xlsx使用openpyxl只读模式，xls按需加载工作表），配合iter_rows_by_dict逐行读取
+        """
         self.file_path = self._validate_file_path(file_path)
         self.sheet_name = sheet_name
+        self.read_only = read_only
         self.file_type = self._get_file_type()  # 区分xls/xlsx
         self.wb = self._open_workbook()
         self.sheet = self.get_sheets()
         self.merged_cells = self.get_merged_info()  # 缓存合并单元格
+        self.merged_anchor_map = self.get_merged_anchor_map()
+        self._row_count = None
+        self._col_count = None
         logger.info(f"Excel工具初始化完成: {os.path.basename(self.file_path)} - {self.sheet_name}")
 
     def _validate_file_path(self, file_path):
@@ -64,9 +83,11 @@ class ExcelUtils():
         """打开工作簿（根据文件类型选择库）"""
         try:
             if self.file_type == 'xlsx':
-                return load_workbook(self.file_path, data_only=True)  # data_only=True：读取单元格值而非公式
+                # data_only=True：读取单元格值而非公式
+                return load_workbook(self.file_path, data_only=True, read_only=self.read_only)
             else:
-                return xlrd.open_workbook(self.file_path, formatting_info=True)
+                # formatting_info=True才能读取合并单元格；on_demand只加载用到的工作表
+                return xlrd.open_workbook(self.file_path, formatting_info=True, on_demand=self.read_only)
         except Exception as e:
             err_msg = f"打开Excel文件失败: {str(e)}"
             logger.error(err_msg)
@@ -111,23 +132,30 @@ class ExcelUtils():
             cell = self.sheet.cell(row=row, column=col)
             return cell.value if cell.value is not None else ''
         else:
-            if row_index < 0 or row_index >= self.get_row_counts():
+            # 行列数只统计一次，不在每次取值时重复获取
+            if self._row_count is None:
+                self._row_count, self._col_count = self.get_row_counts(), self.get_col_counts()
+            if row_index < 0 or row_index >= self._row_count:
                 raise IndexError(f"行索引 {row_index} 超出范围")
-            if col_index < 0 or col_index >= self.get_col_counts():
+            if col_index < 0 or col_index >= self._col_count:
                 raise IndexError(f"列索引 {col_index} 超出范围")
-            cell_value = self.sheet.cell_value(row_index, col_index)
-            # 处理xlrd的日期格式
-            if self.sheet.cell_type(row_index, col_index) == xlrd.XL_CELL_DATE:
-                try:
-                    return xlrd.xldate_as_datetime(cell_value, 0).strftime('%Y-%m-%d %H:%M:%S')
-                except:
-                    return str(cell_value)
-            return cell_value if cell_value is not None else ''
+            return self._xls_value(self.sheet.cell_value(row_index, col_index), self.sheet.cell_type(row_index, col_index))
+
+    def _xls_value(self, cell_value, cell_type):
+        """xls单元格值转换（日期转为字符串，空值转为''）"""
+        if cell_type == xlrd.XL_CELL_DATE:
+            try:
+                return xlrd.xldate_as_datetime(cell_value, self.wb.datemode).strftime('%Y-%m-%d %H:%M:%S')
+            except Exception:
+                return str(cell_value)
+        return cell_value if cell_value is not None else ''
 
     def get_merged_info(self):
         """获取合并单元格信息（返回格式：[(rlow, rhigh, clow, chigh), ...]）"""
         merged_info = []
-        if self.file_type == 'xlsx':
+        if self.file_type == 'xlsx' and self.read_only:
+            merged_info = self._read_only_merged_info()
+        elif self.file_type == 'xlsx':
             for merged_range in self.sheet.merged_cells.ranges:
                 # 转为0开始的索引（xlsx合并范围是闭区间，如A1:A2 -> rlow=0, rhigh=2, clow=0, chigh=1）
                 rlow = merged_range.min_row - 1
@@ -140,96 +168,109 @@ class ExcelUtils():
         logger.debug(f"工作表 '{self.sheet_name}' 合并单元格数量: {len(merged_info)}")
         return merged_info
 
+    def _read_only_merged_info(self):
+        """
+        只读模式下openpyxl不解析合并单元格：直接流式解析工作表XML中的mergeCell节点
+        （mergeCells位于sheetData之后，解析时逐行释放row节点，内存占用不随行数增长）
+        """
+        worksheet_path = getattr(self.sheet, '_worksheet_path', None)
+        if not worksheet_path:
+            logger.warning(f"无法定位工作表 '{self.sheet_name}' 的XML，忽略合并单元格")
+            return []
+        merged_info = []
+        with zipfile.ZipFile(self.file_path) as archive, archive.open(worksheet_path) as sheet_xml:
+            for _, element in ElementTree.iterparse(sheet_xml):
+                if element.tag == f'{SHEET_XML_NS}mergeCell':
+                    min_col, min_row, max_col, max_row = range_boundaries(element.get('ref'))
+                    merged_info.append((min_row - 1, max_row, min_col - 1, max_col))
+                elif element.tag == f'{SHEET_XML_NS}row':
+                    element.clear()
+        return merged_info
+
+    def get_merged_anchor_map(self):
+        """合并单元格索引：{行: {列: (左上角行, 左上角列)}}（0开始，不含左上角单元格本身）"""
+        anchor_map = {}
+        for (rlow, rhigh, clow, chigh) in self.merged_cells:
+            for row in range(rlow, rhigh):
+                row_anchors = anchor_map.setdefault(row, {})
+                for col in range(clow, chigh):
+                    if (row, col) != (rlow, clow):
+                        row_anchors[col] = (rlow, clow)
+        return anchor_map
+
     def get_merged_cell_value_from_cell(self, row_index, col_index):
         """获取单元格值（处理合并单元格，返回合并区域左上角的值）"""
         try:
-            # 先检查是否在合并区域内
-            for (rlow, rhigh, clow, chigh) in self.merged_cells:
-                if rlow <= row_index < rhigh and clow <= col_index < chigh:
-                    logger.debug(f"单元格({row_index},{col_index})属于合并区域，取值({rlow},{clow})")
-                    return self.__get_cell_value(rlow, clow)
+            # 按合并单元格索引查找左上角单元格
+            anchor = self.merged_anchor_map.get(row_index, {}).get(col_index)
+            if anchor:
+                logger.debug(f"单元格({row_index},{col_index})属于合并区域，取值{anchor}")
+                return self.__get_cell_value(*anchor)
             # 非合并单元格，直接取值
             return self.__get_cell_value(row_index, col_index)
         except IndexError as e:
             logger.error(f"获取单元格值失败: {str(e)}")
             raise
 
+    def _iter_raw_rows(self):
+        """逐行读取原始值（xlsx使用iter_rows(values_only=True)，xls按行读取值和类型）"""
+        if self.file_type == 'xlsx':
+            yield from self.sheet.iter_rows(values_only=True)
+        else:
+            for row_index in range(self.sheet.nrows):
+                yield [self._xls_value(value, cell_type) for value, cell_type in
+                       zip(self.sheet.row_values(row_index), self.sheet.row_types(row_index))]
+
+    def iter_rows_by_dict(self):
+        """
+        逐行生成字典数据（首行作为键），合并单元格按索引取左上角的值。
+        只保存合并区域左上角的值，内存占用与行数无关，大文件配合read_only=True使用
+        """
+        anchor_rows = {}
+        for row_anchors in self.merged_anchor_map.values():
+            for anchor_row, anchor_col in row_anchors.values():
+                anchor_rows.setdefault(anchor_row, set()).add(anchor_col)
+        anchor_values = {}
+        header = None
+        data_count = 0
+
+        for row_index, values in enumerate(self._iter_raw_rows()):
+            values = ['' if value is None else value for value in values]
+            for anchor_col in anchor_rows.get(row_index, ()):
+                anchor_values[(row_index, anchor_col)] = values[anchor_col] if anchor_col < len(values) else ''
+            for col, anchor in self.merged_anchor_map.get(row_index, {}).items():
+                if col >= len(values):
+                    values.extend([''] * (col + 1 - len(values)))
+                values[col] = anchor_values.get(anchor, '')
+
+            if header is None:
+                header = [key if key else f"col_{col}" for col, key in enumerate(values)]  # 空键名用col_索引代替
+                continue
+            if len(values) < len(header):
+                values.extend([''] * (len(header) - len(values)))
+            data_count += 1
+            yield dict(zip(header, values))
+
+        if not data_count:
+            logger.warning(f"工作表 '{self.sheet_name}' 数据不足（需至少2行）")
+        else:
+            logger.info(f"从工作表 '{self.sheet_name}' 读取到 {data_count} 条数据")
+
     def get_sheet_data_by_dict(self):
         """将工作表数据转为字典列表（首行作为键）"""
         try:
-            all_data = []
-            row_count = self.get_row_counts()
-            if row_count < 2:  # 至少需要首行（键）+1行数据
-                logger.warning(f"工作表 '{self.sheet_name}' 数据不足（需至少2行）")
-                return all_data
-
-            # 获取首行作为键
-            header = []
-            col_count = self.get_col_counts()
-            for col in range(col_count):
-                key = self.get_merged_cell_value_from_cell(0, col)
-                header.append(key if key else f"col_{col}")  # 空键名用col_索引代替
-
-            # 读取数据行（从第2行开始，索引1）
-            for row in range(1, row_count):
-                row_data = {}
-                for col in range(col_count):
-                    key = header[col]
-                    value = self.get_merged_cell_value_from_cell(row, col)
-                    row_data[key] = value
-                all_data.append(row_data)
-
-            logger.info(f"从工作表 '{self.sheet_name}' 读取到 {len(all_data)} 条数据")
-            return all_data
+            return list(self.iter_rows_by_dict())
         except Exception as e:
             logger.error(f"转换工作表数据失败: {str(e)}", exc_info=True)
             raise
 
-    def read_multiple_excel_cases(self, sheet_name='Sheet1'):
-        """批量读取指定目录下所有Excel文件的用例（修复原参数未使用问题）"""
+    def read_multiple_excel_cases(self, sheet_name='Sheet1', workers=None):
+        """批量读取指定目录下所有Excel文件的用例（多进程并行解析，返回全部用例列表）"""
         all_cases = []
-        # 从配置获取测试数据目录（原代码用self.test_data，改为从config读取）
-        excel_dir_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', config.TEST_DATA))
-
-        try:
-            if not os.path.exists(excel_dir_path):
-                logger.error(f"测试数据目录不存在: {excel_dir_path}")
-                return all_cases
-            if not os.path.isdir(excel_dir_path):
-                logger.error(f"路径不是目录: {excel_dir_path}")
-                return all_cases
-
-            # 查找所有Excel文件
-            excel_files = glob.glob(os.path.join(excel_dir_path, '*.xls')) + \
-                          glob.glob(os.path.join(excel_dir_path, '*.xlsx'))
-            if not excel_files:
-                logger.warning(f"目录 {excel_dir_path} 中未找到Excel文件")
-                return all_cases
-
-            logger.info(f"发现 {len(excel_files)} 个Excel文件，开始读取用例...")
-            for file_path in excel_files:
-                file_name = os.path.basename(file_path)
-                try:
-                    # 读取当前文件的指定工作表
-                    excel = ExcelUtils(file_path, sheet_name)
-                    cases = excel.get_sheet_data_by_dict()
-                    if cases:
-                        # 添加来源文件字段，便于追溯
-                        for case in cases:
-                            case['来源文件'] = file_name
-                        all_cases.extend(cases)
-                        logger.info(f"从 {file_name} 读取到 {len(cases)} 条用例")
-                    else:
-                        logger.warning(f"{file_name} 中未读取到用例数据")
-                except Exception as e:
-                    logger.error(f"处理文件 {file_name} 失败: {str(e)}", exc_info=True)
-                    continue  # 继续处理下一个文件
-
-            logger.info(f"批量读取完成，共获取 {len(all_cases)} 条用例")
-            return all_cases
-        except Exception as e:
-            logger.error(f"批量读取Excel用例异常: {str(e)}", exc_info=True)
-            return all_cases
+        for file_name, file_hash, cases in iter_multiple_excel_cases(sheet_name, workers=workers):
+            all_cases.extend(cases)
+        logger.info(f"批量读取完成，共获取 {len(all_cases)} 条用例")
+        return all_cases
 
     def _is_file_locked(self):
         """检查文件是否被占用"""
@@ -258,13 +299,195 @@ class ExcelUtils():
     def close(self):
         """关闭工作簿"""
         try:
-            if self.wb:
+            if self.wb and self.file_type == 'xls':
+                self.wb.release_resources()
+                logger.debug(f"已关闭Excel文件: {os.path.basename(self.file_path)}")
+            elif self.wb:
                 self.wb.close()
                 logger.debug(f"已关闭Excel文件: {os.path.basename(self.file_path)}")
         except Exception as e:
             logger.warning(f"关闭Excel文件失败: {str(e)}")
 
 
+
+def _test_data_dir():
+    """测试数据目录的绝对路径（与运行时的工作目录无关）"""
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), '..', config.TEST_DATA))
+
+
+def file_content_hash(file_path, chunk_size=1024 * 1024):
+    """文件内容SHA256（分块读取）"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as fp:
+        for chunk in iter(lambda: fp.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class WorkbookHashCache():
+    """
+    已导入工作簿的内容哈希缓存（保存在测试数据目录），内容未变化的文件再次批量导入时跳过；
+    每条记录同时保存工作簿涉及的模块，平台上修改导入的数据时只失效对应模块的工作簿
+    """
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path or os.path.join(_test_data_dir(), '.import_hash_cache.json')
+        self._entries = None
+
+    def _load(self):
+        """首次使用时读取缓存文件（只做失效判断或清空时不解析）"""
+        if self._entries is None:
+            self._entries = {}
+            if os.path.exists(self.cache_path):
+                try:
+                    with open(self.cache_path, 'r', encoding='utf-8') as fp:
+                        self._entries = json.load(fp)
+                except (ValueError, OSError) as e:
+                    logger.warning(f"工作簿哈希缓存读取失败，重新建立: {str(e)}")
+        return self._entries
+
+    def __contains__(self, file_hash):
+        return file_hash in self._load()
+
+    def exists(self):
+        return os.path.exists(self.cache_path)
+
+    def clear(self):
+        """清空缓存：直接删除缓存文件"""
+        self._entries = {}
+        try:
+            os.remove(self.cache_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"工作簿哈希缓存清除失败: {str(e)}")
+
+    def invalidate_parts(self, part_names):
+        """
+        删除涉及指定模块的工作簿记录，返回删除的条数：平台上修改/删除了这些模块的数据后，
+        内容未变化的工作簿也需要重新导入以恢复被改动的步骤；未记录模块的历史条目无法判断，一并删除
+        """
+        part_names = set(part_names)
+        if not part_names or not self.exists():
+            return 0
+        entries = self._load()
+        stale = [file_hash for file_hash, entry in entries.items()
+                 if 'part_names' not in entry or part_names & set(entry['part_names'])]
+        if not stale:
+            return 0
+        for file_hash in stale:
+            del entries[file_hash]
+        if entries:
+            self.save()
+        else:
+            self.clear()
+        logger.info(f"模块 {sorted(part_names)} 的数据已变化，失效工作簿哈希缓存 {len(stale)} 条")
+        return len(stale)
+
+    def add(self, file_hash, file_name, rows, part_names=()):
+        self._load()[file_hash] = {
+            'file_name': file_name,
+            'rows': rows,
+            'part_names': sorted(part_names),
+            'imported_at': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+
+    def save(self):
+        """先写临时文件再替换，避免写入中断损坏缓存"""
+        temp_path = f"{self.cache_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as fp:
+            json.dump(self._load(), fp, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.cache_path)
+
+
+def _parse_workbook(file_path, sheet_name):
+    """进程池入口：只读模式解析单个工作簿，返回带来源文件字段的用例列表"""
+    excel = ExcelUtils(file_path, sheet_name, read_only=True)
+    try:
+        cases = list(excel.iter_rows_by_dict())
+    finally:
+        excel.close()
+    file_name = os.path.basename(file_path)
+    for case in cases:
+        case['来源文件'] = file_name  # 添加来源文件字段，便于追溯
+    return cases
+
+
+def iter_multiple_excel_cases(sheet_name='Sheet1', workers=None, hash_cache=None):
+    """
+    并行解析测试数据目录下的所有Excel文件，按完成顺序逐个生成 (文件名, 内容哈希, 用例列表)。
+    指定hash_cache时跳过内容哈希已在缓存中的文件（不解析）；单个文件解析失败时记录错误并继续。
+    """
+    excel_dir_path = _test_data_dir()
+    if not os.path.isdir(excel_dir_path):
+        logger.error(f"测试数据目录不存在或不是目录: {excel_dir_path}")
+        return
+
+    excel_files = sorted(glob.glob(os.path.join(excel_dir_path, '*.xls')) +
+                         glob.glob(os.path.join(excel_dir_path, '*.xlsx')))
+    if not excel_files:
+        logger.warning(f"目录 {excel_dir_path} 中未找到Excel文件")
+        return
+
+    pending = {}
+    for file_path in excel_files:
+        file_hash = file_content_hash(file_path)
+        if hash_cache is not None and file_hash in hash_cache:
+            logger.info(f"{os.path.basename(file_path)} 内容未变化，跳过")
+            continue
+        pending[file_path] = file_hash
+    if not pending:
+        return
+
+    workers = min(workers or CONFIG['IMPORT_WORKERS'], len(pending))
+    logger.info(f"发现 {len(excel_files)} 个Excel文件，待解析 {len(pending)} 个，并行数: {workers}")
+    if workers <= 1:
+        # 单进程时直接解析，省去进程池开销
+        for file_path, file_hash in pending.items():
+            try:
+                yield os.path.basename(file_path), file_hash, _parse_workbook(file_path, sheet_name)
+            except Exception as e:
+                logger.error(f"处理文件 {os.path.basename(file_path)} 失败: {str(e)}", exc_info=True)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_parse_workbook, file_path, sheet_name): file_path for file_path in pending}
+        for future in as_completed(futures):
+            file_path = futures[future]
+            file_name = os.path.basename(file_path)
+            try:
+                cases = future.result()
+            except Exception as e:
+                logger.error(f"处理文件 {file_name} 失败: {str(e)}", exc_info=True)
+                continue
+            logger.info(f"从 {file_name} 读取到 {len(cases)} 条用例")
+            yield file_name, pending[file_path], cases
+
+
+def import_multiple_excel_cases(importer, sheet_name='Sheet1', workers=None, force=False):
+    """
+    批量导入测试数据目录下的Excel文件：并行解析，每个文件解析完成后立即导入；
+    内容哈希与之前成功导入的文件相同时跳过（force=True时全部重新导入）
+    """
+    hash_cache = WorkbookHashCache()
+    summary = {"files": 0, "total": 0, "success": 0, "fail": 0, "fail_details": []}
+    for file_name, file_hash, cases in iter_multiple_excel_cases(
+            sheet_name, workers=workers, hash_cache=None if force else hash_cache):
+        result = importer.bulk_import_case_info(
+            {'case_id': f"case_{i}", 'case_info': [case]} for i, case in enumerate(cases)
+        )
+        summary["files"] += 1
+        for key in ("total", "success", "fail"):
+            summary[key] += result[key]
+        summary["fail_details"].extend(f"[{file_name}] {detail}" for detail in result["fail_details"])
+        if not result["fail"]:
+            hash_cache.add(file_hash, file_name, result["total"],
+                           {ExcelToMysqlImporter.part_name_of(case) for case in cases})
+            hash_cache.save()
+    logger.info(f"批量导入完成：文件 {summary['files']} 个，总条数 {summary['total']}，"
+                f"成功 {summary['success']}，失败 {summary['fail']}")
+    return summary
+
 if __name__ == '__main__':
     # 测试代码
     a=ExcelToMysqlImporter()
@@ -0,0 +1,136 @@
+import math
+import time
+import bisect
+import threading
+import contextvars
+from collections import defaultdict
+
+# 耗时直方图分桶上界(ms)
+HISTOGRAM_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# 当前请求的阶段计时：域名解析在连接池的网络层完成，按上下文找到发起请求的RequestTrace
+current_trace = contextvars.ContextVar('current_request_trace', default=None)
+
+
+def latency_histogram(values, buckets=HISTOGRAM_BUCKETS):
+    """耗时直方图：返回 [(区间, 数量)]，最后一个区间为超过最大上界的请求"""
+    counts = [0] * (len(buckets) + 1)
+    for value in values:
+        counts[bisect.bisect_left(buckets, value)] += 1
+    labels = [f"<={bucket}ms" for bucket in buckets] + [f">{buckets[-1]}ms"]
+    return list(zip(labels, counts))
+
+
+def percentile(sorted_values, p):
+    """百分位数（最近秩法，sorted_values需已升序排列）"""
+    if not sorted_values:
+        return None
+    rank = max(int(math.ceil(p / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[rank]
+
+
+class RequestTrace():
+    """
+    httpx请求阶段计时：通过请求扩展trace接收httpcore事件，记录连接建立、TLS握手和首字节时间(ms)。
+    域名解析耗时由连接池的网络层（SessionPool.new_async_transport安装）通过record_dns写入，连接耗时不含域名解析。
+    复用连接池中的已有连接时不会触发解析/连接/TLS事件，对应耗时为None。
+    """
+
+    def __init__(self):
+        self._start = None
+        self._marks = {}
+        self.dns_time = None
+        self.total = None
+
+    def start(self):
+        self._start = time.perf_counter()
+
+    def finish(self):
+        self.total = self._elapsed(time.perf_counter())
+
+    def _elapsed(self, mark):
+        return round((mark - self._start) * 1000, 2)
+
+    async def async_callback(self, event_name, info):
+        self._marks[event_name] = time.perf_counter()
+
+    def record_dns(self, dns_time):
+        self.dns_time = dns_time
+
+    def _duration(self, started, complete):
+        if started not in self._marks or complete not in self._marks:
+            return None
+        return round((self._marks[complete] - self._marks[started]) * 1000, 2)
+
+    def timings(self):
+        ttfb = None
+        for event_name in ('http11.receive_response_headers.complete', 'http2.receive_response_headers.complete'):
+            if event_name in self._marks:
+                ttfb = self._elapsed(self._marks[event_name])
+                break
+        connect_time = self._duration('connection.connect_tcp.started', 'connection.connect_tcp.complete')
+        dns_time = self.dns_time if connect_time is not None else None
+        if dns_time is not None:
+            # connect_tcp事件包含网络层的域名解析，扣除后为TCP连接耗时
+            connect_time = round(max(connect_time - dns_time, 0), 2)
+        return {
+            'dns_time': dns_time,
+            'connect_time': connect_time,
+            'tls_time': self._duration('connection.start_tls.started', 'connection.start_tls.complete'),
+            'ttfb': ttfb,
+            'response_time': self.total,
+        }
+
+
+class LatencyStats():
+    """按接口聚合一次执行内的请求耗时：p50/p90/p99、吞吐量、错误数和流量（线程安全）"""
+
+    def __init__(self):
+        self._samples = defaultdict(list)
+        self._ttfb = defaultdict(list)
+        self._counters = defaultdict(lambda: {'count': 0, 'errors': 0, 'request_bytes': 0, 'response_bytes': 0})
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+
+    def add(self, step_record):
+        """累计一条步骤执行记录（字段格式与RunHistoryRecorder一致）"""
+        api_name = step_record.get('api_name') or '未知接口'
+        with self._lock:
+            counter = self._counters[api_name]
+            counter['count'] += 1
+            if step_record.get('status') != 'passed':
+                counter['errors'] += 1
+            counter['request_bytes'] += step_record.get('request_size') or 0
+            counter['response_bytes'] += step_record.get('response_size') or 0
+            if step_record.get('response_time') is not None:
+                self._samples[api_name].append(step_record['response_time'])
+            if step_record.get('ttfb') is not None:
+                self._ttfb[api_name].append(step_record['ttfb'])
+
+    def summary(self, duration=None):
+        """
+        按接口返回统计结果列表（按p90耗时降序）
+        :param duration: 统计时长（秒），用于计算吞吐量，默认取创建以来的时长
+        """
+        duration = duration or (time.monotonic() - self.started)
+        rows = []
+        with self._lock:
+            for api_name, counter in self._counters.items():
+                samples = sorted(self._samples[api_name])
+                ttfb = sorted(self._ttfb[api_name])
+                rows.append({
+                    'api_name': api_name,
+                    'count': counter['count'],
+                    'errors': counter['errors'],
+                    'avg': round(sum(samples) / len(samples), 2) if samples else None,
+                    'p50': percentile(samples, 50),
+                    'p90': percentile(samples, 90),
+                    'p99': percentile(samples, 99),
+                    'max': samples[-1] if samples else None,
+                    'ttfb_p90': percentile(ttfb, 90),
+                    'throughput': round(counter['count'] / duration, 2) if duration > 0 else None,
+                    'request_bytes': counter['request_bytes'],
+                    'response_bytes': counter['response_bytes'],
+                })
+        rows.sort(key=lambda row: row['p90'] if row['p90'] is not None else -1, reverse=True)
+        return rows
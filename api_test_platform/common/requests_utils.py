@@ -1,49 +1,71 @@
-import requests
 import re
-import ast
+import time
 import jsonpath
 from requests.exceptions import RequestException, ConnectionError
 from common import config
 from common.check_utils import CheckUtils
+from common.session_pool import SessionPool
+from common.step_compiler import compile_step, compile_template
+from common.run_history import utc_now
+from common.variable_store import RunVariables
 from common.log_utils import logger  # 新增日志引用
 
 
 class RequestsUtils():
     def __init__(self):
+        self._init_settings()
+        self._session = None
+
+    @property
+    def session(self):
+        """
+        requests会话，仅requests同步请求路径（未安装httpx时的回退）使用，首次发送请求时创建
+        会话按用例链独立（Cookie隔离），底层连接池按主机进程内共享
+        """
+        if self._session is None:
+            self._session = SessionPool.new_session((self.host, self.host1))
+        return self._session
+
+    def _init_settings(self):
+        """请求地址、请求头、超时等设置（异步请求引擎共用，不创建requests会话）"""
         self.host1 = config.URL1
         self.host = config.URL
         self.headers = {"Content-Type": "application/json;charset=UTF-8;multipart/form-data"}
-        self.session = requests.session()
         self.temp_variables = {}  # 临时变量，用于存储传值
+        self.step_records = []  # 本条用例链各步骤的执行记录（写入执行历史）
 
         # 修复：直接读取config的全局变量，而非调用get方法
         # 优先使用config中定义的REQUEST_TIMEOUT，无则默认10秒
         self.timeout = getattr(config, 'REQUEST_TIMEOUT', 10)
         logger.debug(f"请求超时时间设置为: {self.timeout}秒")
 
-    def __get(self, get_info):
+    def __get(self, get_info, plan):
         try:
-            # 构建URL
-            url = self.host1 + get_info['请求地址']
-            logger.debug(f"发送GET请求: {url}, 参数: {get_info['请求参数(get)']}")
+            # 构建URL（参数使用预编译模板渲染）
+            url = self.host1 + plan.url_path
+            params = plan.url_params.render(self.temp_variables)
+            logger.debug(f"发送GET请求: {url}, 参数: {params}")
 
             # 发送请求（添加超时）
+            start_time = time.perf_counter()
             response = self.session.get(
                 url=url,
-                params=ast.literal_eval(get_info['请求参数(get)']),
+                params=params,
                 timeout=self.timeout
             )
+            metrics = self._response_metrics(response, self._sync_timings(response, start_time), response.request.body)
             response.encoding = response.apparent_encoding
             logger.debug(f"GET响应状态码: {response.status_code}, 响应内容: {response.text[:500]}")
 
             # 变量提取
-            self._extract_variable(get_info, response)
+            self._extract_variable(get_info, response, plan=plan)
 
-            # 结果断言
-            result = CheckUtils(response).run_check(
-                check_type=get_info['期望结果类型'],
-                check_data=get_info['期望结果']
+            # 结果断言（断言数据已预编译，性能断言使用本次请求的耗时和大小）
+            result = CheckUtils(response, metrics).run_check(
+                check_type=plan.check_type,
+                check_data=plan.check_data
             )
+            result.update(metrics)
             # 新增：打印完整响应内容（关键！定位非JSON响应的具体内容）
             logger.debug(f"GET响应完整内容: {response.text}")  # 查看返回的到底是什么
             logger.debug(f"GET响应Content-Type: {response.headers.get('Content-Type')}")  # 查看响应类型
@@ -62,37 +84,38 @@ class RequestsUtils():
             logger.error(err_msg, exc_info=True)
             return {'code': 4, 'result': err_msg, 'check_result': False, 'message': err_msg}
 
-    def __post(self, post_info):
+    def __post(self, post_info, plan):
         try:
             # 构建URL
-            url = self.host + post_info['请求地址']
-            logger.debug(
-                f"发送POST请求: {url}, 参数: {post_info['请求参数(get)']}, 提交数据: {post_info['提交数据(post)']}")
+            url = self.host + plan.url_path
 
-            # 处理提交数据（修复原GET调用bug）
-            post_data = ast.literal_eval(post_info['提交数据(post)']) if post_info['提交数据(post)'] else None
+            # 处理请求参数和提交数据（预编译模板渲染，修复原GET调用bug）
+            params = plan.url_params.render(self.temp_variables)
+            post_data = plan.post_data.render(self.temp_variables)
+            logger.debug(f"发送POST请求: {url}, 参数: {params}, 提交数据: {post_data}")
 
             # 发送POST请求（添加超时）
-
-            logger.warning(post_info['请求参数(get)'] )
+            start_time = time.perf_counter()
             response = self.session.post(
                 url=url,
                 headers=self.headers,
-                params=ast.literal_eval(post_info['请求参数(get)']) if post_info['请求参数(get)'] else None,
+                params=params,
                 json=post_data,  # 修复：使用post_data而非None
                 timeout=self.timeout
             )
+            metrics = self._response_metrics(response, self._sync_timings(response, start_time), response.request.body)
             response.encoding = response.apparent_encoding
             logger.debug(f"POST响应状态码: {response.status_code}, 响应内容: {response.text[:500]}")
 
             # 变量提取
-            self._extract_variable(post_info, response)
+            self._extract_variable(post_info, response, plan=plan)
 
-            # 结果断言
-            result = CheckUtils(response).run_check(
-                check_type=post_info['期望结果类型'],
-                check_data=post_info['期望结果']
+            # 结果断言（断言数据已预编译，性能断言使用本次请求的耗时和大小）
+            result = CheckUtils(response, metrics).run_check(
+                check_type=plan.check_type,
+                check_data=plan.check_data
             )
+            result.update(metrics)
             # 新增：打印完整响应内容
             logger.debug(f"POST响应完整内容: {response.text}")
             logger.debug(f"POST响应Content-Type: {response.headers.get('Content-Type')}")
@@ -111,14 +134,65 @@ class RequestsUtils():
             logger.error(err_msg, exc_info=True)
             return {'code': 4, 'result': err_msg, 'check_result': False, 'message': err_msg}
 
-    def _extract_variable(self, step_info, response):
-        """提取变量（重构为公共方法，减少重复代码）"""
-        extract_type = step_info.get('取值方式')
+    @staticmethod
+    def _sync_timings(response, start_time):
+        """requests无法获取域名解析/连接/TLS阶段耗时（记为None）；elapsed为发送请求到解析完响应头的时间，作为首字节时间"""
+        return {
+            'dns_time': None,
+            'connect_time': None,
+            'tls_time': None,
+            'ttfb': round(response.elapsed.total_seconds() * 1000, 2),
+            'response_time': round((time.perf_counter() - start_time) * 1000, 2),
+        }
+
+    @staticmethod
+    def _response_metrics(response, timings, request_body=None):
+        """各阶段耗时(ms)和请求/响应体大小(字节)，随断言结果一起返回"""
+        if isinstance(request_body, str):
+            request_body = request_body.encode('utf-8')
+        metrics = dict(timings)
+        metrics['request_size'] = len(request_body or b'')
+        metrics['response_size'] = len(response.content)
+        return metrics
+
+    @staticmethod
+    def _build_step_record(step_info, result, started_at):
+        """生成单个步骤的执行记录（请求异常时没有响应信息，状态记为error）"""
+        if result.get('code') == 0 and result.get('check_result'):
+            status = 'passed'
+        elif 'response_code' in result:
+            status = 'failed'
+        else:
+            status = 'error'
+        return {
+            'case_step_info_id': step_info.get('case_step_info_id'),
+            'case_id': step_info.get('测试用例编号'),
+            'part_name': step_info.get('模块名称'),
+            'api_name': step_info.get('接口名称'),
+            'status': status,
+            'http_status': result.get('response_code'),
+            'dns_time': result.get('dns_time'),
+            'connect_time': result.get('connect_time'),
+            'tls_time': result.get('tls_time'),
+            'ttfb': result.get('ttfb'),
+            'response_time': result.get('response_time'),
+            'request_size': result.get('request_size'),
+            'response_size': result.get('response_size'),
+            'message': str(result.get('message') or '')[:2000],
+            'started_at': started_at,
+            'finished_at': utc_now(),
+        }
+
+    def _extract_variable(self, step_info, response, temp_variables=None, plan=None):
+        """提取变量（重构为公共方法，减少重复代码；temp_variables为空时写入当前实例的临时变量）"""
+        temp_variables = self.temp_variables if temp_variables is None else temp_variables
+        plan = plan or compile_step(step_info)
+        extract_type = plan.extract_type
         if not extract_type or extract_type == '无':
             return
 
-        var_name = step_info.get('传值变量')
-        extract_code = step_info.get('取值代码')
+        var_name = plan.var_name
+        extract_code = plan.extract_code
         if not var_name or not extract_code:
             logger.warning(f"取值变量或取值代码为空，跳过提取: {step_info['测试用例步骤']}")
             return
@@ -131,7 +205,7 @@ class RequestsUtils():
                     return
                 value = values[0]
             elif extract_type == '正则匹配':
-                values = re.findall(extract_code, response.text)
+                values = re.findall(extract_code, response.text)  # extract_code为预编译正则
                 if not values or len(values) == 0:
                     logger.error(f"正则匹配失败: 表达式{extract_code}未匹配到值")
                     return
@@ -140,25 +214,22 @@ class RequestsUtils():
                 logger.warning(f"不支持的取值方式: {extract_type}")
                 return
 
-            self.temp_variables[var_name] = value
+            temp_variables[var_name] = value
             logger.debug(f"提取变量成功: {var_name} = {value}")
         except Exception as e:
             logger.error(f"变量提取失败: {str(e)}", exc_info=True)
 
     def request(self, step_info):
         try:
-            request_type = step_info['请求方式'].upper()
+            # 获取步骤执行计划（按步骤ID + 行内容缓存，变量在发送时按模板槽位渲染）
+            plan = compile_step(step_info)
+            request_type = plan.request_type
             logger.info(f"开始处理请求步骤: {step_info['测试用例步骤']}, 方式: {request_type}")
 
-            # 替换请求参数中的变量（容错处理）
-            step_info['请求参数(get)'] = self._replace_variable(step_info['请求参数(get)'])
-
             if request_type == 'GET':
-                result = self.__get(step_info)
+                result = self.__get(step_info, plan)
             elif request_type == 'POST':
-                # 替换提交数据中的变量
-                step_info['提交数据(post)'] = self._replace_variable(step_info['提交数据(post)'])
-                result = self.__post(step_info)
+                result = self.__post(step_info, plan)
             else:
                 err_msg = f"不支持的请求方式: {request_type}"
                 logger.error(err_msg)
@@ -172,31 +243,34 @@ class RequestsUtils():
             logger.error(err_msg, exc_info=True)
             return {'code': 4, 'result': err_msg, 'check_result': False, 'message': err_msg}
 
-    def _replace_variable(self, content):
+    def _replace_variable(self, content, temp_variables=None):
         """替换变量（容错：变量不存在时不替换，避免KeyError）"""
+        temp_variables = self.temp_variables if temp_variables is None else temp_variables
         if not content:
             return content
-
-        var_list = re.findall('\\${\\w+}', content)
-        if not var_list:
-            return content
-
-        for var in var_list:
-            var_key = var[2:-1]  # 提取变量名（如${token} -> token）
-            if var_key in self.temp_variables:
-                content = content.replace(var, str(self.temp_variables[var_key]))
-                logger.debug(f"替换变量: {var} -> {self.temp_variables[var_key]}")
-            else:
-                logger.warning(f"变量{var}未找到，跳过替换")
-
-        return content
+        return compile_template(content).render_text(temp_variables)
 
     def request_by_step(self, step_infos):
-        self.temp_variables = {}
+        """执行单条用例链（同步入口，委托异步请求引擎执行；未安装httpx时回退为requests串行请求）"""
+        from common.async_requests_utils import AsyncRequestsUtils, httpx
+        if httpx is None:
+            return self._request_by_step_sync(step_infos)
+
+        # 用例级变量每条用例链独立，模块级/执行级变量关联当前活动的RunVariables
+        self.temp_variables = RunVariables.scope_for(step_infos)
+        self.step_records = []
+        engine = AsyncRequestsUtils.shared()
+        return engine.run_sync(engine.request_by_step(step_infos, self.temp_variables, self.step_records))
+
+    def _request_by_step_sync(self, step_infos):
+        self.temp_variables = RunVariables.scope_for(step_infos)
+        self.step_records = []
         final_result = {'code': 0, 'result': '所有步骤执行完成', 'check_result': True, 'message': ''}
 
         for step_info in step_infos:
+            started_at = utc_now()
             temp_result = self.request(step_info)
+            self.step_records.append(self._build_step_record(step_info, temp_result, started_at))
             if temp_result['code'] != 0:
                 final_result = temp_result
                 logger.error(f"步骤{step_info['测试用例步骤']}执行失败，终止后续步骤")
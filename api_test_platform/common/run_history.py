@@ -0,0 +1,181 @@
+import time
+import uuid
+import datetime
+import threading
+import contextvars
+from common import config
+from common.sql_utils import SqlUtils
+from common.latency_stats import LatencyStats
+from common.log_utils import logger
+
+
+def utc_now():
+    """当前UTC时间（不带时区，与Django USE_TZ=True时MySQL中的存储格式一致）"""
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+# 当前活动记录器按线程/协程上下文隔离：并发的单条执行请求各自建批次互不覆盖，
+# 并发套件的工作线程由ParallelSuite复制提交时的上下文传入
+_active_recorder = contextvars.ContextVar('active_run_recorder', default=None)
+
+# 过期执行历史的上次清理时间（进程内按间隔节流）
+_last_purge = None
+_purge_lock = threading.Lock()
+
+
+class RunHistoryRecorder():
+    """
+    执行历史记录：一次执行对应一条test_run记录，每个请求步骤对应一条step_result记录。
+    步骤结果先缓冲，累计flush_size条后用executemany批量写入；作为上下文管理器使用时，
+    进入时登记为当前上下文的活动记录器（APITest执行完成后自动上报），退出时写入剩余结果并更新汇总。
+    latency_stats同时按接口聚合耗时分位数，供测试报告展示（数据库不可用时照常统计）。
+    """
+
+    INSERT_RUN_SQL = """
+        INSERT INTO test_run (run_id, run_type, status, total, passed, failed, started_at)
+        VALUES (%s, %s, %s, 0, 0, 0, %s)
+    """
+    FINISH_RUN_SQL = """
+        UPDATE test_run SET status = %s, total = %s, passed = %s, failed = %s, finished_at = %s
+        WHERE run_id = %s
+    """
+    INSERT_STEP_SQL = """
+        INSERT INTO step_result (
+            run_id, case_step_info_id, case_id, part_name, api_name, status, http_status,
+            dns_time, connect_time, tls_time, ttfb, response_time, request_size, response_size,
+            message, started_at, finished_at
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """
+
+    def __init__(self, run_type, flush_size=None):
+        self.run_id = uuid.uuid4().hex
+        self.run_type = run_type
+        self.flush_size = flush_size or config.HISTORY_FLUSH_SIZE
+        self.sql_utils = SqlUtils()
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._started = False
+        self.latency_stats = LatencyStats()
+        self.total = 0
+        self.passed = 0
+        self.failed = 0
+
+    @classmethod
+    def active(cls):
+        return _active_recorder.get()
+
+    @classmethod
+    def set_active(cls, recorder):
+        """登记当前上下文的活动记录器（None表示不记录），返回用于恢复的token"""
+        return _active_recorder.set(recorder)
+
+    @classmethod
+    def record_active(cls, step_records):
+        """上报到当前活动记录器（未开启记录时忽略，如进程池子进程）"""
+        recorder = _active_recorder.get()
+        if recorder is not None and step_records:
+            recorder.record(step_records)
+
+    def __enter__(self):
+        # 执行历史写入失败不影响用例执行（如未执行数据库迁移），仅记录错误
+        try:
+            self.start()
+            self._started = True
+        except Exception as e:
+            logger.error(f"执行历史记录开启失败，本次执行不记录历史: {str(e)}", exc_info=True)
+        self._token = _active_recorder.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _active_recorder.reset(self._token)
+        if not self._started:
+            self.sql_utils.close()
+            return False
+        try:
+            self.finish('failed' if exc_type else 'completed')
+        except Exception as e:
+            logger.error(f"执行历史写入失败: {str(e)}", exc_info=True)
+        return False
+
+    def start(self):
+        purge_run_history_if_due()
+        self.sql_utils.execute_update(self.INSERT_RUN_SQL, (self.run_id, self.run_type, 'running', utc_now()))
+        logger.info(f"开始记录执行历史: run_id={self.run_id}, 类型={self.run_type}")
+
+    def record(self, step_records):
+        with self._lock:
+            for step_record in step_records:
+                self.latency_stats.add(step_record)
+                self.total += 1
+                if step_record['status'] == 'passed':
+                    self.passed += 1
+                else:
+                    self.failed += 1
+                if self._started:
+                    self._buffer.append(step_record)
+            if len(self._buffer) >= self.flush_size:
+                try:
+                    self._flush_locked()
+                except Exception as e:
+                    logger.error(f"步骤执行结果写入失败，丢弃本批 {len(self._buffer)} 条: {str(e)}", exc_info=True)
+                    self._buffer = []
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        params_list = [(
+            self.run_id, r['case_step_info_id'], r['case_id'], r['part_name'], r['api_name'], r['status'],
+            r['http_status'], r['dns_time'], r['connect_time'], r['tls_time'], r['ttfb'], r['response_time'],
+            r['request_size'], r['response_size'], r['message'], r['started_at'], r['finished_at']
+        ) for r in self._buffer]
+        self.sql_utils.execute_many(self.INSERT_STEP_SQL, params_list)
+        logger.debug(f"批量写入步骤执行结果 {len(params_list)} 条: run_id={self.run_id}")
+        self._buffer = []
+
+    def finish(self, status='completed'):
+        self.flush()
+        self.sql_utils.execute_update(
+            self.FINISH_RUN_SQL,
+            (status, self.total, self.passed, self.failed, utc_now(), self.run_id)
+        )
+        self.sql_utils.close()
+        logger.info(f"执行历史记录完成: run_id={self.run_id}, 步骤总数={self.total}, "
+                    f"通过={self.passed}, 失败={self.failed}")
+
+
+def purge_run_history_if_due():
+    """按清理间隔节流：距本进程上次清理未超过HISTORY_PURGE_INTERVAL秒时跳过，避免每次执行（含单条执行）都清理"""
+    global _last_purge
+    with _purge_lock:
+        if _last_purge is not None and time.monotonic() - _last_purge < config.HISTORY_PURGE_INTERVAL:
+            return 0
+        _last_purge = time.monotonic()
+    return purge_run_history()
+
+
+def purge_run_history(keep_days=None, batch_size=1000):
+    """保留策略：删除超过保留天数的执行记录（按执行批次逐个删除步骤结果，避免单次大事务锁表）"""
+    keep_days = config.HISTORY_KEEP_DAYS if keep_days is None else keep_days
+    if not keep_days:
+        return 0
+    sql_utils = SqlUtils()
+    try:
+        expire_time = utc_now() - datetime.timedelta(days=keep_days)
+        expired_runs = sql_utils.execute_query(
+            "SELECT run_id FROM test_run WHERE started_at < %s LIMIT %s", (expire_time, batch_size)
+        )
+        for run in expired_runs:
+            sql_utils.execute_update("DELETE FROM step_result WHERE run_id = %s", (run['run_id'],))
+            sql_utils.execute_update("DELETE FROM test_run WHERE run_id = %s", (run['run_id'],))
+        if expired_runs:
+            logger.info(f"清理过期执行历史 {len(expired_runs)} 批次（保留 {keep_days} 天）")
+        return len(expired_runs)
+    except Exception as e:
+        logger.warning(f"清理执行历史失败: {str(e)}")
+        return 0
+    finally:
+        sql_utils.close()
@@ -0,0 +1,129 @@
+import time
+import socket
+import asyncio
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from common import config
+from common.latency_stats import current_trace
+from common.log_utils import logger
+
+try:
+    import httpx
+    import httpcore
+except ImportError:
+    httpx = None
+    httpcore = None
+
+try:
+    import h2  # noqa: F401  httpx启用HTTP/2的依赖
+except ImportError:
+    h2 = None
+
+
+class DnsTimingBackend(httpcore.AsyncNetworkBackend if httpcore is not None else object):
+    """
+    异步连接池的网络层：先单独解析域名并把耗时写入当前请求的RequestTrace，再按解析出的地址依次尝试建立连接
+    TLS握手的SNI和证书校验仍使用原主机名（由httpcore按请求地址传入），IP地址直接连接
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        trace = current_trace.get()
+        if trace is None or _is_ip_address(host):
+            return await self.backend.connect_tcp(host, port, timeout, local_address, socket_options)
+
+        start = time.perf_counter()
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError as e:
+            raise httpcore.ConnectError(f"域名解析失败: {host}, {str(e)}") from e
+        trace.record_dns(round((time.perf_counter() - start) * 1000, 2))
+
+        error = None
+        for address in dict.fromkeys(info[4][0] for info in infos):
+            try:
+                return await self.backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        raise error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self.backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds):
+        await self.backend.sleep(seconds)
+
+
+def _is_ip_address(host):
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, host)
+            return True
+        except (OSError, ValueError):
+            pass
+    return False
+
+
+class SessionPool():
+    """进程级HTTP连接池：按主机复用TCP/TLS连接，Cookie和用例变量仍按用例链隔离"""
+    _adapters = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_host_key(url):
+        """主机维度的连接池键（scheme://host:port）"""
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    @classmethod
+    def get_adapter(cls, url):
+        """获取主机对应的共享适配器（适配器内部持有urllib3连接池，线程安全）"""
+        host_key = cls.get_host_key(url)
+        with cls._lock:
+            if host_key not in cls._adapters:
+                cls._adapters[host_key] = HTTPAdapter(pool_connections=1, pool_maxsize=config.HTTP_POOL_SIZE)
+                logger.debug(f"创建HTTP连接池: {host_key}，大小: {config.HTTP_POOL_SIZE}")
+            return cls._adapters[host_key]
+
+    @classmethod
+    def new_session(cls, hosts=()):
+        """创建挂载共享连接池的会话：每条用例链一个会话（独立Cookie），底层连接进程内复用"""
+        session = requests.session()
+        for host in hosts:
+            if host:
+                session.mount(cls.get_host_key(host) + '/', cls.get_adapter(host))
+        if not config.HTTP_KEEPALIVE:
+            session.headers['Connection'] = 'close'
+        return session
+
+    @staticmethod
+    def new_async_transport():
+        """创建异步传输层（连接池），由异步请求引擎按主机缓存，所有用例链共享"""
+        http2 = config.HTTP2
+        if http2 and h2 is None:
+            logger.warning("h2库未安装，HTTP/2不可用，回退为HTTP/1.1")
+            http2 = False
+        limits = httpx.Limits(
+            max_connections=config.HTTP_POOL_SIZE,
+            max_keepalive_connections=config.HTTP_POOL_SIZE if config.HTTP_KEEPALIVE else 0,
+            keepalive_expiry=config.HTTP_KEEPALIVE or None
+        )
+        transport = httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+        # httpx未开放网络层参数，替换连接池的网络层以单独记录域名解析耗时（httpx内部结构变化时保持默认网络层）
+        pool = getattr(transport, '_pool', None)
+        if getattr(pool, '_network_backend', None) is not None:
+            pool._network_backend = DnsTimingBackend(pool._network_backend)
+        else:
+            logger.warning("httpx连接池结构不支持替换网络层，域名解析耗时计入连接耗时")
+        return transport
+
+    @classmethod
+    def close(cls):
+        with cls._lock:
+            for adapter in cls._adapters.values():
+                adapter.close()
+            cls._adapters.clear()
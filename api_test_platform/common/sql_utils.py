@@ -4,6 +4,38 @@ from common import config
 from common.log_utils import logger
 
 
+# 用例步骤查询公共部分（步骤 + 用例 + 接口三表关联），{where}为查询条件
+CASE_INFO_SELECT_SQL = '''
+            SELECT
+                a.CaseStepInfo_id AS 'case_step_info_id',
+                b.case_id AS '测试用例编号',
+                b.is_run AS '是否执行',
+                a.part_name AS '模块名称',
+                b.case_name AS '测试用例名称',
+                a.case_step_name AS '测试用例步骤',
+                c.api_name AS '接口名称',
+                c.api_request_type AS '请求方式',
+                c.api_request_url AS '请求地址',
+                c.api_url_params AS '请求参数(get)',
+                c.api_post_data AS '提交数据(post)',
+                a.get_value_type AS '取值方式',
+                a.variable_name AS '传值变量',
+                a.get_value_code AS '取值代码',
+                a.excepted_result_type AS '期望结果类型',
+                a.excepted_result AS '期望结果',
+                a.is_pass   AS '是否通过'
+            FROM
+                case_step_info a
+                LEFT JOIN case_info b ON a.CaseStepInfo_id = b.CaseInfo_id
+                LEFT JOIN api_info c ON a.api_id = c.api_id
+            {where}
+            ORDER BY
+                a.part_name,
+                b.case_id,
+            a.case_step_name;
+        '''
+
+
 class SqlUtils():
     def __init__(self):
         self._validate_config()
@@ -111,69 +143,67 @@ class SqlUtils():
         except pymysql.MySQLError as e:
             logger.error(f"SQL更新执行失败: {str(e)}", exc_info=True)
             raise
+
+    def execute_many(self, sql, params_list):
+        """批量执行（executemany，INSERT会合并为多值语句，单个事务提交）"""
+        if not params_list:
+            return 0
+        try:
+            with self.transaction():
+                _, cursor = self._get_connection()
+                logger.debug(f"批量执行SQL: {sql} 参数条数: {len(params_list)}")
+                affected_rows = cursor.executemany(sql, params_list)
+                logger.debug(f"批量执行影响 {affected_rows} 行")
+            return affected_rows
+        except pymysql.MySQLError as e:
+            logger.error(f"SQL批量执行失败: {str(e)}", exc_info=True)
+            raise
+
+    def execute_many_in_transaction(self, statements):
+        """多条批量语句在同一个事务中执行，statements为[(sql, params_list), ...]，任一失败整体回滚"""
+        affected_rows = 0
+        try:
+            with self.transaction():
+                _, cursor = self._get_connection()
+                for sql, params_list in statements:
+                    if params_list:
+                        affected_rows += cursor.executemany(sql, params_list)
+            logger.debug(f"批量事务执行完成，影响 {affected_rows} 行")
+            return affected_rows
+        except pymysql.MySQLError as e:
+            logger.error(f"SQL批量事务执行失败: {str(e)}", exc_info=True)
+            raise
+
+    def _query_test_case_info(self, where='', params=None):
+        """按条件查询用例步骤（条件使用参数化占位符，避免拼接SQL）"""
+        return self.execute_query(CASE_INFO_SELECT_SQL.format(where=where), params)
+
     def get_mysql_test_case_info(self):
         """获取MySQL中的测试用例信息"""
-        sql_str = '''
-            SELECT
-                b.case_id AS '测试用例编号',
-                b.is_run AS '是否执行',
-                a.part_name AS '模块名称',
-                b.case_name AS '测试用例名称',
-                a.case_step_name AS '测试用例步骤',
-                c.api_name AS '接口名称',
-                c.api_request_type AS '请求方式',
-                c.api_request_url AS '请求地址',
-                c.api_url_params AS '请求参数(get)',
-                c.api_post_data AS '提交数据(post)',
-                a.get_value_type AS '取值方式',
-                a.variable_name AS '传值变量',
-                a.get_value_code AS '取值代码',
-                a.excepted_result_type AS '期望结果类型',
-                a.excepted_result AS '期望结果',
-                a.is_pass   AS '是否通过'
-            FROM
-                case_step_info a
-                LEFT JOIN case_info b ON a.CaseStepInfo_id = b.CaseInfo_id
-                LEFT JOIN api_info c ON a.api_id = c.api_id
-            ORDER BY
-                a.part_name,
-                b.case_id,
-            a.case_step_name;
-        '''
-        return self.execute_query(sql_str)
+        return self._query_test_case_info()
 
     def get_mysql_test_single_case_info(self,ids):
         """获取MySQL中的测试用例信息"""
-        sql_str = '''
-            SELECT
-                b.case_id AS '测试用例编号',
-                b.is_run AS '是否执行',
-                a.part_name AS '模块名称',
-                b.case_name AS '测试用例名称',
-                a.case_step_name AS '测试用例步骤',
-                c.api_name AS '接口名称',
-                c.api_request_type AS '请求方式',
-                c.api_request_url AS '请求地址',
-                c.api_url_params AS '请求参数(get)',
-                c.api_post_data AS '提交数据(post)',
-                a.get_value_type AS '取值方式',
-                a.variable_name AS '传值变量',
-                a.get_value_code AS '取值代码',
-                a.excepted_result_type AS '期望结果类型',
-                a.excepted_result AS '期望结果',
-                a.is_pass   AS '是否通过'
-            FROM
-                case_step_info a
-                LEFT JOIN case_info b ON a.CaseStepInfo_id = b.CaseInfo_id
-                LEFT JOIN api_info c ON a.api_id = c.api_id
-            WHERE
-                a.CaseStepInfo_id = '''+"'"+str(ids)+"'"+'''
-            ORDER BY
-                a.part_name,
-                b.case_id,
-            a.case_step_name;
-        '''
-        return self.execute_query(sql_str)
+        return self._query_test_case_info('WHERE a.CaseStepInfo_id = %s', (str(ids),))
+
+    def get_mysql_test_case_info_by_step_ids(self, step_ids):
+        """获取包含指定步骤ID的完整用例（同模块同用例编号的所有步骤）"""
+        step_ids = [str(step_id) for step_id in step_ids if step_id]
+        if not step_ids:
+            return []
+        placeholders = ', '.join(['%s'] * len(step_ids))
+        where = f'''WHERE (a.part_name, a.case_id) IN (
+                SELECT part_name, case_id FROM case_step_info WHERE CaseStepInfo_id IN ({placeholders})
+            )'''
+        return self._query_test_case_info(where, tuple(step_ids))
+
+    def get_mysql_test_case_info_by_part(self, part_name):
+        """获取指定模块的测试用例信息"""
+        return self._query_test_case_info('WHERE a.part_name = %s', (part_name,))
+
+    def get_mysql_test_case_info_by_is_run(self, is_run='是'):
+        """获取指定执行状态的测试用例信息"""
+        return self._query_test_case_info('WHERE b.is_run = %s', (is_run,))
 
 if __name__ == '__main__':
     try:
@@ -0,0 +1,199 @@
+import re
+import ast
+from collections import namedtuple
+from functools import lru_cache
+from common.check_utils import (parse_check_data, get_schema_validator, parse_multi_check, parse_sla_limit,
+                                MultiCheck, MULTI_CHECK_TYPE, SLA_CHECK_TYPES)
+from common.template_utils import PLACEHOLDER_PATTERN, parse_placeholder, render_placeholder
+from common.log_utils import logger
+
+# 结构化编译时占位符替换为的标记名（合法的Python标识符，渲染时按序号找回占位符）
+SLOT_MARKER = '__tpl_slot_{}__'
+SLOT_MARKER_PATTERN = re.compile(r'__tpl_slot_(\d+)__')
+
+# 参与编译的步骤字段（case_step_info_id + 行内容共同组成缓存键，行内容变化后自动重新编译）
+PLAN_FIELDS = (
+    'case_step_info_id', '请求方式', '请求地址', '请求参数(get)', '提交数据(post)',
+    '取值方式', '传值变量', '取值代码', '期望结果类型', '期望结果'
+)
+
+# 编译后的步骤执行计划（不可变，可在多线程/多次执行间共享）
+StepPlan = namedtuple('StepPlan', [
+    'request_type', 'url_path', 'url_params', 'post_data',
+    'extract_type', 'var_name', 'extract_code', 'check_type', 'check_data'
+])
+
+
+class PayloadTemplate():
+    """
+    请求参数模板：编译时拆分为字面量片段和变量槽位，无变量时预先解析为Python对象。
+    有变量时按Python字面量结构编译为渲染树：字符串内容只有一个占位符时保留变量原类型（如"${user_id}"渲染为整数），
+    其他字符串按文本拼接；结构无法编译时（如占位符位于字面量之外）回退为文本替换后再解析。
+    render渲染请求参数时变量未找到抛出UnresolvedVariableError，避免"${name}"原文被当作参数值发出。
+    """
+
+    def __init__(self, content):
+        self.content = content or ''
+        # split结果：偶数位为字面量，奇数位为占位符表达式
+        self.segments = PLACEHOLDER_PATTERN.split(self.content)
+        self.slots = tuple(parse_placeholder(expr) for expr in self.segments[1::2])
+        self._value = None
+        self._error = None
+        self._renderer = None
+        if self.content and not self.slots:
+            try:
+                self._value = ast.literal_eval(self.content)
+            except (ValueError, SyntaxError) as e:
+                self._error = e
+        elif self.slots:
+            marked = ''.join(
+                segment if index % 2 == 0 else SLOT_MARKER.format(index // 2)
+                for index, segment in enumerate(self.segments)
+            )
+            try:
+                self._renderer = self._compile_node(ast.parse(marked.strip(), mode='eval').body)
+            except (ValueError, SyntaxError, TypeError):
+                logger.debug(f"参数模板无法按结构编译，渲染时按文本替换: {self.content[:100]}")
+
+    def _compile_node(self, node):
+        """编译语法树节点为渲染函数 f(temp_variables) -> 值（不含占位符的子树预先求值）"""
+        if not self._has_slot(node):
+            value = ast.literal_eval(node)
+            return lambda temp_variables: value
+
+        if isinstance(node, ast.Name):
+            match = SLOT_MARKER_PATTERN.fullmatch(node.id)
+            if not match:
+                raise ValueError(f"不支持的表达式: {node.id}")
+            slot = self.slots[int(match.group(1))]
+            return lambda temp_variables: render_placeholder(slot, temp_variables, strict=True)
+
+        if isinstance(node, ast.Constant):
+            parts = SLOT_MARKER_PATTERN.split(node.value)
+            if len(parts) == 3 and not parts[0] and not parts[2]:
+                # 整个字符串就是一个占位符：保留变量原类型
+                slot = self.slots[int(parts[1])]
+                return lambda temp_variables: render_placeholder(slot, temp_variables, strict=True)
+            slots = tuple(self.slots[int(index)] for index in parts[1::2])
+
+            def render_text(temp_variables):
+                texts = list(parts)
+                for index, slot in enumerate(slots):
+                    texts[index * 2 + 1] = str(render_placeholder(slot, temp_variables, strict=True))
+                return ''.join(texts)
+            return render_text
+
+        if isinstance(node, ast.Dict):
+            if None in node.keys:
+                raise ValueError("不支持字典解包")
+            items = tuple((self._compile_node(key), self._compile_node(value))
+                          for key, value in zip(node.keys, node.values))
+            return lambda temp_variables: {key(temp_variables): value(temp_variables) for key, value in items}
+
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            container = {ast.List: list, ast.Tuple: tuple, ast.Set: set}[type(node)]
+            elements = tuple(self._compile_node(element) for element in node.elts)
+            return lambda temp_variables: container(element(temp_variables) for element in elements)
+
+        raise ValueError(f"不支持的模板结构: {type(node).__name__}")
+
+    @staticmethod
+    def _has_slot(node):
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name) and SLOT_MARKER_PATTERN.search(child.id):
+                return True
+            if isinstance(child, ast.Constant) and isinstance(child.value, str) \
+                    and SLOT_MARKER_PATTERN.search(child.value):
+                return True
+        return False
+
+    def render_text(self, temp_variables, strict=False):
+        """替换变量后的文本（变量不存在时保留原占位符，strict为True时抛出UnresolvedVariableError）"""
+        if not self.slots:
+            return self.content
+        parts = list(self.segments)
+        for index, slot in enumerate(self.slots):
+            parts[index * 2 + 1] = str(render_placeholder(slot, temp_variables, strict))
+        return ''.join(parts)
+
+    def render(self, temp_variables):
+        """替换变量并解析为Python对象（内容为空返回None，变量不存在时抛出UnresolvedVariableError）"""
+        if not self.content:
+            return None
+        if not self.slots:
+            if self._error:
+                # 预解析失败的内容在执行时重新解析，按原逻辑抛出异常
+                return ast.literal_eval(self.content)
+            return self._value
+        if self._renderer is not None:
+            return self._renderer(temp_variables)
+        return ast.literal_eval(self.render_text(temp_variables, strict=True))
+
+
+@lru_cache(maxsize=10000)
+def compile_template(content):
+    """获取编译后的参数模板（按原文缓存，进程内多次执行复用）"""
+    return PayloadTemplate(content)
+
+
+def _compile_check_data(check_type, check_data):
+    """预编译断言数据，编译失败时保留原文，由CheckUtils按原逻辑报告错误"""
+    if not check_data:
+        return check_data
+    try:
+        # 多重断言的子项数据可能已是列表/字典，无需再解析
+        if check_type == 'json键是否存在' and isinstance(check_data, str):
+            return tuple(key.strip() for key in check_data.split(','))
+        if check_type == 'json键值对' and isinstance(check_data, str):
+            return ast.literal_eval(check_data) or check_data
+        if check_type == '正则匹配':
+            return re.compile(check_data)
+        if check_type == 'json路径比较':
+            return parse_check_data(check_data)
+        if check_type == 'json schema校验':
+            return get_schema_validator(parse_check_data(check_data))
+        if check_type in ('状态码', '响应头'):
+            return parse_check_data(check_data)
+        if check_type in SLA_CHECK_TYPES:
+            return parse_sla_limit(check_data)
+        if check_type == MULTI_CHECK_TYPE:
+            # 多重断言逐项预编译
+            multi_check = parse_multi_check(check_data)
+            return MultiCheck(
+                tuple((sub_type, _compile_check_data(sub_type, sub_data)) for sub_type, sub_data in multi_check.assertions),
+                multi_check.short_circuit
+            )
+    except Exception as e:
+        logger.warning(f"断言数据预编译失败，执行时按原文处理: {str(e)}")
+    return check_data
+
+
+def _compile_extract_code(extract_type, extract_code):
+    if extract_type == '正则匹配' and extract_code:
+        try:
+            return re.compile(extract_code)
+        except re.error as e:
+            logger.warning(f"取值正则预编译失败，执行时按原文处理: {str(e)}")
+    return extract_code
+
+
+@lru_cache(maxsize=10000)
+def _compile_step(key):
+    step = dict(zip(PLAN_FIELDS, key))
+    logger.debug(f"编译步骤执行计划: {step.get('case_step_info_id')}")
+    return StepPlan(
+        request_type=(step['请求方式'] or '').upper(),
+        url_path=step['请求地址'],
+        url_params=compile_template(step['请求参数(get)']),
+        post_data=compile_template(step['提交数据(post)']),
+        extract_type=step['取值方式'],
+        var_name=step['传值变量'],
+        extract_code=_compile_extract_code(step['取值方式'], step['取值代码']),
+        check_type=step['期望结果类型'],
+        check_data=_compile_check_data(step['期望结果类型'], step['期望结果'])
+    )
+
+
+def compile_step(step_info):
+    """获取步骤执行计划（按步骤ID + 行内容缓存，重复执行和并发执行时跳过解析）"""
+    return _compile_step(tuple(step_info.get(field) for field in PLAN_FIELDS))
@@ -0,0 +1,119 @@
+import os
+import re
+import ast
+import json
+import time
+import uuid
+import random
+import string
+from collections import namedtuple
+from common import config
+from common.log_utils import logger
+
+# 变量占位符：${token}、${login.data.token}、${items[0].id}、${env.HOME}、${uuid()}
+PLACEHOLDER_PATTERN = re.compile(r'\$\{([^${}]+)\}')
+GENERATOR_PATTERN = re.compile(r'^(\w+)\((.*)\)$')
+INDEX_PATTERN = re.compile(r'\[(\d+)\]')
+
+# 编译后的占位符：kind为var（变量路径）/env（环境变量）/global（全局变量）/generator（内置生成器）
+Placeholder = namedtuple('Placeholder', ['expr', 'kind', 'name', 'path', 'args'])
+
+MISSING = object()
+
+
+class UnresolvedVariableError(ValueError):
+    """请求参数中的变量未找到（参数渲染时抛出，步骤按执行异常失败）"""
+
+
+def _timestamp(unit='s'):
+    """当前时间戳，unit为ms时返回毫秒"""
+    now = time.time()
+    return int(now * 1000) if unit == 'ms' else int(now)
+
+
+def _random_int(start=0, end=100):
+    return random.randint(start, end)
+
+
+def _random_str(length=8):
+    return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+
+
+# 内置生成器（每个占位符每次渲染重新生成）
+GENERATORS = {
+    'timestamp': _timestamp,
+    'uuid': lambda: uuid.uuid4().hex,
+    'random': _random_int,
+    'random_str': _random_str,
+}
+
+
+def parse_placeholder(expr):
+    """解析占位符表达式（编译时执行一次，生成器参数按Python字面量解析）"""
+    expr = expr.strip()
+    match = GENERATOR_PATTERN.match(expr)
+    if match and match.group(1) in GENERATORS:
+        args_text = match.group(2).strip()
+        try:
+            args = ast.literal_eval(f"({args_text},)") if args_text else ()
+            return Placeholder(expr, 'generator', match.group(1), (), args)
+        except (ValueError, SyntaxError):
+            logger.warning(f"生成器参数无法解析，按变量处理: ${{{expr}}}")
+
+    path = INDEX_PATTERN.sub(r'.\1', expr).split('.')
+    if path[0] in ('env', 'global') and len(path) > 1:
+        return Placeholder(expr, path[0], path[1], tuple(path[2:]), ())
+    return Placeholder(expr, 'var', path[0], tuple(path[1:]), ())
+
+
+def _walk(value, path):
+    """按路径逐级取值（字典键/列表下标，JSON字符串自动解析），取不到返回MISSING"""
+    for key in path:
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                return MISSING
+        try:
+            if isinstance(value, (list, tuple)):
+                value = value[int(key)]
+            else:
+                value = value[key]
+        except (KeyError, IndexError, ValueError, TypeError):
+            return MISSING
+    return value
+
+
+def resolve_placeholder(placeholder, temp_variables):
+    """
+    计算占位符的值（变量不存在返回MISSING）
+    普通变量先查临时变量，再查全局变量（config.ini [variables]）
+    """
+    if placeholder.kind == 'generator':
+        return GENERATORS[placeholder.name](*placeholder.args)
+    if placeholder.kind == 'env':
+        value = os.environ.get(placeholder.name, MISSING)
+    elif placeholder.kind == 'global':
+        value = config.GLOBAL_VARIABLES.get(placeholder.name, MISSING)
+    elif placeholder.name in temp_variables:
+        value = temp_variables[placeholder.name]
+    else:
+        value = config.GLOBAL_VARIABLES.get(placeholder.name, MISSING)
+    if value is MISSING or not placeholder.path:
+        return value
+    return _walk(value, placeholder.path)
+
+
+def render_placeholder(placeholder, temp_variables, strict=False):
+    """
+    计算占位符的值，变量不存在时记录警告：
+    strict为True时抛出UnresolvedVariableError（请求参数），否则保留原占位符文本（兼容文本替换）
+    """
+    value = resolve_placeholder(placeholder, temp_variables)
+    if value is MISSING:
+        if strict:
+            logger.warning(f"变量${{{placeholder.expr}}}未找到，参数渲染失败")
+            raise UnresolvedVariableError(f"变量${{{placeholder.expr}}}未找到")
+        logger.warning(f"变量${{{placeholder.expr}}}未找到，跳过替换")
+        return '${' + placeholder.expr + '}'
+    return value
@@ -32,7 +32,28 @@ class TestdataUtils():
         # self.test_data_sheet = ExcelUtils(test_data_path, 'Sheet1')
         # self.test_data = self.test_data_sheet.read_multiple_excel_cases()
         self.sql_utils = SqlUtils()
-        self.test_data_by_mysql = self.sql_utils.get_mysql_test_case_info()
+        # 全量用例延迟加载：只有首次访问test_data_by_mysql时才执行全表关联查询
+        self._test_data_by_mysql = None
+        self._index_by_step_id = {}
+        self._index_by_part = {}
+        self._index_by_case_id = {}
+
+    @property
+    def test_data_by_mysql(self):
+        if self._test_data_by_mysql is None:
+            self._test_data_by_mysql = self.sql_utils.get_mysql_test_case_info()
+            self._build_index(self._test_data_by_mysql)
+        return self._test_data_by_mysql
+
+    def _build_index(self, rows):
+        """建立内存索引：步骤ID -> 用例组，模块名称/测试用例编号 -> 用例组列表"""
+        self._index_by_step_id, self._index_by_part, self._index_by_case_id = {}, {}, {}
+        for case in self._group_testcase_rows(rows):
+            first_step = case['case_info'][0]
+            self._index_by_part.setdefault(first_step['模块名称'], []).append(case)
+            self._index_by_case_id.setdefault(first_step['测试用例编号'], []).append(case)
+            for step in case['case_info']:
+                self._index_by_step_id[step.get('case_step_info_id')] = case
 
     # 处理 Excel 数据（只筛选“用例执行=是”的用例）
     # def __get_testcase_data_dict(self):
@@ -52,11 +73,13 @@ class TestdataUtils():
     #     return tuple(testcase_list)
 
     # 处理数据库数据
-    def __get_testcase_data_dict_by_mysql(self):
+    @staticmethod
+    def _group_testcase_rows(rows):
+        """按 模块名称_测试用例编号 分组（查询结果已按模块、用例、步骤排序，组内步骤顺序保持不变）"""
         testcase_dict = {}
-        for row_data in self.test_data_by_mysql:
-            testcase_dict.setdefault(row_data['模块名称']+'_'+row_data['测试用例编号'], []).append(row_data)
-        return testcase_dict
+        for row_data in rows:
+            testcase_dict.setdefault(f"{row_data['模块名称']}_{row_data['测试用例编号']}", []).append(row_data)
+        return [{'case_id': case_id, 'case_info': case_info} for case_id, case_info in testcase_dict.items()]
 
     def def_testcase_data_list_by_mysql(self, case_step_id=None):
         """从MySQL获取测试用例数据"""
@@ -64,10 +87,34 @@ class TestdataUtils():
             case_data = self.sql_utils.get_mysql_test_single_case_info(case_step_id)
             return ({'case_id': case_step_id, 'case_info': case_data},)
 
-        testcase_list = []
-        for case_id, case_info in self.__get_testcase_data_dict_by_mysql().items():
-            testcase_list.append({'case_id': case_id, 'case_info': case_info})
-        return tuple(testcase_list)
+        return tuple(self._group_testcase_rows(self.test_data_by_mysql))
+
+    def get_testcases_by_step_ids(self, step_ids):
+        """获取包含指定步骤ID的完整用例：已全量加载时走内存索引，否则只查询选中的用例"""
+        if self._test_data_by_mysql is not None:
+            selected, seen = [], set()
+            for step_id in step_ids:
+                case = self._index_by_step_id.get(step_id)
+                if case and case['case_id'] not in seen:
+                    seen.add(case['case_id'])
+                    selected.append(case)
+            return tuple(selected)
+        return tuple(self._group_testcase_rows(self.sql_utils.get_mysql_test_case_info_by_step_ids(step_ids)))
+
+    def get_testcases_by_part(self, part_name):
+        """获取指定模块的全部用例"""
+        if self._test_data_by_mysql is not None:
+            return tuple(self._index_by_part.get(part_name, []))
+        return tuple(self._group_testcase_rows(self.sql_utils.get_mysql_test_case_info_by_part(part_name)))
+
+    def get_testcases_by_case_id(self, case_id):
+        """按测试用例编号获取用例（不同模块可能存在相同编号）"""
+        self.test_data_by_mysql  # 触发全量加载并建立索引
+        return tuple(self._index_by_case_id.get(case_id, []))
+
+    def get_testcases_by_is_run(self, is_run='是'):
+        """获取指定执行状态的用例（默认只取“用例执行=是”）"""
+        return tuple(self._group_testcase_rows(self.sql_utils.get_mysql_test_case_info_by_is_run(is_run)))
 
     def get_single_testcase(self, case_step_id):
         """获取单条测试用例数据"""
@@ -0,0 +1,158 @@
+import threading
+import contextvars
+from collections.abc import MutableMapping
+from common import config
+from common.log_utils import logger
+
+# 变量作用域名称：传值变量写成 run.token / module.token 时写入对应作用域
+SCOPE_NAMES = ('case', 'module', 'run')
+
+# 当前活动的执行级变量按线程/协程上下文隔离：并发的单条执行请求各自拥有执行作用域，
+# 并发套件的工作线程由ParallelSuite复制提交时的上下文传入
+_active_variables = contextvars.ContextVar('active_run_variables', default=None)
+
+
+def case_role(step_infos):
+    """用例角色：测试用例编号以前置/后置前缀开头的为setup/teardown用例，其他为None"""
+    if not isinstance(step_infos, (list, tuple)) or not step_infos:
+        return None
+    case_id = str(step_infos[0].get('测试用例编号') or '').lower()
+    if case_id.startswith(config.SCOPE_SETUP_PREFIX.lower()):
+        return 'setup'
+    if case_id.startswith(config.SCOPE_TEARDOWN_PREFIX.lower()):
+        return 'teardown'
+    return None
+
+
+class VariableStore(MutableMapping):
+    """线程安全的变量存储（执行级/模块级作用域在并发执行的用例之间共享）"""
+
+    def __init__(self, initial=None):
+        self._data = dict(initial or {})
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        with self._lock:
+            return self._data[key]
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = value
+
+    def __delitem__(self, key):
+        with self._lock:
+            del self._data[key]
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __iter__(self):
+        return iter(self.snapshot())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._data)
+
+
+class ScopedVariables(MutableMapping):
+    """
+    单条用例链的变量视图：按 用例 -> 模块 -> 执行 的顺序查找变量。
+    写入默认进入default_scope作用域，变量名带 run./module./case. 前缀时写入指定作用域。
+    """
+
+    def __init__(self, run_variables=None, part_name=None, default_scope='case'):
+        self.case = {}
+        # 未开启执行级变量时模块/执行作用域只在本条用例链内有效（与原来每条用例独立的行为一致）
+        self.module = run_variables.module(part_name) if run_variables is not None else {}
+        self.run = run_variables.run if run_variables is not None else {}
+        self.default_scope = default_scope
+
+    def _scopes(self):
+        return self.case, self.module, self.run
+
+    def __getitem__(self, key):
+        for scope in self._scopes():
+            if key in scope:
+                return scope[key]
+        if key in SCOPE_NAMES:
+            # ${run.token}：按作用域名称显式引用
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return any(key in scope for scope in self._scopes()) or key in SCOPE_NAMES
+
+    def __setitem__(self, key, value):
+        scope_name, _, name = key.partition('.')
+        if name and scope_name in SCOPE_NAMES:
+            getattr(self, scope_name)[name] = value
+        else:
+            getattr(self, self.default_scope)[key] = value
+
+    def __delitem__(self, key):
+        del self.case[key]
+
+    def __iter__(self):
+        keys = []
+        for scope in self._scopes():
+            keys.extend(key for key in list(scope) if key not in keys)
+        return iter(keys)
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+
+class RunVariables():
+    """
+    执行级变量：一次执行内共享的执行作用域和按模块名称划分的模块作用域。
+    作为上下文管理器使用时登记为当前上下文的活动作用域，RequestsUtils为每条用例链创建的变量视图会关联到它；
+    前置用例（如登录）提取的变量写入这里，后续用例直接引用，不再重复登录。
+    进程池执行时子进程通过snapshot/from_snapshot获得前置用例的变量，子进程内写入的执行级变量不回传。
+    """
+
+    def __init__(self, run=None, modules=None):
+        self.run = VariableStore(run)
+        self._modules = {part_name: VariableStore(values) for part_name, values in (modules or {}).items()}
+        self._lock = threading.Lock()
+        self._token = None
+
+    @classmethod
+    def active(cls):
+        return _active_variables.get()
+
+    @classmethod
+    def scope_for(cls, step_infos):
+        """为一条用例链创建变量视图（前置/后置用例的变量默认写入模块作用域）"""
+        part_name = step_infos[0].get('模块名称') if step_infos else None
+        default_scope = 'module' if case_role(step_infos) else 'case'
+        return ScopedVariables(_active_variables.get(), part_name, default_scope)
+
+    def module(self, part_name):
+        with self._lock:
+            if part_name not in self._modules:
+                self._modules[part_name] = VariableStore()
+            return self._modules[part_name]
+
+    def snapshot(self):
+        with self._lock:
+            modules = {part_name: store.snapshot() for part_name, store in self._modules.items()}
+        return {'run': self.run.snapshot(), 'modules': modules}
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        snapshot = snapshot or {}
+        return cls(snapshot.get('run'), snapshot.get('modules'))
+
+    def __enter__(self):
+        self._token = _active_variables.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _active_variables.reset(self._token)
+        logger.debug(f"执行级变量作用域结束: 执行变量{len(self.run)}个，模块{len(self._modules)}个")
+        return False
@@ -0,0 +1,230 @@
+import os
+import sys
+
+# 框架根目录加入sys.path（与run_case.py一致，支持直接执行本文件）
+FRAMEWORK_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if FRAMEWORK_ROOT not in sys.path:
+    sys.path.append(FRAMEWORK_ROOT)
+
+import json
+import math
+import time
+import argparse
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from common import config
+from common.requests_utils import RequestsUtils
+from common.latency_stats import LatencyStats, latency_histogram, percentile
+from common.log_utils import logger
+
+
+def load_cases(case_step_ids=None, part_name=None):
+    """加载压测场景（按步骤ID或模块筛选，未指定时使用全部用例）"""
+    from common.testdata_utils import TestdataUtils
+    testdata_utils = TestdataUtils()
+    if case_step_ids:
+        return list(testdata_utils.get_testcases_by_step_ids(case_step_ids))
+    if part_name:
+        return list(testdata_utils.get_testcases_by_part(part_name))
+    return list(testdata_utils.def_testcase_data_list_by_mysql())
+
+
+class LoadRunner():
+    """
+    压测模式：把已有用例链作为压测场景循环执行，变量传递和断言复用RequestsUtils/CheckUtils。
+    固定并发：concurrency个虚拟用户各自循环执行用例链；
+    目标速率：按rps（每秒启动的用例链数）调度，concurrency为同时执行的上限，达到上限时本次调度记为丢弃。
+    ramp_up秒内并发数/速率线性增加到目标值，warmup秒内启动的用例链不计入统计。
+    """
+
+    def __init__(self, case_list, duration=None, concurrency=None, rps=None, warmup=None, ramp_up=None):
+        if not case_list:
+            raise ValueError("压测场景为空，请检查用例筛选条件")
+        self.case_list = case_list
+        self.duration = duration or config.LOAD_DURATION
+        self.concurrency = concurrency or config.LOAD_CONCURRENCY
+        self.rps = rps
+        self.warmup = config.LOAD_WARMUP if warmup is None else warmup
+        self.ramp_up = config.LOAD_RAMP_UP if ramp_up is None else ramp_up
+        if self.warmup >= self.duration:
+            raise ValueError(f"预热时间({self.warmup}秒)必须小于持续时间({self.duration}秒)")
+
+        self.latency_stats = LatencyStats()
+        self._latencies = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._case_index = 0
+        self._start_time = None
+        self._end_time = None
+        self.iterations = 0
+        self.failed_iterations = 0
+        self.dropped = 0
+        self.requests = 0
+        self.errors = 0
+
+    def _next_case(self):
+        with self._lock:
+            case = self.case_list[self._case_index % len(self.case_list)]
+            self._case_index += 1
+        return case
+
+    def _run_iteration(self):
+        """执行一次用例链（每次使用独立的RequestsUtils，变量和Cookie不跨迭代共享）"""
+        case = self._next_case()
+        started = time.monotonic()
+        requests_utils = RequestsUtils()
+        try:
+            result = requests_utils.request_by_step(case['case_info'])
+            passed = bool(result.get('check_result'))
+        except Exception as e:
+            logger.error(f"压测用例链执行异常: {case['case_id']}, 错误: {str(e)}", exc_info=True)
+            passed = False
+        if started - self._start_time < self.warmup:
+            return
+
+        with self._lock:
+            self.iterations += 1
+            if not passed:
+                self.failed_iterations += 1
+            for step_record in requests_utils.step_records:
+                self.requests += 1
+                if step_record['status'] != 'passed':
+                    self.errors += 1
+                if step_record.get('response_time') is not None:
+                    self._latencies.append(step_record['response_time'])
+        for step_record in requests_utils.step_records:
+            self.latency_stats.add(step_record)
+
+    def _virtual_user(self, delay):
+        """固定并发模式的虚拟用户：加压阶段按序号延迟启动，之后循环执行直到压测结束"""
+        if self._stop.wait(delay):
+            return
+        while not self._stop.is_set():
+            self._run_iteration()
+
+    def _run_concurrency(self):
+        users = []
+        for index in range(self.concurrency):
+            delay = self.ramp_up * index / self.concurrency
+            user = threading.Thread(target=self._virtual_user, args=(delay,), name=f'LoadUser-{index}', daemon=True)
+            user.start()
+            users.append(user)
+        self._stop.wait(self.duration)
+        self._stop.set()
+        for user in users:
+            user.join()
+
+    def _launch_time(self, index):
+        """第index次调度的计划时间（相对开始的秒数）：加压阶段速率从0线性增加，累计次数为 rps*t²/(2*ramp_up)"""
+        if self.ramp_up and index < self.rps * self.ramp_up / 2:
+            return math.sqrt(2 * self.ramp_up * index / self.rps)
+        return self.ramp_up / 2 + index / self.rps
+
+    def _run_rate(self):
+        slots = threading.BoundedSemaphore(self.concurrency)
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='LoadWorker') as executor:
+            index = 0
+            while True:
+                launch_time = self._launch_time(index)
+                index += 1
+                if launch_time >= self.duration:
+                    break
+                wait = self._start_time + launch_time - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                if not slots.acquire(blocking=False):
+                    # 执行中的用例链已达上限：不排队等待，避免压测结束后继续积压执行
+                    self.dropped += 1
+                    continue
+                executor.submit(self._run_iteration).add_done_callback(lambda future: slots.release())
+
+    def run(self):
+        """执行压测并返回统计报告"""
+        mode = f"目标速率 {self.rps} 次/秒（并发上限 {self.concurrency}）" if self.rps else f"固定并发 {self.concurrency}"
+        logger.info(f"开始压测: {mode}，场景数 {len(self.case_list)}，持续 {self.duration}秒，"
+                    f"预热 {self.warmup}秒，加压 {self.ramp_up}秒")
+        self._start_time = time.monotonic()
+        if self.rps:
+            self._run_rate()
+        else:
+            self._run_concurrency()
+        self._end_time = time.monotonic()
+        report = self.report()
+        self.log_report(report)
+        return report
+
+    def report(self):
+        window = max(self._end_time - self._start_time - self.warmup, 0.001)
+        latencies = sorted(self._latencies)
+        return {
+            'mode': 'rps' if self.rps else 'concurrency',
+            'target_rps': self.rps,
+            'concurrency': self.concurrency,
+            'duration': self.duration,
+            'warmup': self.warmup,
+            'ramp_up': self.ramp_up,
+            'iterations': self.iterations,
+            'failed_iterations': self.failed_iterations,
+            'dropped': self.dropped,
+            'requests': self.requests,
+            'errors': self.errors,
+            'error_rate': round(self.errors / self.requests * 100, 2) if self.requests else 0,
+            'throughput': round(self.requests / window, 2),
+            'iteration_throughput': round(self.iterations / window, 2),
+            'p50': percentile(latencies, 50),
+            'p90': percentile(latencies, 90),
+            'p99': percentile(latencies, 99),
+            'max': latencies[-1] if latencies else None,
+            'histogram': latency_histogram(latencies),
+            'apis': self.latency_stats.summary(window),
+        }
+
+    @staticmethod
+    def log_report(report):
+        logger.info("=" * 60)
+        logger.info("压测完成，结果统计（不含预热阶段）:")
+        logger.info(f"用例链: {report['iterations']}（失败 {report['failed_iterations']}，丢弃 {report['dropped']}）")
+        logger.info(f"请求数: {report['requests']}，错误率: {report['error_rate']}%")
+        logger.info(f"吞吐量: {report['throughput']} 请求/秒，{report['iteration_throughput']} 用例链/秒")
+        logger.info(f"耗时(ms): P50={report['p50']}，P90={report['p90']}，P99={report['p99']}，最大={report['max']}")
+        logger.info("耗时分布:")
+        peak = max([count for _, count in report['histogram']] + [1])
+        for label, count in report['histogram']:
+            logger.info(f"  {label:>10} | {'#' * int(count * 40 / peak):<40} {count}")
+        for api in report['apis']:
+            logger.info(f"  [{api['api_name']}] 请求 {api['count']}，失败 {api['errors']}，"
+                        f"P50={api['p50']}，P90={api['p90']}，P99={api['p99']}，吞吐量 {api['throughput']}/秒")
+        logger.info("=" * 60)
+
+    @staticmethod
+    def save_report(report, report_root=None):
+        """压测报告保存为JSON（报告目录/压测报告_时间戳.json）"""
+        report_root = report_root or config.REPORT_PATH
+        timestamp = datetime.datetime.now().strftime('%Y%m%d%H%M%S')
+        report_file = os.path.join(report_root, f"压测报告_{timestamp}.json")
+        with open(report_file, 'w', encoding='utf-8') as fp:
+            json.dump(report, fp, ensure_ascii=False, indent=2)
+        logger.info(f"压测报告已保存至: {report_file}")
+        return report_file
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='压测模式：循环执行已有用例链')
+    parser.add_argument('--cases', help='步骤ID，多个用逗号分隔（未指定时使用全部用例）')
+    parser.add_argument('--part', help='模块名称')
+    parser.add_argument('--concurrency', type=int, default=None, help='并发虚拟用户数/执行上限')
+    parser.add_argument('--rps', type=float, default=None, help='目标速率（每秒启动的用例链数），不指定为固定并发模式')
+    parser.add_argument('--duration', type=int, default=None, help='持续时间（秒）')
+    parser.add_argument('--warmup', type=int, default=None, help='预热时间（秒，不计入统计）')
+    parser.add_argument('--ramp-up', type=int, default=None, help='加压时间（秒）')
+    args = parser.parse_args()
+
+    try:
+        case_list = load_cases(args.cases.split(',') if args.cases else None, args.part)
+        runner = LoadRunner(case_list, duration=args.duration, concurrency=args.concurrency, rps=args.rps,
+                            warmup=args.warmup, ramp_up=args.ramp_up)
+        LoadRunner.save_report(runner.run())
+    except Exception as e:
+        logger.critical(f"压测流程致命错误: {str(e)}", exc_info=True)
+        exit(1)
@@ -0,0 +1,166 @@
+import io
+import sys
+import time
+import threading
+import contextvars
+import unittest
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from common.run_history import RunHistoryRecorder
+from common.variable_store import RunVariables
+from common.log_utils import logger
+
+
+# 各线程当前用例组的输出缓冲区；sys.stdout/stderr是进程级的，线程池并发时需按线程区分
+_capture = threading.local()
+
+
+class _CaptureStream():
+    """按线程重定向的输出流：当前线程登记了缓冲区时写入缓冲区，否则写入原输出流"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def _target(self):
+        buffer = getattr(_capture, 'buffer', None)
+        return self.stream if buffer is None else buffer
+
+    def write(self, s):
+        return self._target().write(s)
+
+    def writelines(self, lines):
+        self._target().writelines(lines)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+@contextmanager
+def _captured_output():
+    """在并发执行期间安装按线程重定向的stdout/stderr，结束后恢复原输出流"""
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = _CaptureStream(stdout), _CaptureStream(stderr)
+    try:
+        yield
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+
+
+def _collect_outcome(test):
+    """
+    执行单个用例组（同一case_id的步骤按顺序执行），返回 (结果码, 输出, 异常堆栈, 耗时)
+    与_TestResult一致：stdout/stderr输出写入用例组自己的缓冲区；组内全部错误/失败的堆栈合并返回，存在错误时结果码为错误
+    """
+    result = unittest.TestResult()
+    _capture.buffer = io.StringIO()
+    start_time = time.time()
+    try:
+        test(result)
+    finally:
+        use_time = round(time.time() - start_time, 2)
+        output = _capture.buffer.getvalue()
+        _capture.buffer = None
+    trace = '\n'.join(trace for _, trace in result.errors + result.failures)
+    if result.errors:
+        return 2, output, trace, use_time
+    if result.failures:
+        return 1, output, trace, use_time
+    return 0, output, '', use_time
+
+
+def _run_case_group(case_id, case_info, variables_snapshot=None):
+    """
+    进程池入口：APITest动态绑定的测试方法无法序列化，在子进程内按用例数据重新生成。
+    子进程不直接写执行历史（fork继承的记录器连接不可复用），步骤记录随结果返回由父进程写入。
+    前置用例的变量以快照传入，子进程内写入的执行级变量不回传父进程。
+    """
+    from api_testcase.api_test import APITest
+    RunHistoryRecorder.set_active(None)
+    test = APITest(case_id=case_id, case_info=case_info)
+    with RunVariables.from_snapshot(variables_snapshot), _captured_output():
+        return _collect_outcome(test), test.step_records
+
+
+class ParallelSuite():
+    """并发执行的测试套件：以用例组为单位分发到线程池/进程池，结果按收集顺序合并到同一个_TestResult"""
+
+    POOL_TYPES = ('thread', 'process')
+
+    def __init__(self, test_suite, workers=1, pool_type='thread'):
+        if pool_type not in self.POOL_TYPES:
+            err_msg = f"不支持的并发池类型: {pool_type}，支持类型: {list(self.POOL_TYPES)}"
+            logger.error(err_msg)
+            raise ValueError(err_msg)
+        self.tests = list(test_suite)
+        self.workers = max(int(workers), 1)
+        self.pool_type = pool_type
+        self.window = self.workers * 2
+
+    def countTestCases(self):
+        return len(self.tests)
+
+    def _submit(self, executor, test, variables_snapshot):
+        if self.pool_type == 'process':
+            return executor.submit(_run_case_group, test.case_id, test.case_info, variables_snapshot)
+        # 活动记录器和执行级变量按上下文隔离，工作线程在提交时上下文的副本中执行：
+        # 步骤记录上报到本次执行的批次，前置用例提取的变量对并发执行的用例可见
+        return executor.submit(contextvars.copy_context().run, _collect_outcome, test)
+
+    def _run_serial(self, tests, result):
+        """前置/后置用例在当前线程按顺序执行"""
+        for test in tests:
+            try:
+                code, output, trace, use_time = _collect_outcome(test)
+            except Exception as e:
+                logger.error(f"用例组执行异常: {test.case_id}, 错误: {str(e)}", exc_info=True)
+                code, output, trace, use_time = 2, '', f"{type(e).__name__}: {str(e)}", 0
+            result.addOutcome(test, code, output, trace, use_time)
+
+    def _add_outcome(self, result, test, future):
+        """等待用例组执行完成并合并到报告结果"""
+        try:
+            if self.pool_type == 'process':
+                outcome, step_records = future.result()
+                RunHistoryRecorder.record_active(step_records)
+            else:
+                outcome = future.result()
+            code, output, trace, use_time = outcome
+        except Exception as e:
+            logger.error(f"用例组执行异常: {test.case_id}, 错误: {str(e)}", exc_info=True)
+            code, output, trace, use_time = 2, '', f"{type(e).__name__}: {str(e)}", 0
+        result.addOutcome(test, code, output, trace, use_time)
+
+    def __call__(self, result):
+        """与unittest.TestSuite保持一致的调用方式，供HTMLTestRunner.run(test)直接使用；执行期间按线程捕获各用例组的输出"""
+        logger.info(f"并发执行 {len(self.tests)} 个用例组，并发数: {self.workers}，池类型: {self.pool_type}")
+        with _captured_output():
+            return self._run(result)
+
+    def _run(self, result):
+        setup_tests = [test for test in self.tests if getattr(test, 'scope_role', None) == 'setup']
+        teardown_tests = [test for test in self.tests if getattr(test, 'scope_role', None) == 'teardown']
+        tests = [test for test in self.tests if getattr(test, 'scope_role', None) is None]
+
+        # 前置用例先串行执行，提取的变量（如登录token）供并发执行的用例共享
+        self._run_serial(setup_tests, result)
+        run_variables = RunVariables.active()
+        variables_snapshot = run_variables.snapshot() if run_variables is not None else None
+
+        executor_cls = ProcessPoolExecutor if self.pool_type == 'process' else ThreadPoolExecutor
+        with executor_cls(max_workers=self.workers) as executor:
+            # 有界提交窗口：在途用例组最多为并发数的两倍，按提交顺序合并结果后再提交下一组，
+            # 已完成但未合并的输出不会随用例总数堆积在内存中
+            pending = deque()
+            for test in tests:
+                if len(pending) >= self.window:
+                    self._add_outcome(result, *pending.popleft())
+                pending.append((test, self._submit(executor, test, variables_snapshot)))
+            while pending:
+                self._add_outcome(result, *pending.popleft())
+
+        self._run_serial(teardown_tests, result)
+        return result
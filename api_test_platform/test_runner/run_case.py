@@ -13,6 +13,8 @@ import datetime
 from common import config
 from common import HTMLTestReportCN
 from common.email_utils import EmailUtils
+from common.run_history import RunHistoryRecorder
+from common.variable_store import RunVariables
 from common.log_utils import logger
 
 from django.shortcuts import redirect, reverse
@@ -22,6 +24,15 @@ from django.conf import settings
 # from common.test_report_generator_utils import TestReportGenerator  # 假设你有报告生成工具
 
 
+def get_cli_option(option, default=None):
+    """读取命令行参数值（如 --workers 8），未指定时返回默认值"""
+    if option in sys.argv:
+        index = sys.argv.index(option)
+        if index + 1 < len(sys.argv):
+            return sys.argv[index + 1]
+    return default
+
+
 class RunCase():
     def __init__(self):
         # 1. 路径配置（从config读取，避免硬编码）
@@ -30,6 +41,9 @@ class RunCase():
         self.title = '接口自动化测试报告'
         self.description = f'接口自动化测试报告（环境：{os.getenv("TEST_ENV", "test_env")}）'
         self.tester = '测试-Liaowang'
+        # 并发配置：命令行参数优先，其次config.ini/环境变量
+        self.workers = int(get_cli_option('--workers', config.RUN_WORKERS))
+        self.pool_type = get_cli_option('--pool', config.RUN_POOL_TYPE)
 
         # 2. 验证必要目录
         self._validate_dirs()
@@ -55,32 +69,20 @@ class RunCase():
                 single_case_id = sys.argv[2] if len(sys.argv) > 2 else os.getenv('SINGLE_CASE_ID')
             selected_case_ids = os.getenv('SELECTED_CASE_IDS')  # 批量执行
             logger.info(f"指定用例ID: {selected_case_ids}")
-            # 2. 加载测试用例数据（从MySQL）
+            # 2. 加载测试用例数据（从MySQL，指定用例ID时只查询选中的用例）
             from common.testdata_utils import TestdataUtils
             testdata_utils = TestdataUtils()
-            case_list = testdata_utils.def_testcase_data_list_by_mysql()
-            logger.info(case_list)
             # 3. 筛选用例（如果指定了用例ID）
-            filtered_cases = []
-            logger.info(filtered_cases)
             if single_case_id:
                 # 单条执行：筛选CaseStepInfo_id匹配的用例
-                for case in case_list:
-                    for step in case['case_info']:
-                        if step.get('case_step_info_id') == single_case_id:
-                            filtered_cases.append(case)
-                            break
+                filtered_cases = testdata_utils.get_testcases_by_step_ids([single_case_id])
             elif selected_case_ids:
                 # 批量执行：筛选CaseStepInfo_id在列表中的用例
-                selected_ids = selected_case_ids.split(',')
-                for case in case_list:
-                    for step in case['case_info']:
-                        if step.get('case_step_info_id') in selected_ids:
-                            filtered_cases.append(case)
-                            break
+                filtered_cases = testdata_utils.get_testcases_by_step_ids(selected_case_ids.split(','))
             else:
                 # 全量执行
-                filtered_cases = case_list
+                filtered_cases = testdata_utils.def_testcase_data_list_by_mysql()
+            logger.info(f"筛选到 {len(filtered_cases)} 个用例")
 
             if not filtered_cases:
                 logger.warning("未找到指定的测试用例")
@@ -138,16 +140,23 @@ class RunCase():
                 logger.warning("未收集到任何测试用例，终止测试")
                 return None
 
+            # 并发模式：按用例组分发到线程池/进程池，结果合并到同一份报告
+            if self.workers > 1:
+                from test_runner.parallel_runner import ParallelSuite
+                test_suite = ParallelSuite(test_suite, workers=self.workers, pool_type=self.pool_type)
+
             # 2. 生成报告路径
             report_file = self._get_report_path()
 
-            # 3. 执行测试并生成报告
-            with open(report_file, 'wb') as fp:
-                runner = HTMLTestReportCN.HTMLTestRunner(
+            # 3. 执行测试并生成报告（各步骤执行结果批量写入执行历史；报告逐条写入，执行中断时保留部分结果）
+            # 前置用例提取的执行级/模块级变量在本次执行的所有用例间共享
+            with RunHistoryRecorder('run_case') as recorder, RunVariables(), open(report_file, 'wb') as fp:
+                runner = HTMLTestReportCN.StreamingHTMLTestRunner(
                     stream=fp,
                     title=self.title,
                     description=self.description,
-                    tester=self.tester
+                    tester=self.tester,
+                    latency_stats=recorder.latency_stats
                 )
                 result = runner.run(test_suite)
 
@@ -156,8 +165,8 @@ class RunCase():
             logger.info("测试执行完成，结果统计:")
             logger.info(f"总用例数: {result.testsRun}")
             logger.info(f"通过: {result.success_count}")
-            logger.info(f"失败: {len(result.failures)}")
-            logger.info(f"错误: {len(result.errors)}")
+            logger.info(f"失败: {result.failure_count}")
+            logger.info(f"错误: {result.error_count}")
             logger.info("=" * 60)
 
             return report_file
@@ -1,6 +1,9 @@
 import os
 import sys
 import unittest
+import contextlib
+from common.run_history import RunHistoryRecorder
+from common.variable_store import RunVariables
 from common.testdata_utils import TestdataUtils
 from common import HTMLTestReportCN
 from common.log_utils import logger
@@ -36,7 +39,12 @@ class RunSingleCase:
         try:
             test_suite = self.get_test_suite()
             runner = unittest.TextTestRunner()
-            result = runner.run(test_suite)
+            # 批量任务已开启执行批次时并入该批次，单独执行时自建一个批次
+            recorder = RunHistoryRecorder('run_single_case') if RunHistoryRecorder.active() is None else contextlib.nullcontext()
+            # 批量任务中沿用任务的执行级变量（前置用例的登录token等），单独执行时变量只在本次执行内有效
+            variables = RunVariables() if RunVariables.active() is None else contextlib.nullcontext()
+            with recorder, variables:
+                result = runner.run(test_suite)
 
             # 解析执行结果
             if result.wasSuccessful():